@@ -0,0 +1,276 @@
+from collections import OrderedDict
+from datetime import datetime
+from itertools import combinations
+from prometheus_client import Counter, Gauge
+from typing import Any, Dict, Iterable, List, Optional
+import json
+import logging
+import os
+import time
+import uuid
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redis is only needed for a shared cache
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+# --- READ-THROUGH CACHE ---
+# Caches get_issue, list_issues and get_comments_for_issue responses, keyed
+# by query shape. Entries are never deleted on a write; instead each entry
+# records the dependency tokens it was built from and is only served while
+# all of them are unchanged:
+#
+# - issue:<id>:v           the issue's updated_at (or "deleted"), set by
+#                          every write to the issue
+# - comments:<id>:g        random token, replaced when a comment on the
+#                          issue is created or deleted
+# - issues:tag:<filters>   random token per list filter combination,
+#                          replaced when an issue with matching values is
+#                          created or updated
+# - issues:epoch           replaced instead of the tags when a bulk write
+#                          touches too many of them
+#
+# A list entry depends on its filter tag, the epoch and the version of every
+# issue on the page. Tokens are read before the query and a filler never
+# overwrites a newer version, so a write racing with a fill can only cause
+# a miss, never a stale hit.
+#
+# CACHE_URL=redis://... shares the cache between workers and replicas (any
+# server speaking the Redis protocol will do); otherwise it lives in-process,
+# which is exact for a single uvicorn worker.
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+CACHE_URL = os.getenv("CACHE_URL", "")
+CACHE_TTL = int(os.getenv("CACHE_TTL", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "50000"))
+# Seconds per shared-cache call before it counts as a miss
+CACHE_TIMEOUT = float(os.getenv("CACHE_TIMEOUT", "0.1"))
+
+# Above this many list tags per write, replace issues:epoch instead
+MAX_TAG_BUMPS = 512
+# Filters of GET /api/issues whose values partition the cached lists
+ISSUE_LIST_FILTERS = ("repo_id", "status", "priority", "creator_id", "assignee_id")
+
+KEY_PREFIX = "gitforge:v1:"
+EPOCH_KEY = "issues:epoch"
+DELETED = "deleted"
+
+CACHE_REQUESTS = Counter("cache_requests_total", "Read-through cache lookups", ["query", "result"])
+CACHE_INVALIDATIONS = Counter("cache_invalidations_total", "Dependency tokens replaced by writes", ["kind"])
+CACHE_ERRORS = Counter("cache_errors_total", "Shared cache calls that failed (served from the database)")
+
+class MemoryBackend:
+    """In-process TTL + LRU store; values are kept as Python objects."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _get(self, key: str) -> Any:
+        item = self.entries.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: Any, ttl: float) -> None:
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        return [self._get(key) for key in keys]
+
+    async def set_many(self, items: Dict[str, Any], ttl: float) -> None:
+        for key, value in items.items():
+            self._set(key, value, ttl)
+
+    async def add_many(self, items: Dict[str, Any], ttl: float) -> List[Any]:
+        current = []
+        for key, value in items.items():
+            existing = self._get(key)
+            if existing is None:
+                self._set(key, value, ttl)
+                existing = value
+            current.append(existing)
+        return current
+
+class RedisBackend:
+    """Shared store on a Redis-protocol server; values are JSON."""
+
+    def __init__(self, url: str, timeout: float):
+        self.client = redis_asyncio.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        values = await self.client.mget([KEY_PREFIX + key for key in keys])
+        return [None if value is None else json.loads(value) for value in values]
+
+    async def set_many(self, items: Dict[str, Any], ttl: float) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(KEY_PREFIX + key, json.dumps(value), ex=int(ttl))
+        await pipe.execute()
+
+    async def add_many(self, items: Dict[str, Any], ttl: float) -> List[Any]:
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(KEY_PREFIX + key, json.dumps(value), ex=int(ttl), nx=True)
+            pipe.get(KEY_PREFIX + key)
+        replies = await pipe.execute()
+        return [None if value is None else json.loads(value) for value in replies[1::2]]
+
+def _token() -> str:
+    return uuid.uuid4().hex
+
+def issue_version(updated_at: Optional[datetime]) -> str:
+    return updated_at.isoformat() if updated_at is not None else "none"
+
+def issue_key(issue_id: int) -> str:
+    return f"issue:{issue_id}"
+
+def issue_version_key(issue_id: int) -> str:
+    return f"issue:{issue_id}:v"
+
+def comments_key(issue_id: int) -> str:
+    return f"comments:{issue_id}"
+
+def comments_generation_key(issue_id: int) -> str:
+    return f"comments:{issue_id}:g"
+
+def _canonical(params: Dict[str, Any]) -> str:
+    return json.dumps({name: value for name, value in params.items() if value is not None}, sort_keys=True)
+
+def issue_list_key(params: Dict[str, Any]) -> str:
+    """Entry key of one list page: every filter, sort and paging parameter."""
+    return f"issues:list:{_canonical(params)}"
+
+def issue_list_tag(filters: Dict[str, Any]) -> str:
+    """Dependency tag shared by every page of lists with these filter values."""
+    return f"issues:tag:{_canonical(filters)}"
+
+def issue_tags(issue: Any) -> List[str]:
+    """Tags of every list that could contain issue: all subsets of its filter values."""
+    values = {name: getattr(issue, name) for name in ISSUE_LIST_FILTERS if getattr(issue, name) is not None}
+    return [
+        issue_list_tag({name: values[name] for name in subset})
+        for size in range(len(values) + 1)
+        for subset in combinations(sorted(values), size)
+    ]
+
+class QueryCache:
+    """Read-through cache with dependency-token invalidation (see above)."""
+
+    def __init__(self, backend: Any, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        # Dependency tokens outlive entries; one that is gone just means a miss
+        self.token_ttl = ttl * 10
+        self.enabled = enabled
+
+    async def _call(self, method: str, *args) -> Any:
+        try:
+            return await getattr(self.backend, method)(*args)
+        except Exception as error:
+            CACHE_ERRORS.inc()
+            logger.warning(f"⚠️ Cache {method} failed, using the database: {error}")
+            return None
+
+    async def get(self, key: str, query: str) -> Any:
+        """The cached value for key if all of its dependencies are unchanged, else None."""
+        if not self.enabled:
+            return None
+        entry = ((await self._call("get_many", [key])) or [None])[0]
+        if entry is not None:
+            deps = entry["deps"]
+            current = await self._call("get_many", list(deps))
+            if current is not None and current == list(deps.values()):
+                CACHE_REQUESTS.labels(query, "hit").inc()
+                return entry["value"]
+        CACHE_REQUESTS.labels(query, "miss").inc()
+        return None
+
+    async def tokens(self, keys: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Current tokens for keys, creating missing ones.
+
+        Read before the query that fills an entry; None if the cache is off
+        or unreachable (then nothing is stored).
+        """
+        if not self.enabled:
+            return None
+        current = await self._call("add_many", {key: _token() for key in keys}, self.token_ttl)
+        return None if current is None else dict(zip(keys, current))
+
+    async def put(
+        self, key: str, value: Any, deps: Optional[Dict[str, Any]], versions: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Store value under key, valid while deps and versions are unchanged.
+
+        deps come from tokens() taken before the query; versions are derived
+        from the rows read (issue updated_at). A version that is already
+        newer than the row means a write won the race: nothing is stored.
+        """
+        if deps is None or not self.enabled:
+            return
+        deps = dict(deps)
+        if versions:
+            current = await self._call("add_many", versions, self.token_ttl)
+            if current is None or current != list(versions.values()):
+                return
+            deps.update(versions)
+        await self._call("set_many", {key: {"deps": deps, "value": value}}, self.ttl)
+
+    async def issues_written(self, issues: Iterable[Any]) -> None:
+        """After issues were created or updated: new versions, and the tags of their new values."""
+        if not self.enabled:
+            return
+        versions, tags = {}, set()
+        for issue in issues:
+            versions[issue_version_key(issue.issue_id)] = issue_version(issue.updated_at)
+            tags.update(issue_tags(issue))
+        if len(tags) > MAX_TAG_BUMPS:
+            tags = {EPOCH_KEY}
+        CACHE_INVALIDATIONS.labels("issue").inc(len(versions))
+        CACHE_INVALIDATIONS.labels("list").inc(len(tags))
+        await self._call("set_many", {**versions, **{tag: _token() for tag in tags}}, self.token_ttl)
+
+    async def issues_deleted(self, issue_ids: Iterable[int]) -> None:
+        """After issues were deleted: pages containing them and their comments go stale."""
+        if not self.enabled:
+            return
+        tokens = {}
+        for issue_id in issue_ids:
+            tokens[issue_version_key(issue_id)] = DELETED
+            tokens[comments_generation_key(issue_id)] = _token()
+        CACHE_INVALIDATIONS.labels("issue").inc(len(tokens) // 2)
+        await self._call("set_many", tokens, self.token_ttl)
+
+    async def comments_written(self, issue_id: int) -> None:
+        if not self.enabled:
+            return
+        CACHE_INVALIDATIONS.labels("comments").inc()
+        await self._call("set_many", {comments_generation_key(issue_id): _token()}, self.token_ttl)
+
+def create_backend() -> Any:
+    if CACHE_URL:
+        if redis_asyncio is not None:
+            return RedisBackend(CACHE_URL, CACHE_TIMEOUT)
+        logger.warning("⚠️ CACHE_URL is set but the redis package is missing; caching in-process")
+    return MemoryBackend(CACHE_MAX_ENTRIES)
+
+cache = QueryCache(create_backend(), CACHE_TTL, CACHE_ENABLED)
+
+CACHE_ENTRIES = Gauge("cache_entries", "Keys held by the in-process cache (entries and tokens)")
+CACHE_ENTRIES.set_function(lambda: len(getattr(cache.backend, "entries", ())))
+
+def cache_readable(cache_control: Optional[str]) -> bool:
+    """False if the client asked to bypass cached copies (Cache-Control: no-cache / no-store)."""
+    directives = {directive.strip().split("=")[0] for directive in (cache_control or "").lower().split(",")}
+    return not directives & {"no-cache", "no-store"}
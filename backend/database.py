@@ -1,27 +1,363 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from prometheus_client import Counter, Gauge, Histogram
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
 import os
+import random
+import time
+
+logger = logging.getLogger(__name__)
 
 # Connection string for CockroachDB
 # Using defaultdb to ensure connectivity without extra setup steps
 # Use environment variable if available (e.g., in Kubernetes), otherwise localhost
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "cockroachdb://root@localhost:26257/defaultdb")
 
+# Sync drivers named in DATABASE_URL (or implied by a bare scheme) and their
+# async counterparts; psycopg 3 speaks both, so the same URL keeps working
+ASYNC_DRIVERS = {
+    "cockroachdb": "cockroachdb+psycopg",
+    "cockroachdb+psycopg2": "cockroachdb+psycopg",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str):
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername))
+
+# --- CONNECTION POOL ---
+# Sized per worker process. LIFO keeps the hot connections in use and lets
+# the rest idle out; recycle bounds connection age so new CockroachDB nodes
+# get connections after a rebalance. Dead connections are found by errors
+# (SQLAlchemy invalidates the whole pool on a disconnect) and by
+# pool_liveness_loop, not by a SELECT 1 before every checkout: that
+# pre-ping doubles round trips on short queries. DB_POOL_PRE_PING=true
+# restores it.
+def env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
 
-# Pool pre-ping is enabled to handle connection drops during Fault Injection experiments
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    pool_pre_ping=True 
+POOL_CONFIG = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_use_lifo": env_bool("DB_POOL_USE_LIFO", True),
+    "pool_pre_ping": env_bool("DB_POOL_PRE_PING", False),
+}
+# Seconds between background liveness checks (0 disables them)
+DB_POOL_LIVENESS_INTERVAL = float(os.getenv("DB_POOL_LIVENESS_INTERVAL", "5"))
+
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time to obtain a pooled connection (queueing for a free one, or opening a new one)",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+POOL_CONNECT = Histogram(
+    "db_pool_connect_seconds",
+    "Time to open a new database connection",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+POOL_HELD = Histogram(
+    "db_pool_checkout_seconds",
+    "Time a connection stays checked out (request's database work incl. its round trips)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
 )
+POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT")
+POOL_INVALIDATIONS = Counter("db_pool_invalidations_total", "Connections discarded after an error")
+POOL_LIVENESS_FAILURES = Counter("db_pool_liveness_failures_total", "Failed background liveness checks")
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait and how long connects take."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start)
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            POOL_CONNECT.observe(time.perf_counter() - start)
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """Export utilization gauges and checkout-duration timing for engine's pool."""
+    # engine.dispose() swaps in a fresh pool, so always read the current one
+    def pool():
+        return engine.sync_engine.pool
+    Gauge("db_pool_size", "Configured pool size").set_function(lambda: pool().size())
+    Gauge("db_pool_checked_out", "Connections currently checked out").set_function(lambda: max(pool().checkedout(), 0))
+    Gauge("db_pool_idle", "Idle connections in the pool").set_function(lambda: pool().checkedin())
+    Gauge("db_pool_overflow", "Connections open beyond pool_size").set_function(lambda: max(pool().overflow(), 0))
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, record, proxy):
+        record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def on_checkin(dbapi_connection, record):
+        started = record.info.pop("checked_out_at", None)
+        if started is not None:
+            POOL_HELD.observe(time.perf_counter() - started)
+
+    @event.listens_for(engine.sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, record, exception):
+        POOL_INVALIDATIONS.inc()
+
+async def pool_liveness_loop(engine: AsyncEngine, interval: float) -> None:
+    """
+    Background replacement for per-checkout pre-ping.
+
+    Runs SELECT 1 on a pooled connection every interval seconds. A
+    disconnect error makes SQLAlchemy invalidate the whole pool, so after a
+    node restart the stale connections are replaced before requests hit them.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as error:
+            POOL_LIVENESS_FAILURES.inc()
+            logger.warning(f"⚠️ Database liveness check failed: {error}")
+
+# --- NODE ROUTING ---
+# DATABASE_NODES="host1:26257,host2:26257,..." spreads connections over
+# several CockroachDB gateways instead of the one host in DATABASE_URL
+# (whose other settings still apply). New connections go round-robin to
+# nodes believed healthy. A node that refuses or times out a connect, or
+# whose connection dies with an error, is tried last for DB_NODE_COOLDOWN
+# seconds; as a disconnect also invalidates the pool, the replacement
+# connections land on the surviving nodes without waiting for DNS.
+DATABASE_NODES = [node.strip() for node in os.getenv("DATABASE_NODES", "").split(",") if node.strip()]
+DB_NODE_COOLDOWN = float(os.getenv("DB_NODE_COOLDOWN", "10"))
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "3"))
+
+NODE_HEALTHY = Gauge("db_node_healthy", "1 if the last connect to the node succeeded", ["node"])
+NODE_CONNECTIONS = Counter("db_node_connections_total", "Connections opened per node", ["node"])
+NODE_FAILURES = Counter("db_node_failures_total", "Failed connects and connection errors per node", ["node"])
+
+class NodeRouter:
+    """Round-robin choice of CockroachDB node with passive health tracking."""
+
+    def __init__(self, nodes: List[str], cooldown: float):
+        self.nodes = nodes
+        self.cooldown = cooldown
+        self.down_until: Dict[str, float] = {}
+        self._next = 0
+        for node in nodes:
+            NODE_HEALTHY.labels(node).set(1)
+
+    def candidates(self) -> List[str]:
+        """Every node in the order to try: healthy ones first, rotating the start."""
+        start = self._next
+        self._next = (start + 1) % len(self.nodes)
+        rotated = self.nodes[start:] + self.nodes[:start]
+        now = time.monotonic()
+        healthy = [node for node in rotated if self.down_until.get(node, 0) <= now]
+        return healthy + [node for node in rotated if node not in healthy]
+
+    def mark_down(self, node: str) -> None:
+        if self.down_until.get(node, 0) <= time.monotonic():
+            logger.warning(f"⚠️ CockroachDB node {node} marked down for {self.cooldown}s")
+        self.down_until[node] = time.monotonic() + self.cooldown
+        NODE_FAILURES.labels(node).inc()
+        NODE_HEALTHY.labels(node).set(0)
+
+    def mark_up(self, node: str) -> None:
+        if self.down_until.pop(node, None) is not None:
+            logger.info(f"✅ CockroachDB node {node} is back")
+        NODE_CONNECTIONS.labels(node).inc()
+        NODE_HEALTHY.labels(node).set(1)
+
+def route_connections(engine: AsyncEngine, router: NodeRouter) -> None:
+    """Open engine's connections on the nodes chosen by router."""
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    @event.listens_for(engine.sync_engine, "do_connect")
+    def connect_to_node(dialect, record, cargs, cparams):
+        error = None
+        for node in router.candidates():
+            host, _, port = node.partition(":")
+            params = dict(cparams, host=host, port=int(port or 26257))
+            # A partitioned node would otherwise hang the connect for minutes
+            params.setdefault("connect_timeout", DB_CONNECT_TIMEOUT)
+            try:
+                connection = dialect.connect(*cargs, **params)
+            except dialect.loaded_dbapi.Error as exc:
+                router.mark_down(node)
+                error = exc
+                continue
+            router.mark_up(node)
+            record.info["node"] = node
+            return connection
+        raise error
+
+    @event.listens_for(engine.sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, record, exception):
+        # Only the connection that hit the error carries it
+        if exception is not None and "node" in record.info:
+            router.mark_down(record.info["node"])
+
+# Async engine: a request waiting on CockroachDB holds no threadpool thread,
+# so one worker can keep thousands of queries in flight (bounded by the pool).
+engine = create_async_engine(
+    async_database_url(SQLALCHEMY_DATABASE_URL),
+    poolclass=InstrumentedPool,
+    **POOL_CONFIG
+)
+instrument_pool(engine)
+if DATABASE_NODES:
+    route_connections(engine, NodeRouter(DATABASE_NODES, DB_NODE_COOLDOWN))
+
+# expire_on_commit=False: objects stay readable after commit without an
+# implicit (and, under asyncio, impossible) lazy refresh
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
+
+# --- FOLLOWER READS ---
+# A client that accepts stale data (Cache-Control: max-stale, optionally
+# with at least DB_FOLLOWER_READ_STALENESS seconds) gets its read-only
+# request served AS OF SYSTEM TIME follower_read_timestamp(): any replica
+# can answer it, so it costs no leaseholder hop, never waits on a write
+# intent and keeps working while a dead node's leases move.
+DB_FOLLOWER_READ_STALENESS = float(os.getenv("DB_FOLLOWER_READ_STALENESS", "4.8"))
+
+FOLLOWER_READS = Counter("db_follower_reads_total", "Read-only requests served as follower reads")
+
+def allows_follower_read(cache_control: Optional[str]) -> bool:
+    """True if a Cache-Control request header accepts follower-read staleness."""
+    for directive in (cache_control or "").lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name == "max-stale":
+            value = value.strip(' "')
+            if not value:
+                return True
+            try:
+                return float(value) >= DB_FOLLOWER_READ_STALENESS
+            except ValueError:
+                return False
+    return False
+
+FOLLOWER_READ_STATEMENT = "SET TRANSACTION AS OF SYSTEM TIME follower_read_timestamp()"
+
+def _begin_follower_read(session, transaction, connection) -> None:
+    connection.exec_driver_sql(FOLLOWER_READ_STATEMENT)
+    FOLLOWER_READS.inc()
+
+async def get_read_db(request: Request):
+    """
+    get_db for read-only endpoints.
+
+    Pins the session's transactions to follower_read_timestamp() when the
+    client allows it (CockroachDB only; other databases get a normal session).
+    The SET TRANSACTION is sent when the session begins its first
+    transaction, so a request answered from the cache costs no round trip.
+    """
+    async with SessionLocal() as db:
+        if engine.dialect.name == "cockroachdb" and allows_follower_read(request.headers.get("cache-control")):
+            event.listen(db.sync_session, "after_begin", _begin_follower_read)
+            # Stale rows must not be cached as current (see cache.py)
+            db.info["follower_read"] = True
         yield db
-    finally:
-        db.close()
+
+# --- TRANSACTION RETRIES ---
+# CockroachDB runs SERIALIZABLE and aborts one side of a conflict with
+# SQLSTATE 40001; the client is expected to retry. Backoff is full jitter:
+# uniform(0, min(DB_MAX_BACKOFF, 0.1s * 2^retry)).
+DB_MAX_RETRIES = int(os.getenv("DB_MAX_RETRIES", "5"))
+DB_MAX_BACKOFF = float(os.getenv("DB_MAX_BACKOFF", "1.0"))
+
+TRANSACTION_RETRIES = Counter(
+    "db_transaction_retries_total",
+    "CockroachDB transaction retries after a serialization failure (40001)",
+    ["operation"]
+)
+TRANSACTION_RETRIES_EXHAUSTED = Counter(
+    "db_transaction_retries_exhausted_total",
+    "Transactions that still failed with 40001 after DB_MAX_RETRIES retries",
+    ["operation"]
+)
+
+def is_retryable(error: DBAPIError) -> bool:
+    """True for serialization failures (psycopg2 exposes pgcode, psycopg 3 sqlstate)."""
+    orig = error.orig
+    return "40001" in (getattr(orig, "pgcode", None), getattr(orig, "sqlstate", None))
+
+async def _backoff(operation: str, retries: int) -> None:
+    TRANSACTION_RETRIES.labels(operation).inc()
+    await asyncio.sleep(random.uniform(0, min(DB_MAX_BACKOFF, 0.1 * 2 ** retries)))
+
+async def run_write(db: AsyncSession, callback: Callable[[AsyncSession], Awaitable[Any]], operation: str) -> Any:
+    """
+    Run callback(session) as one transaction with CockroachDB's client-side retry protocol.
+
+    BEGIN; SAVEPOINT cockroach_restart; <callback>; RELEASE SAVEPOINT
+    cockroach_restart; COMMIT. On 40001 (also from RELEASE, which is where
+    CockroachDB commits) it rolls back to the savepoint, backs off and calls
+    callback again, so callback must only touch the database and must build
+    its return value itself.
+    """
+    async with db.begin():
+        conn = await db.connection()
+        retries = 0
+        while True:
+            await conn.execute(text("SAVEPOINT cockroach_restart"))
+            try:
+                result = await callback(db)
+                await conn.execute(text("RELEASE SAVEPOINT cockroach_restart"))
+                return result
+            except DBAPIError as error:
+                if not is_retryable(error):
+                    raise
+                if retries >= DB_MAX_RETRIES:
+                    TRANSACTION_RETRIES_EXHAUSTED.labels(operation).inc()
+                    raise
+                await conn.execute(text("ROLLBACK TO SAVEPOINT cockroach_restart"))
+                # Rows loaded by the aborted attempt must not leak into the next one
+                db.expunge_all()
+                retries += 1
+                await _backoff(operation, retries)
+
+async def execute_write(db: AsyncSession, statement, operation: str):
+    """
+    Run a single INSERT/UPDATE/DELETE ... RETURNING as an implicit transaction.
+
+    One round trip: no BEGIN/COMMIT and no follow-up SELECT, so CockroachDB
+    can commit it on its one-phase fast path. CockroachDB retries implicit
+    transactions server-side; a 40001 that still reaches us is retried here
+    with the same backoff as run_write. Must be the session's first statement
+    of the request.
+    """
+    conn = await db.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+    retries = 0
+    while True:
+        try:
+            return await conn.execute(statement)
+        except DBAPIError as error:
+            if not is_retryable(error):
+                raise
+            if retries >= DB_MAX_RETRIES:
+                TRANSACTION_RETRIES_EXHAUSTED.labels(operation).inc()
+                raise
+            retries += 1
+            await _backoff(operation, retries)
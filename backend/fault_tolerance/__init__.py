@@ -9,6 +9,11 @@ This module provides explicit implementations of fault tolerance techniques:
 
 Each technique is implemented as a separate class following the Strategy pattern,
 allowing researchers to switch between them for comparative experiments.
+
+Strategies store their records in a pluggable StorageBackend (in-memory,
+SQLite or memory-mapped file), selected with the 'storage_backend' config key.
+Simulated recovery latency comes from a CostModel ('legacy', 'real' or a
+'modeled' calibrated device profile), selected with the 'cost_model' key.
 """
 
 from .baseline import BaselineStrategy
@@ -16,6 +21,26 @@ from .checkpointing import CheckpointingStrategy
 from .replication import ReplicationStrategy
 from .hybrid import HybridStrategy
 from .manager import FaultToleranceManager, get_manager
+from .executor import ParallelExperimentExecutor, run_isolated_experiment
+from .jobs import ExperimentJob, ExperimentJobQueue, get_job_queue, shutdown_job_queue
+from .workload import (
+    SyntheticWorkload,
+    WorkloadProfile,
+    OperationGenerator,
+    YCSB_WORKLOADS,
+    get_workload_profile
+)
+from .metrics import LatencyHistogram
+from .recovery import RecoveryTrace, RecoveryPhase
+from .cost_model import CostModel, DeviceProfile, calibrate_device, create_cost_model
+from .faults import FaultInjector, FaultSchedule, FaultScheduler
+from .storage import (
+    StorageBackend,
+    InMemoryBackend,
+    SQLiteBackend,
+    MmapBackend,
+    create_storage_backend
+)
 
 __all__ = [
     'BaselineStrategy',
@@ -23,5 +48,31 @@ __all__ = [
     'ReplicationStrategy',
     'HybridStrategy',
     'FaultToleranceManager',
-    'get_manager'
+    'get_manager',
+    'ParallelExperimentExecutor',
+    'run_isolated_experiment',
+    'ExperimentJob',
+    'ExperimentJobQueue',
+    'get_job_queue',
+    'shutdown_job_queue',
+    'SyntheticWorkload',
+    'WorkloadProfile',
+    'OperationGenerator',
+    'YCSB_WORKLOADS',
+    'get_workload_profile',
+    'LatencyHistogram',
+    'RecoveryTrace',
+    'RecoveryPhase',
+    'CostModel',
+    'DeviceProfile',
+    'calibrate_device',
+    'create_cost_model',
+    'FaultInjector',
+    'FaultSchedule',
+    'FaultScheduler',
+    'StorageBackend',
+    'InMemoryBackend',
+    'SQLiteBackend',
+    'MmapBackend',
+    'create_storage_backend'
 ]
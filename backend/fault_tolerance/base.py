@@ -6,13 +6,39 @@ This follows the Strategy Pattern to allow runtime switching between techniques.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
+import asyncio
+import functools
+import os
+import shutil
+import tempfile
+import time
+import uuid
 import logging
 
+from .cost_model import CostModel, create_cost_model
+from .faults import FaultInjector, corrupt_file
+from .metrics import LatencyRecorder
+from .recovery import RecoveryTrace
+from .storage import DEFAULT_STORAGE_DIR
+
 logger = logging.getLogger(__name__)
 
 
+def _advance(steps: Generator[float, None, float]) -> Tuple[bool, float]:
+    """
+    Run a recovery generator up to its next simulated latency.
+    
+    Returns (done, value): value is the latency to wait for, or the
+    recovery time once the generator has finished.
+    """
+    try:
+        return False, next(steps)
+    except StopIteration as stop:
+        return True, stop.value
+
+
 class BaseFaultToleranceStrategy(ABC):
     """
     Abstract base class for all fault tolerance strategies.
@@ -22,6 +48,22 @@ class BaseFaultToleranceStrategy(ABC):
     - Retrieving data with recovery capabilities
     - Simulating failures for research experiments
     - Recovering from simulated failures
+    
+    Every blocking operation has an async counterpart (astore, aretrieve,
+    arecover) for use from the API's event loop: simulated latency is
+    awaited with asyncio.sleep and real work runs in an executor.
+    
+    store(), retrieve() and recover() are timed with perf_counter_ns and
+    recorded in per-operation latency histograms (see get_stats());
+    subclasses implement _store, _retrieve and _recovery_steps, and time
+    their own extra operations with _record_latency.
+    
+    Strategies own background threads and on-disk directories, so they
+    must be closed when no longer needed, either explicitly or as a
+    context manager:
+    
+        with CheckpointingStrategy({'checkpoint_interval': 15}) as strategy:
+            strategy.store('key', 'value')
     """
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -31,7 +73,20 @@ class BaseFaultToleranceStrategy(ABC):
         Args:
             config: Strategy-specific configuration parameters
         """
-        self.config = config or {}
+        self.config = dict(config or {})
+        self.instance_id = uuid.uuid4().hex[:8]
+        self._closed = False
+        
+        # Persistent storage does real I/O, so async callers offload it
+        self._blocking_io = self.config.get('storage_backend', 'memory') != 'memory'
+        
+        # Directories created for this instance only (removed on close)
+        self._owned_dirs: List[str] = []
+        
+        # Persistent storage backends get a private directory unless one is given
+        if self.config.get('storage_backend', 'memory') != 'memory' and 'storage_dir' not in self.config:
+            self.config['storage_dir'] = self._make_private_dir(DEFAULT_STORAGE_DIR)
+        
         self.stats = {
             'writes': 0,
             'reads': 0,
@@ -40,6 +95,29 @@ class BaseFaultToleranceStrategy(ABC):
             'last_operation': None
         }
         self._is_failed = False
+        
+        # Latency histograms (per operation and per replica)
+        self.latency = LatencyRecorder(self.__class__.__name__.replace('Strategy', '').lower())
+        
+        # Phase breakdown of the most recent recovery
+        self.last_recovery_trace: Optional[RecoveryTrace] = None
+        
+        # Seeded source of every random fault decision (replaced per experiment)
+        self.faults = FaultInjector.from_config(self.config)
+        
+        # Extra latency injected by a fault schedule, per node ('' = every operation)
+        self._injected_latency: Dict[str, float] = {}
+        
+        # Last successfully stored key, read back by the 'first_read' recovery phase
+        self._last_stored_key: Optional[str] = None
+        
+        # Latency of simulated recovery steps ('legacy', 'real' or 'modeled')
+        self.cost_model: CostModel = create_cost_model(
+            self.config,
+            self.config.get('checkpoint_dir') or self.config.get('storage_dir') or tempfile.gettempdir(),
+            self.faults.stream('latency')
+        )
+        
         logger.info(f"Initialized {self.__class__.__name__} with config: {self.config}")
     
     @property
@@ -48,7 +126,6 @@ class BaseFaultToleranceStrategy(ABC):
         """Return the name of this fault tolerance strategy."""
         pass
     
-    @abstractmethod
     def store(self, key: str, value: Any) -> bool:
         """
         Store a key-value pair with fault tolerance guarantees.
@@ -60,9 +137,16 @@ class BaseFaultToleranceStrategy(ABC):
         Returns:
             True if storage was successful, False otherwise
         """
-        pass
+        started = time.perf_counter_ns()
+        try:
+            self._apply_injected_latency()
+            stored = self._store(key, value)
+            if stored:
+                self._last_stored_key = key
+            return stored
+        finally:
+            self._record_latency('store', time.perf_counter_ns() - started)
     
-    @abstractmethod
     def retrieve(self, key: str) -> Optional[Any]:
         """
         Retrieve a value by its key, with recovery if needed.
@@ -73,6 +157,21 @@ class BaseFaultToleranceStrategy(ABC):
         Returns:
             The stored value, or None if not found
         """
+        started = time.perf_counter_ns()
+        try:
+            self._apply_injected_latency()
+            return self._retrieve(key)
+        finally:
+            self._record_latency('retrieve', time.perf_counter_ns() - started)
+    
+    @abstractmethod
+    def _store(self, key: str, value: Any) -> bool:
+        """Strategy-specific store (timed by store())."""
+        pass
+    
+    @abstractmethod
+    def _retrieve(self, key: str) -> Optional[Any]:
+        """Strategy-specific retrieve (timed by retrieve())."""
         pass
     
     @abstractmethod
@@ -86,27 +185,260 @@ class BaseFaultToleranceStrategy(ABC):
         pass
     
     @abstractmethod
+    def _recovery_steps(self, trace: RecoveryTrace) -> Generator[float, None, float]:
+        """
+        Recovery procedure, written as a generator.
+        
+        Each yielded value is a simulated latency in seconds; the driver
+        (recover or arecover) waits that long before resuming. The
+        generator's return value is the total recovery time.
+        
+        Args:
+            trace: Recovery trace to record phases (detect, read, ...) in
+        """
+        pass
+    
     def recover(self) -> float:
         """
-        Recover from a simulated failure.
+        Recover from a simulated failure (blocking).
+        
+        Returns:
+            The time (in seconds) taken to recover; the phase breakdown is
+            kept in last_recovery_trace
+        """
+        trace = RecoveryTrace(self.__class__.__name__)
+        started = time.perf_counter_ns()
+        steps = self._recovery_steps(trace)
+        while True:
+            done, value = _advance(steps)
+            if done:
+                break
+            time.sleep(value)
+        
+        self._record_latency('recover', time.perf_counter_ns() - started)
+        self._first_read(trace)
+        return self._finish_recovery(trace, value)
+    
+    async def arecover(self) -> float:
+        """
+        Recover from a simulated failure without blocking the event loop.
+        
+        Recovery work runs in the default executor; simulated latency is
+        awaited with asyncio.sleep so other requests keep being served.
+        
+        Returns:
+            The time (in seconds) taken to recover; the phase breakdown is
+            kept in last_recovery_trace
+        """
+        loop = asyncio.get_running_loop()
+        trace = RecoveryTrace(self.__class__.__name__)
+        started = time.perf_counter_ns()
+        steps = self._recovery_steps(trace)
+        while True:
+            done, value = await loop.run_in_executor(None, _advance, steps)
+            if done:
+                break
+            await asyncio.sleep(value)
+        
+        self._record_latency('recover', time.perf_counter_ns() - started)
+        await loop.run_in_executor(None, self._first_read, trace)
+        return self._finish_recovery(trace, value)
+    
+    def _first_read(self, trace: RecoveryTrace) -> None:
+        """
+        Time the first successful read after recovery (the 'first_read' phase).
+        
+        Reads back the last key stored before the failure, so the phase
+        measures a single retrieve rather than a scan of the keyspace.
+        """
+        key = self._last_stored_key
+        with trace.phase('first_read') as phase:
+            if self._is_failed:
+                phase.details['skipped'] = 'still failed'
+                return
+            phase.details['key'] = key
+            phase.records = int(key is not None and self.retrieve(key) is not None)
+    
+    def _finish_recovery(self, trace: RecoveryTrace, recovery_time: float) -> float:
+        """Store the completed trace and return the recovery time."""
+        trace.finish(recovery_time)
+        self.last_recovery_trace = trace
+        self.stats['last_recovery_time'] = recovery_time
+        return recovery_time
+    
+    def set_fault_injector(self, faults: FaultInjector) -> None:
+        """Draw all further fault decisions and simulated latencies from faults."""
+        self.faults = faults
+        self.cost_model.rng = faults.stream('latency')
+    
+    def fault_targets(self) -> List[str]:
+        """Node ids that fault schedule events can target (none by default)."""
+        return []
+    
+    def fail_node(self, node_id: str) -> None:
+        """Fail a single node. Overridden by strategies with nodes."""
+        raise ValueError(f"{self.__class__.__name__} has no node '{node_id}'")
+    
+    def inject_latency(self, delay: float, node_id: Optional[str] = None) -> None:
+        """
+        Add delay seconds to every operation, or to those served by one node.
+        
+        A delay of 0 removes the injected latency again.
+        """
+        if node_id is not None and node_id not in self.fault_targets():
+            raise ValueError(f"{self.__class__.__name__} has no node '{node_id}'")
+        if delay > 0:
+            self._injected_latency[node_id or ''] = delay
+        else:
+            self._injected_latency.pop(node_id or '', None)
+        logger.warning(f"🐢 Injected {delay * 1000:.0f}ms latency on {node_id or 'all operations'}")
+    
+    def corrupt_checkpoint(self) -> Optional[str]:
+        """
+        Make the latest checkpoint file undecodable.
         
         Returns:
-            The time (in seconds) taken to recover
+            The corrupted file, or None if no checkpoint exists yet
+        """
+        path = self._latest_checkpoint_path()
+        if path is None:
+            logger.warning(f"{self.__class__.__name__}: no checkpoint to corrupt")
+            return None
+        corrupt_file(path)
+        logger.critical(f"🔥 Corrupted checkpoint {os.path.basename(path)}")
+        return path
+    
+    def _latest_checkpoint_path(self) -> Optional[str]:
+        """Most recent checkpoint file. Overridden by checkpointing strategies."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not write checkpoints")
+    
+    def heal(self) -> float:
+        """Remove injected latency and recover from any failure."""
+        self._injected_latency.clear()
+        return self.recover()
+    
+    def _apply_injected_latency(self, node_id: str = '') -> None:
+        delay = self._injected_latency.get(node_id)
+        if delay:
+            time.sleep(delay)
+    
+    def get_recovery_trace(self) -> Optional[Dict[str, Any]]:
+        """Return the phase breakdown of the most recent recovery, if any."""
+        return self.last_recovery_trace.to_dict() if self.last_recovery_trace else None
+    
+    def _may_block(self) -> bool:
+        """True if store/retrieve can block: real storage I/O or injected latency (time.sleep)."""
+        return self._blocking_io or bool(self._injected_latency)
+    
+    async def astore(self, key: str, value: Any) -> bool:
+        """Async store; offloaded to an executor when it may block."""
+        if not self._may_block():
+            return self.store(key, value)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.store, key, value)
+    
+    async def aretrieve(self, key: str) -> Optional[Any]:
+        """Async retrieve; offloaded to an executor when it may block."""
+        if not self._may_block():
+            return self.retrieve(key)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.retrieve, key)
+    
+    async def asimulate_failure(self, **kwargs) -> None:
+        """Async simulate_failure (stopping checkpoint threads can block)."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self.simulate_failure, **kwargs))
+    
+    def store_many(self, items: Iterable[Tuple[str, Any]]) -> int:
         """
+        Store many key-value pairs (used for bulk loads and migrations).
+        
+        Returns:
+            Number of items stored successfully
+        """
+        return sum(1 for key, value in items if self.store(key, value))
+    
+    def export_items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield every (key, value) pair currently held by this strategy.
+        
+        Used by the manager to migrate live data into a new strategy.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support data export")
+    
+    def close(self) -> None:
+        """
+        Shut down this strategy instance.
+        
+        Stops background threads, closes storage backends and removes
+        any directories created for this instance. Safe to call twice.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        
+        try:
+            self._release_resources()
+        finally:
+            for path in self._owned_dirs:
+                shutil.rmtree(path, ignore_errors=True)
+            self._owned_dirs = []
+        
+        logger.info(f"{self.__class__.__name__} [{self.instance_id}] closed")
+    
+    @property
+    def closed(self) -> bool:
+        """True once close() has been called."""
+        return self._closed
+    
+    def __enter__(self) -> 'BaseFaultToleranceStrategy':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _release_resources(self) -> None:
+        """Stop threads and close storage. Overridden by subclasses."""
         pass
     
+    def _make_private_dir(self, parent: str) -> str:
+        """Create a directory under parent owned by this instance."""
+        os.makedirs(parent, exist_ok=True)
+        path = tempfile.mkdtemp(
+            prefix=f"{self.__class__.__name__.lower()}_{self.instance_id}_",
+            dir=parent
+        )
+        self._owned_dirs.append(path)
+        return path
+    
     def get_stats(self) -> Dict[str, Any]:
-        """Return statistics about this strategy's operations."""
-        return {
+        """
+        Return statistics about this strategy's operations.
+        
+        'latency' holds per-operation histogram summaries (count, mean and
+        p50/p90/p99/p999/max in ms); 'replica_latency' the same per replica.
+        """
+        stats = {
             **self.stats,
             'strategy': self.strategy_name,
-            'is_failed': self._is_failed
+            'is_failed': self._is_failed,
+            'cost_model': self.cost_model.describe(),
+            'faults': self.faults.to_dict(),
+            'latency': self.latency.summary()
         }
+        replica_latency = self.latency.replica_summary()
+        if replica_latency:
+            stats['replica_latency'] = replica_latency
+        return stats
     
     def is_healthy(self) -> bool:
         """Check if the strategy is currently operational."""
         return not self._is_failed
     
+    def _record_latency(self, operation: str, elapsed_ns: int, replica: str = '') -> None:
+        """Record an operation latency (ns), optionally for a single replica."""
+        self.latency.record(operation, elapsed_ns, replica)
+    
     def _record_operation(self, operation_type: str) -> None:
         """Record an operation for statistics tracking."""
         self.stats[operation_type] = self.stats.get(operation_type, 0) + 1
@@ -13,11 +13,13 @@ Research Context:
 - Use Case: Baseline comparison for measuring effectiveness of other techniques
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Generator, Iterator, Optional, Tuple
 import time
 import logging
 
 from .base import BaseFaultToleranceStrategy
+from .recovery import RecoveryTrace
+from .storage import StorageBackend, create_storage_backend
 
 logger = logging.getLogger(__name__)
 
@@ -35,17 +37,17 @@ class BaselineStrategy(BaseFaultToleranceStrategy):
         Initialize the baseline strategy.
         
         Config options:
-            - None required (this is the simplest strategy)
+            - storage_backend: 'memory' (default), 'sqlite' or 'mmap'
         """
         super().__init__(config)
-        self._data_store: Dict[str, Any] = {}
+        self._data_store: StorageBackend = create_storage_backend(self.config, 'baseline')
         logger.info("BaselineStrategy initialized - NO FAULT TOLERANCE ACTIVE")
     
     @property
     def strategy_name(self) -> str:
         return "Baseline (No Fault Tolerance)"
     
-    def store(self, key: str, value: Any) -> bool:
+    def _store(self, key: str, value: Any) -> bool:
         """
         Store data in memory only.
         
@@ -63,7 +65,7 @@ class BaselineStrategy(BaseFaultToleranceStrategy):
         logger.debug(f"Baseline stored key: {key}")
         return True
     
-    def retrieve(self, key: str) -> Optional[Any]:
+    def _retrieve(self, key: str) -> Optional[Any]:
         """
         Retrieve data from memory.
         
@@ -90,35 +92,46 @@ class BaselineStrategy(BaseFaultToleranceStrategy):
         data_lost_count = len(self._data_store)
         
         # Complete data loss - this is the key characteristic of baseline
-        self._data_store.clear()
+        # (a persistent storage backend keeps its committed data)
+        self._data_store.simulate_crash()
         
         self._is_failed = True
         self._record_operation('failures_simulated')
         
         logger.info(f"Baseline failure: {data_lost_count} records permanently lost")
     
-    def recover(self) -> float:
+    def _recovery_steps(self, trace: RecoveryTrace) -> Generator[float, None, float]:
         """
         Attempt recovery from failure.
         
         In baseline mode, recovery simply clears the failed state.
         Data cannot be recovered - it's permanently lost.
+        There is no simulated latency, so nothing is yielded.
         
         Returns:
             Time taken to "recover" (just state reset, no data recovery)
         """
-        start_time = time.time()
+        yield from ()
         
-        if not self._is_failed:
+        start_time = time.perf_counter()
+        
+        with trace.phase('detect'):
+            failed = self._is_failed
+        
+        if not failed:
             logger.info("BaselineStrategy: Not in failed state, nothing to recover")
+            trace.outcome = 'not_failed'
             return 0.0
         
         # "Recovery" for baseline just means the system is back online
         # But all previous data is gone forever
         self._is_failed = False
-        self._data_store = {}  # Fresh start with empty store
+        with trace.phase('reopen_storage', backend=self._data_store.backend_name) as phase:
+            self._data_store.recover()  # Fresh start; only persistent backends have data left
+            phase.records = len(self._data_store)
+        trace.outcome = 'storage_survived' if phase.records else 'data_lost'
         
-        recovery_time = time.time() - start_time
+        recovery_time = time.perf_counter() - start_time
         self._record_operation('recoveries')
         
         logger.warning(f"Baseline recovered in {recovery_time:.4f}s - DATA NOT RESTORED (none available)")
@@ -129,6 +142,17 @@ class BaselineStrategy(BaseFaultToleranceStrategy):
         """Return the number of items currently stored."""
         return len(self._data_store)
     
+    def _release_resources(self) -> None:
+        """Close the storage backend."""
+        self._data_store.close()
+    
     def list_keys(self) -> list:
         """Return all keys in the data store."""
         return list(self._data_store.keys())
+    
+    def export_items(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (key, value) pairs from the data store."""
+        for key in self._data_store.keys():
+            entry = self._data_store.get(key)
+            if entry is not None:
+                yield key, entry['value']
@@ -0,0 +1,356 @@
+"""
+I/O Cost Models for Simulated Recovery Latency
+
+Recovery generators ask a cost model how long each simulated step
+(node discovery, checkpoint lookup/transfer, log replay, replica sync)
+should take, instead of hardcoding constants:
+
+- legacy:  the original constants (100-400ms discovery, 5ms per record
+           checkpoint transfer, 2ms per record replay/sync), kept so
+           earlier experiment series stay comparable
+- real:    no artificial delay; reported RTO is purely the time our code
+           paths take
+- modeled: delays derived from a DeviceProfile (bandwidth, IOPS and a
+           latency distribution) that is calibrated by a short
+           micro-benchmark of the local disk; network parameters come
+           from config
+
+Config options (on any strategy):
+    - cost_model: 'legacy', 'real' or 'modeled'
+      (default: FT_COST_MODEL env or 'legacy')
+    - cost_model_profile: DeviceProfile field overrides for 'modeled'
+      (disk fields given here skip the benchmark)
+
+Research Context:
+- Makes recovery time reflect measured device performance rather than
+  arbitrary sleeps, and lets the simulated share be switched off entirely
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, Mapping, Optional
+import json
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+COST_MODELS = ('legacy', 'real', 'modeled')
+
+# z-score of the 99th percentile of a standard normal distribution
+_Z99 = 2.3263
+
+
+@dataclass(frozen=True)
+class DeviceProfile:
+    """Performance parameters of the storage device and network."""
+    disk_read_bandwidth: float = 500e6  # bytes/s, sequential
+    disk_write_bandwidth: float = 300e6  # bytes/s, sequential (fsynced)
+    disk_latency_p50: float = 0.0001  # seconds per random 4 KiB read
+    disk_latency_p99: float = 0.001
+    disk_iops: float = 10000.0  # random 4 KiB reads per second
+    fsync_latency: float = 0.002  # seconds per small write + fsync
+    record_apply_seconds: float = 1e-6  # CPU time to apply one record
+    network_bandwidth: float = 125e6  # bytes/s (1 Gbit/s)
+    network_rtt_p50: float = 0.0005  # seconds
+    network_rtt_p99: float = 0.002
+    source: str = 'defaults'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# Fields measured by calibrate_device()
+CALIBRATED_FIELDS = (
+    'disk_read_bandwidth', 'disk_write_bandwidth', 'disk_latency_p50',
+    'disk_latency_p99', 'disk_iops', 'fsync_latency', 'record_apply_seconds'
+)
+
+
+def _drop_page_cache(fd: int) -> None:
+    """Ask the OS to evict the file from the page cache (best effort)."""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def calibrate_device(
+    directory: str,
+    file_size: int = 8 * 1024 * 1024,
+    block_size: int = 4096,
+    random_reads: int = 256,
+    fsyncs: int = 16
+) -> DeviceProfile:
+    """
+    Micro-benchmark the disk holding directory.
+
+    Measures fsynced sequential write bandwidth, sequential read
+    bandwidth and random block read latency (with the page cache dropped
+    where the OS allows), small-write fsync latency, and the CPU cost of
+    decoding and applying a record. Takes well under a second on an SSD.
+    """
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix='.ft_calibration_', dir=directory)
+    try:
+        chunk = os.urandom(1024 * 1024)
+        chunks = max(1, file_size // len(chunk))
+        file_size = chunks * len(chunk)
+
+        started = time.perf_counter()
+        for _ in range(chunks):
+            os.write(fd, chunk)
+        os.fsync(fd)
+        write_bandwidth = file_size / (time.perf_counter() - started)
+
+        _drop_page_cache(fd)
+        started = time.perf_counter()
+        offset = 0
+        while offset < file_size:
+            offset += len(os.pread(fd, len(chunk), offset))
+        read_bandwidth = file_size / (time.perf_counter() - started)
+
+        _drop_page_cache(fd)
+        rng = random.Random(0)
+        blocks = file_size // block_size
+        latencies = []
+        for _ in range(random_reads):
+            block_offset = rng.randrange(blocks) * block_size
+            started = time.perf_counter()
+            os.pread(fd, block_size, block_offset)
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+
+        fsync_latencies = []
+        for i in range(fsyncs):
+            started = time.perf_counter()
+            os.pwrite(fd, chunk[:block_size], i * block_size)
+            os.fsync(fd)
+            fsync_latencies.append(time.perf_counter() - started)
+        fsync_latencies.sort()
+    finally:
+        os.close(fd)
+        os.unlink(path)
+
+    # CPU cost of decoding and applying one record (the restore code path)
+    encoded = [json.dumps({'value': {'id': i, 'title': f'Issue {i}'}, 'timestamp': 0.0}) for i in range(5000)]
+    started = time.perf_counter()
+    applied = {}
+    for i, raw in enumerate(encoded):
+        applied[i] = json.loads(raw)
+    record_apply_seconds = (time.perf_counter() - started) / len(encoded)
+
+    mean_latency = sum(latencies) / len(latencies)
+    return DeviceProfile(
+        disk_read_bandwidth=read_bandwidth,
+        disk_write_bandwidth=write_bandwidth,
+        disk_latency_p50=latencies[len(latencies) // 2],
+        disk_latency_p99=latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        disk_iops=1.0 / mean_latency if mean_latency > 0 else float('inf'),
+        fsync_latency=fsync_latencies[len(fsync_latencies) // 2],
+        record_apply_seconds=record_apply_seconds,
+        source=f'benchmark:{directory}'
+    )
+
+
+_calibration_lock = threading.Lock()
+_calibrated_profiles: Dict[int, DeviceProfile] = {}
+
+
+def get_device_profile(
+    directory: Optional[str] = None,
+    overrides: Optional[Mapping[str, Any]] = None
+) -> DeviceProfile:
+    """
+    Return the calibrated profile of the device holding directory.
+
+    The benchmark runs once per device per process. Overrides replace
+    individual fields; if they cover every calibrated field, no
+    benchmark is run at all.
+    """
+    overrides = dict(overrides or {})
+    unknown = set(overrides) - {f.name for f in fields(DeviceProfile)}
+    if unknown:
+        raise ValueError(f"Unknown cost_model_profile fields: {sorted(unknown)}")
+
+    if all(name in overrides for name in CALIBRATED_FIELDS):
+        return DeviceProfile(**{'source': 'config', **overrides})
+
+    directory = directory or tempfile.gettempdir()
+    os.makedirs(directory, exist_ok=True)
+    device = os.stat(directory).st_dev
+    with _calibration_lock:
+        profile = _calibrated_profiles.get(device)
+        if profile is None:
+            profile = calibrate_device(directory)
+            _calibrated_profiles[device] = profile
+            logger.info(
+                f"📏 Calibrated disk at {directory}: "
+                f"read={profile.disk_read_bandwidth / 1e6:.0f}MB/s, "
+                f"write={profile.disk_write_bandwidth / 1e6:.0f}MB/s, "
+                f"p50={profile.disk_latency_p50 * 1e3:.3f}ms, "
+                f"p99={profile.disk_latency_p99 * 1e3:.3f}ms"
+            )
+    return replace(profile, **overrides) if overrides else profile
+
+
+def estimate_encoded_size(data: Mapping[str, Any], sample_size: int = 100) -> int:
+    """Estimate the JSON-encoded size of a mapping from a sample of its entries."""
+    if not data:
+        return 2
+    sample = []
+    for i, item in enumerate(data.items()):
+        if i >= sample_size:
+            break
+        sample.append(len(json.dumps(item, default=str)))
+    return int(sum(sample) / len(sample) * len(data))
+
+
+class CostModel(ABC):
+    """Latency (seconds) of each simulated recovery step."""
+
+    name = 'abstract'
+    # True if the model uses byte counts (callers may skip estimating them)
+    uses_bytes = False
+    # True if storage_read/log_replay model the whole step, including any
+    # real I/O the caller already timed (callers only simulate the rest)
+    covers_measured_io = False
+
+    @abstractmethod
+    def node_discovery(self) -> float:
+        """Detecting failed nodes (one failure-detector round)."""
+
+    @abstractmethod
+    def storage_lookup(self) -> float:
+        """Locating a checkpoint on storage (one metadata/random read)."""
+
+    @abstractmethod
+    def storage_read(self, nbytes: int, records: int) -> float:
+        """Reading a checkpoint of nbytes/records from the storage device."""
+
+    @abstractmethod
+    def log_replay(self, records: int) -> float:
+        """Replaying records from the write-ahead log."""
+
+    @abstractmethod
+    def network_transfer(self, nbytes: int, records: int) -> float:
+        """Copying nbytes/records to another node."""
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        # Experiment-scoped stream (see FaultInjector) for reproducible draws
+        self.rng = rng or random.Random()
+
+    def describe(self) -> Dict[str, Any]:
+        return {'name': self.name}
+
+
+class LegacyCostModel(CostModel):
+    """The original hardcoded simulation constants."""
+
+    name = 'legacy'
+
+    def node_discovery(self) -> float:
+        return self.rng.uniform(0.1, 0.4)  # 100-400ms network latency
+
+    def storage_lookup(self) -> float:
+        return self.rng.uniform(0.1, 0.3)  # 100-300ms to find the file
+
+    def storage_read(self, nbytes: int, records: int) -> float:
+        # 1 KB per record at 5ms per KB, plus 200-500ms base latency
+        return records * 1.0 * 0.005 + self.rng.uniform(0.2, 0.5)
+
+    def log_replay(self, records: int) -> float:
+        return records * 0.002
+
+    def network_transfer(self, nbytes: int, records: int) -> float:
+        return 0.2 + records * 0.002  # 200ms base + 2ms per item
+
+
+class RealCostModel(CostModel):
+    """No artificial delay: only the real work is timed."""
+
+    name = 'real'
+
+    def node_discovery(self) -> float:
+        return 0.0
+
+    def storage_lookup(self) -> float:
+        return 0.0
+
+    def storage_read(self, nbytes: int, records: int) -> float:
+        return 0.0
+
+    def log_replay(self, records: int) -> float:
+        return 0.0
+
+    def network_transfer(self, nbytes: int, records: int) -> float:
+        return 0.0
+
+
+class ModeledCostModel(CostModel):
+    """Delays derived from a (calibrated) DeviceProfile."""
+
+    name = 'modeled'
+    uses_bytes = True
+    covers_measured_io = True
+
+    def __init__(self, profile: DeviceProfile, rng: Optional[random.Random] = None):
+        super().__init__(rng)
+        self.profile = profile
+
+    def _sample(self, p50: float, p99: float) -> float:
+        """Draw from a log-normal distribution matching the given p50/p99."""
+        if p50 <= 0:
+            return 0.0
+        sigma = max(math.log(max(p99, p50) / p50) / _Z99, 0.0)
+        return self.rng.lognormvariate(math.log(p50), sigma)
+
+    def node_discovery(self) -> float:
+        return self._sample(self.profile.network_rtt_p50, self.profile.network_rtt_p99)
+
+    def storage_lookup(self) -> float:
+        return self._sample(self.profile.disk_latency_p50, self.profile.disk_latency_p99)
+
+    def storage_read(self, nbytes: int, records: int) -> float:
+        return self.storage_lookup() + nbytes / self.profile.disk_read_bandwidth
+
+    def log_replay(self, records: int) -> float:
+        return records * self.profile.record_apply_seconds
+
+    def network_transfer(self, nbytes: int, records: int) -> float:
+        return (
+            self._sample(self.profile.network_rtt_p50, self.profile.network_rtt_p99)
+            + nbytes / self.profile.network_bandwidth
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        return {'name': self.name, 'profile': self.profile.to_dict()}
+
+
+def create_cost_model(
+    config: Mapping[str, Any],
+    directory: Optional[str] = None,
+    rng: Optional[random.Random] = None
+) -> CostModel:
+    """
+    Create the cost model selected by config.
+
+    Args:
+        config: Strategy config (cost_model, cost_model_profile)
+        directory: Directory on the device to calibrate for 'modeled'
+        rng: Random stream for latency draws
+    """
+    name = config.get('cost_model') or os.getenv('FT_COST_MODEL', 'legacy')
+    if name == 'legacy':
+        return LegacyCostModel(rng)
+    if name == 'real':
+        return RealCostModel(rng)
+    if name == 'modeled':
+        return ModeledCostModel(get_device_profile(directory, config.get('cost_model_profile')), rng)
+    raise ValueError(f"Unknown cost model: {name}. Valid options: {list(COST_MODELS)}")
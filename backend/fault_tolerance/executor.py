@@ -0,0 +1,185 @@
+"""
+Parallel Experiment Executor
+
+Runs fault tolerance experiments in separate worker processes:
+
+- Every experiment gets its own process, FaultToleranceManager, strategy
+  instance and private checkpoint/storage directories, so runs never
+  share state (unlike the global get_manager() singleton)
+- A configuration matrix is fanned out across all CPU cores, with no
+  cooldown needed between runs since nothing is shared
+
+Usage:
+    from fault_tolerance.executor import ParallelExperimentExecutor
+
+    with ParallelExperimentExecutor() as executor:
+        runs = executor.run_matrix(
+            [{'strategy': 'checkpointing', 'checkpoint_interval': 15}],
+            runs_per_config=20,
+            data_items=100
+        )
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+import multiprocessing
+import os
+import time
+import logging
+
+from .manager import FaultToleranceManager, ProgressCallback
+
+logger = logging.getLogger(__name__)
+
+# Options of run_workload_experiment accepted in experiment parameters
+WORKLOAD_KEYS = (
+    'clients', 'failure_at', 'downtime', 'post_recovery', 'failure_kwargs', 'target_throughput',
+    'fault_schedule'
+)
+
+# Request keys that describe the experiment rather than the strategy config
+EXPERIMENT_KEYS = (
+    'strategy', 'data_items', 'trigger_checkpoint', 'seed', 'name', 'workload'
+) + WORKLOAD_KEYS
+
+
+def experiment_config(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the strategy config from experiment parameters."""
+    return {
+        key: value for key, value in params.items()
+        if key not in EXPERIMENT_KEYS and value is not None
+    }
+
+
+def execute_experiment(
+    manager: FaultToleranceManager,
+    params: Dict[str, Any],
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Run the experiment described by params on manager.
+    
+    With a 'workload' key this is run_workload_experiment (data_items is
+    the record count), otherwise the classic run_experiment.
+    """
+    if params.get('workload'):
+        options = {key: params[key] for key in WORKLOAD_KEYS if params.get(key) is not None}
+        return manager.run_workload_experiment(
+            workload=params['workload'],
+            record_count=params.get('data_items', 1000),
+            progress=progress,
+            seed=params.get('seed'),
+            **options
+        )
+    return manager.run_experiment(
+        data_items=params.get('data_items', 100),
+        trigger_checkpoint=bool(params.get('trigger_checkpoint', False)),
+        progress=progress,
+        seed=params.get('seed')
+    )
+
+
+def run_isolated_experiment(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one experiment on a private manager and shut it down afterwards.
+
+    Defined at module level so it can be sent to worker processes.
+
+    Args:
+        params: strategy, data_items, trigger_checkpoint (or workload and
+            its options) and strategy config keys
+
+    Returns:
+        The experiment results, plus the worker pid and wall-clock duration
+    """
+    start_time = time.time()
+
+    with FaultToleranceManager(params['strategy'], experiment_config(params)) as manager:
+        results = execute_experiment(manager, params)
+
+    results['worker_pid'] = os.getpid()
+    results['experiment_duration_seconds'] = time.time() - start_time
+    return results
+
+
+class ParallelExperimentExecutor:
+    """
+    Process-pool executor for isolated experiment runs.
+
+    Workers are started with the 'spawn' method so they never inherit
+    the parent's checkpoint threads or open storage handles.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Worker processes (default: number of CPU cores)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        logger.info(f"ParallelExperimentExecutor started with {self.max_workers} worker processes")
+
+    def submit(self, params: Dict[str, Any]) -> Future:
+        """Queue one experiment; the future resolves to its results."""
+        if params.get('strategy') not in FaultToleranceManager.STRATEGY_MAP:
+            raise ValueError(
+                f"Unknown strategy: {params.get('strategy')}. "
+                f"Valid options: {list(FaultToleranceManager.STRATEGY_MAP.keys())}"
+            )
+        return self._pool.submit(run_isolated_experiment, dict(params))
+
+    def run_matrix(
+        self,
+        configs: List[Dict[str, Any]],
+        runs_per_config: int = 1,
+        data_items: int = 100,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run every configuration runs_per_config times across the pool.
+
+        Args:
+            configs: Experiment parameter dicts (data_items may be overridden per config)
+            runs_per_config: Repetitions of each configuration
+            data_items: Default number of test items per run
+            on_result: Called with each run record as it completes
+
+        Returns:
+            Run records in completion order: {'config', 'run_id', 'result'}
+            on success or {'config', 'run_id', 'error'} on failure
+        """
+        futures = {}
+        for config in configs:
+            params = {'data_items': data_items, **config}
+            for run_id in range(1, runs_per_config + 1):
+                futures[self.submit(params)] = (config, run_id)
+
+        logger.info(f"Running {len(futures)} experiments on {self.max_workers} workers")
+
+        records = []
+        for future in as_completed(futures):
+            config, run_id = futures[future]
+            record: Dict[str, Any] = {'config': config, 'run_id': run_id}
+            try:
+                record['result'] = future.result()
+            except Exception as e:
+                logger.error(f"Experiment {config.get('strategy')} run {run_id} failed: {e}")
+                record['error'] = str(e)
+            records.append(record)
+            if on_result:
+                on_result(record)
+
+        return records
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes."""
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self) -> 'ParallelExperimentExecutor':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
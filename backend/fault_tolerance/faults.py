@@ -0,0 +1,350 @@
+"""
+Seeded Fault Injection
+
+Every random decision a strategy makes during an experiment - checkpoint
+corruption, cascading failures, which replicas fail, which replica
+serves a read, simulated latencies - is drawn from one experiment-scoped
+FaultInjector instead of the module-level random generator:
+
+- One seed reproduces the whole run (recorded in experiment results)
+- Each kind of decision has its own named stream, so e.g. the number of
+  reads served does not shift which checkpoint gets corrupted
+- Injected faults are counted, so results say which faults actually fired
+
+Beyond single failures, a FaultSchedule (parsed from a small DSL, e.g.
+"at 2s kill node-2; at 3.5s latency node-3 200ms; at 8s heal all") is
+executed by a FaultScheduler thread while a workload runs.
+
+Config options (on any strategy):
+    - fault_seed: Seed for the strategy's injector (default: random)
+    - checkpoint_corruption_rate: Chance a checkpoint is unreadable on
+      recovery (default: 0.02)
+    - cascading_failure_rate: Chance the sync source crashes while
+      resyncing two or more nodes (default: 0.05)
+
+Research Context:
+- Identical configs with identical seeds produce identical fault
+  outcomes, so run-to-run variance reflects the strategy rather than
+  the dice, and fewer runs reach statistical significance
+- Multi-fault schedules model cascading failures and sustained
+  degradation, not just one instantaneous crash
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, TypeVar, Union
+import os
+import random
+import re
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class FaultInjector:
+    """
+    Experiment-scoped source of randomness for fault injection.
+
+    Args:
+        seed: Seed for every stream (random if omitted; see .seed)
+        checkpoint_corruption_rate: Probability a checkpoint is corrupted
+        cascading_failure_rate: Probability of a cascading failure during sync
+    """
+
+    DEFAULT_CHECKPOINT_CORRUPTION_RATE = 0.02
+    DEFAULT_CASCADING_FAILURE_RATE = 0.05
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        checkpoint_corruption_rate: float = DEFAULT_CHECKPOINT_CORRUPTION_RATE,
+        cascading_failure_rate: float = DEFAULT_CASCADING_FAILURE_RATE
+    ):
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.checkpoint_corruption_rate = checkpoint_corruption_rate
+        self.cascading_failure_rate = cascading_failure_rate
+        self._lock = threading.Lock()
+        self._streams: Dict[str, random.Random] = {}
+        self.injected: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], seed: Optional[int] = None) -> 'FaultInjector':
+        """Create an injector from strategy config (seed overrides fault_seed)."""
+        return cls(
+            seed=seed if seed is not None else config.get('fault_seed'),
+            checkpoint_corruption_rate=config.get(
+                'checkpoint_corruption_rate', cls.DEFAULT_CHECKPOINT_CORRUPTION_RATE
+            ),
+            cascading_failure_rate=config.get(
+                'cascading_failure_rate', cls.DEFAULT_CASCADING_FAILURE_RATE
+            )
+        )
+
+    def stream(self, name: str) -> random.Random:
+        """Return the independent random stream for one kind of decision."""
+        rng = self._streams.get(name)
+        if rng is None:
+            with self._lock:
+                # String seeds are hashed deterministically (not by PYTHONHASHSEED)
+                rng = self._streams.setdefault(name, random.Random(f'{self.seed}:{name}'))
+        return rng
+
+    def _roll(self, fault: str, rate: float) -> bool:
+        if rate <= 0 or self.stream(fault).random() >= rate:
+            return False
+        with self._lock:
+            self.injected[fault] = self.injected.get(fault, 0) + 1
+        return True
+
+    def corrupt_checkpoint(self) -> bool:
+        """Decide whether the checkpoint being recovered is corrupted."""
+        return self._roll('checkpoint_corruption', self.checkpoint_corruption_rate)
+
+    def cascade_failure(self) -> bool:
+        """Decide whether the sync source crashes under recovery load."""
+        return self._roll('cascading_failure', self.cascading_failure_rate)
+
+    def choose_nodes(self, nodes: Sequence[T], count: int) -> List[T]:
+        """Pick which nodes fail."""
+        return self.stream('node_failure').sample(list(nodes), count)
+
+    def choose_replica(self, replicas: Sequence[T]) -> T:
+        """Pick the replica that serves a read (load balancing, not a fault)."""
+        return self.stream('replica_choice').choice(replicas)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'seed': self.seed,
+            'checkpoint_corruption_rate': self.checkpoint_corruption_rate,
+            'cascading_failure_rate': self.cascading_failure_rate,
+            'injected': dict(self.injected)
+        }
+
+
+def corrupt_file(path: str) -> None:
+    """Truncate a file to half its size and overwrite its head, making it undecodable."""
+    size = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        f.truncate(size // 2)
+        f.seek(0)
+        f.write(b'\0' * min(16, size // 2))
+
+
+# Fault schedules: timed events executed while a workload runs
+
+FAULT_ACTIONS = ('kill', 'latency', 'corrupt_checkpoint', 'recover', 'heal')
+
+_DURATION = re.compile(r'^(\d+(?:\.\d+)?)(ms|s)$')
+
+
+def _parse_duration(token: str) -> Optional[float]:
+    """'200ms' -> 0.2, '3.5s' -> 3.5; None if token is not a duration."""
+    match = _DURATION.match(token)
+    if not match:
+        return None
+    value = float(match.group(1))
+    return value / 1000 if match.group(2) == 'ms' else value
+
+
+def _parse_value(text: str) -> Any:
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+@dataclass(frozen=True)
+class FaultEvent:
+    """
+    One scheduled fault.
+
+    Actions:
+        - kill: fail target node, or simulate_failure(**params) without a target
+        - latency: add params['delay'] seconds to every operation on target
+          (or on the whole strategy); a delay of 0 removes it
+        - corrupt_checkpoint: make the latest checkpoint file undecodable
+        - recover: run the strategy's recovery
+        - heal: remove injected latency, then recover
+    """
+    at: float  # seconds after the workload started
+    action: str
+    target: Optional[str] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def describe(self) -> str:
+        parts = [f'{self.at:g}s', self.action]
+        if self.target:
+            parts.append(self.target)
+        parts.extend(f'{key}={value}' for key, value in self.params.items())
+        return ' '.join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'at': self.at, 'action': self.action, 'target': self.target, 'params': dict(self.params)}
+
+
+class FaultSchedule:
+    """
+    Ordered list of FaultEvents.
+
+    Built from a list of event dicts ({'at': 2, 'action': 'kill',
+    'target': 'node-2'}) or from a compact DSL with one event per line
+    or ';'-separated:
+
+        at 2s kill node-2
+        at 3.5s latency node-3 200ms
+        at 5s corrupt_checkpoint
+        at 6s kill failure_type=total
+        at 8s heal all
+
+    Times take 's' or 'ms' suffixes; key=value tokens become action
+    parameters; the target 'all' means the whole strategy.
+    """
+
+    def __init__(self, events: Iterable[FaultEvent]):
+        self.events: List[FaultEvent] = sorted(events, key=lambda event: event.at)
+
+    @classmethod
+    def parse(cls, spec: Union[str, Iterable[Mapping[str, Any]], 'FaultSchedule']) -> 'FaultSchedule':
+        """Build a schedule from DSL text, a list of event dicts or a schedule."""
+        if isinstance(spec, FaultSchedule):
+            return spec
+        if isinstance(spec, str):
+            lines = [line.strip() for line in re.split(r'[;\n]', spec)]
+            events = [cls._parse_line(line) for line in lines if line and not line.startswith('#')]
+        else:
+            events = [cls._from_dict(item) for item in spec]
+        if not events:
+            raise ValueError("Fault schedule has no events")
+        return cls(events)
+
+    @staticmethod
+    def _parse_line(line: str) -> FaultEvent:
+        tokens = line.split()
+        if tokens[0] == 'at':
+            tokens = tokens[1:]
+        if len(tokens) < 2:
+            raise ValueError(f"Fault event needs a time and an action: '{line}'")
+
+        at = _parse_duration(tokens[0].removeprefix('t='))
+        if at is None:
+            raise ValueError(f"Invalid fault time '{tokens[0]}' (use e.g. 2s or 3500ms): '{line}'")
+
+        action, target, params = tokens[1], None, {}
+        for token in tokens[2:]:
+            if '=' in token:
+                key, value = token.split('=', 1)
+                params[key] = _parse_value(value)
+            elif _parse_duration(token) is not None:
+                params['delay'] = _parse_duration(token)
+            elif target is None:
+                target = token
+            else:
+                raise ValueError(f"Unexpected token '{token}' in fault event: '{line}'")
+        return FaultSchedule._validate(at, action, target, params)
+
+    @staticmethod
+    def _from_dict(item: Mapping[str, Any]) -> FaultEvent:
+        item = dict(item)
+        try:
+            at = float(item.pop('at'))
+            action = item.pop('action')
+        except KeyError as e:
+            raise ValueError(f"Fault event is missing {e}: {item}")
+        target = item.pop('target', None)
+        params = {**item.pop('params', {}), **item}
+        if isinstance(params.get('delay'), str):
+            params['delay'] = _parse_duration(params['delay'])
+        return FaultSchedule._validate(at, action, target, params)
+
+    @staticmethod
+    def _validate(at: float, action: str, target: Optional[str], params: Dict[str, Any]) -> FaultEvent:
+        if action not in FAULT_ACTIONS:
+            raise ValueError(f"Unknown fault action: {action}. Valid options: {list(FAULT_ACTIONS)}")
+        if at < 0:
+            raise ValueError(f"Fault time must not be negative: {at}")
+        if action == 'latency' and not isinstance(params.get('delay'), (int, float)):
+            raise ValueError("latency events need a delay (e.g. 200ms)")
+        if target == 'all':
+            target = None
+        return FaultEvent(at=at, action=action, target=target, params=params)
+
+    @property
+    def duration(self) -> float:
+        """Time of the last event."""
+        return self.events[-1].at
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [event.to_dict() for event in self.events]
+
+
+class FaultScheduler:
+    """
+    Executes a FaultSchedule against a strategy on a background thread.
+
+    Event times are relative to origin (a time.perf_counter() value,
+    default: when start() is called). Each executed event is logged with
+    its actual start/finish offsets, outcome and, for recover/heal, the
+    recovery time.
+    """
+
+    def __init__(self, strategy: Any, schedule: FaultSchedule, origin: Optional[float] = None):
+        self.strategy = strategy
+        self.schedule = schedule
+        self.origin = origin
+        self.executed: List[Dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.origin is None:
+            self.origin = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='fault-scheduler', daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stop(self) -> None:
+        """Skip any events not executed yet."""
+        self._stop.set()
+        self.join()
+
+    def _run(self) -> None:
+        for event in self.schedule.events:
+            delay = self.origin + event.at - time.perf_counter()
+            if delay > 0 and self._stop.wait(delay):
+                return
+            if self._stop.is_set():
+                return
+            self.executed.append(self.execute(event))
+
+    def execute(self, event: FaultEvent) -> Dict[str, Any]:
+        """Apply one event now and return its log record."""
+        logger.info(f"⏱️ Fault schedule: {event.describe()}")
+        record = {**event.to_dict(), 'started_at': time.perf_counter() - self.origin, 'ok': True}
+        try:
+            if event.action == 'kill':
+                if event.target:
+                    self.strategy.fail_node(event.target)
+                else:
+                    self.strategy.simulate_failure(**event.params)
+            elif event.action == 'latency':
+                self.strategy.inject_latency(event.params['delay'], event.target)
+            elif event.action == 'corrupt_checkpoint':
+                record['file'] = self.strategy.corrupt_checkpoint()
+            elif event.action == 'recover':
+                record['recovery_time'] = self.strategy.recover()
+            else:  # heal
+                record['recovery_time'] = self.strategy.heal()
+        except Exception as e:
+            logger.error(f"Fault event '{event.describe()}' failed: {e}")
+            record['ok'] = False
+            record['error'] = str(e)
+        record['finished_at'] = time.perf_counter() - self.origin
+        return record
@@ -15,7 +15,7 @@ Research Context:
 - Use Case: Production-grade fault tolerance
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
 import time
 import os
 import json
@@ -23,8 +23,11 @@ import threading
 import logging
 
 from .base import BaseFaultToleranceStrategy
+from .faults import FaultInjector
+from .recovery import RecoveryTrace
 from .checkpointing import CheckpointingStrategy
 from .replication import ReplicationStrategy
+from .storage import DATA_ROOT, DEFAULT_STORAGE_DIR
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +45,7 @@ class HybridStrategy(BaseFaultToleranceStrategy):
     
     DEFAULT_CHECKPOINT_INTERVAL = 30  # seconds
     DEFAULT_REPLICATION_FACTOR = 3
-    DEFAULT_CHECKPOINT_DIR = "/tmp/gitforge_hybrid_checkpoints"
+    DEFAULT_CHECKPOINT_DIR = os.path.join(DATA_ROOT, 'gitforge_hybrid_checkpoints')
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
@@ -52,6 +55,8 @@ class HybridStrategy(BaseFaultToleranceStrategy):
             - checkpoint_interval: Seconds between checkpoints (default: 30)
             - replication_factor: Number of replicas (default: 3)
             - checkpoint_dir: Directory for checkpoint files
+              (default: a private directory per instance, removed on close)
+            - storage_backend: 'memory' (default), 'sqlite' or 'mmap' per replica
         """
         super().__init__(config)
         
@@ -63,15 +68,25 @@ class HybridStrategy(BaseFaultToleranceStrategy):
             'replication_factor',
             self.DEFAULT_REPLICATION_FACTOR
         )
-        self.checkpoint_dir = self.config.get(
-            'checkpoint_dir',
-            self.DEFAULT_CHECKPOINT_DIR
+        self.checkpoint_dir = (
+            self.config.get('checkpoint_dir')
+            or self._make_private_dir(self.DEFAULT_CHECKPOINT_DIR)
         )
         
         # Initialize the replication component
+        storage_config = {
+            k: v for k, v in self.config.items()
+            if k.startswith('storage_') or k.startswith('cost_model')
+        }
+        storage_config['storage_dir'] = os.path.join(
+            self.config.get('storage_dir', DEFAULT_STORAGE_DIR), 'hybrid'
+        )
         self._replication = ReplicationStrategy({
+            **storage_config,
             'replication_factor': self.replication_factor
         })
+        self._replication.latency.strategy_label = 'hybrid_replication'
+        self._replication.set_fault_injector(self.faults)
         
         # Checkpointing state
         self._last_checkpoint_time: Optional[float] = None
@@ -98,7 +113,7 @@ class HybridStrategy(BaseFaultToleranceStrategy):
     def strategy_name(self) -> str:
         return f"Hybrid (Replication: {self.replication_factor}, Checkpoint: {self.checkpoint_interval}s)"
     
-    def store(self, key: str, value: Any) -> bool:
+    def _store(self, key: str, value: Any) -> bool:
         """
         Store data using replication (immediate) with checkpoint backup.
         
@@ -119,7 +134,7 @@ class HybridStrategy(BaseFaultToleranceStrategy):
         
         return success
     
-    def retrieve(self, key: str) -> Optional[Any]:
+    def _retrieve(self, key: str) -> Optional[Any]:
         """
         Retrieve data from healthy replicas.
         
@@ -166,7 +181,7 @@ class HybridStrategy(BaseFaultToleranceStrategy):
         
         self._record_operation('failures_simulated')
     
-    def recover(self) -> float:
+    def _recovery_steps(self, trace: RecoveryTrace) -> Generator[float, None, float]:
         """
         Recover from failure using the best available method.
         
@@ -174,30 +189,37 @@ class HybridStrategy(BaseFaultToleranceStrategy):
         1. If replicas have data: just recover failed nodes from healthy ones
         2. If all replicas empty: restore from checkpoint first, then sync
         
+        Phases are those of the replication layer, preceded on the slow
+        path by locate_checkpoint, read, decode and restore.
+        
+        Yields:
+            Simulated latencies of the replication layer's recovery
+        
         Returns:
             Time taken to fully recover
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # First, try to recover through replication (fast path)
         if self._replication._get_healthy_replicas():
             # Some replicas still have data - use replication recovery
-            replication_recovery_time = self._replication.recover()
+            replication_recovery_time = yield from self._replication._recovery_steps(trace)
             logger.info(f"Hybrid: Recovered via replication in {replication_recovery_time:.4f}s")
         else:
             # All replicas empty - need checkpoint recovery (slow path)
             logger.info("Hybrid: All replicas empty, recovering from checkpoint...")
-            checkpoint_loaded = self._load_from_checkpoint()
+            checkpoint_loaded = self._load_from_checkpoint(trace)
             
             if checkpoint_loaded:
                 # Recover replication layer and sync data from checkpoint
-                self._replication.recover()
+                yield from self._replication._recovery_steps(trace)
+                trace.outcome = 'checkpoint_restored'
                 
                 # Re-populate replicas from checkpoint data
                 logger.info("Hybrid: Syncing checkpoint data to recovered replicas")
             else:
                 logger.warning("Hybrid: No checkpoint available, starting fresh")
-                self._replication.recover()
+                yield from self._replication._recovery_steps(trace)
         
         # Clear failed state
         self._is_failed = False
@@ -206,7 +228,7 @@ class HybridStrategy(BaseFaultToleranceStrategy):
         self._stop_checkpointing.clear()
         self._start_checkpointing()
         
-        recovery_time = time.time() - start_time
+        recovery_time = time.perf_counter() - start_time
         self._record_operation('recoveries')
         
         logger.info(f"✅ Hybrid recovery completed in {recovery_time:.4f}s")
@@ -230,10 +252,11 @@ class HybridStrategy(BaseFaultToleranceStrategy):
             
             source_replica = healthy_replicas[0]
             
+            started = time.perf_counter_ns()
             checkpoint_data = {
                 'timestamp': time.time(),
                 'checkpoint_id': self._checkpoint_count + 1,
-                'data': source_replica.data.copy(),
+                'data': source_replica.data.snapshot(),
                 'replication_factor': self.replication_factor,
                 'cluster_status': self._replication.get_cluster_status()
             }
@@ -251,6 +274,7 @@ class HybridStrategy(BaseFaultToleranceStrategy):
             # Cleanup old checkpoints
             self._cleanup_old_checkpoints()
             
+            self._record_latency('checkpoint', time.perf_counter_ns() - started)
             logger.info(
                 f"📸 Hybrid checkpoint created: {filename} "
                 f"({len(source_replica.data)} records from {source_replica.node_id})"
@@ -261,35 +285,51 @@ class HybridStrategy(BaseFaultToleranceStrategy):
             logger.error(f"Failed to create hybrid checkpoint: {e}")
             return False
     
-    def _load_from_checkpoint(self) -> bool:
+    def _latest_checkpoint_path(self) -> Optional[str]:
+        """Return the path of the most recent hybrid checkpoint file, or None."""
+        checkpoint_files = [
+            f for f in os.listdir(self.checkpoint_dir)
+            if f.startswith('hybrid_checkpoint_') and f.endswith('.json')
+        ]
+        if not checkpoint_files:
+            return None
+        
+        # Get latest checkpoint
+        checkpoint_files.sort(
+            key=lambda f: os.path.getmtime(os.path.join(self.checkpoint_dir, f)),
+            reverse=True
+        )
+        return os.path.join(self.checkpoint_dir, checkpoint_files[0])
+    
+    def _load_from_checkpoint(self, trace: Optional[RecoveryTrace] = None) -> bool:
         """Load state from the latest checkpoint file."""
+        trace = trace or RecoveryTrace(self.__class__.__name__)
         try:
-            checkpoint_files = [
-                f for f in os.listdir(self.checkpoint_dir)
-                if f.startswith('hybrid_checkpoint_') and f.endswith('.json')
-            ]
+            with trace.phase('locate_checkpoint') as phase:
+                filepath = self._latest_checkpoint_path()
+                latest_file = os.path.basename(filepath) if filepath else None
+                phase.details['file'] = latest_file
             
-            if not checkpoint_files:
+            if latest_file is None:
                 logger.info("No hybrid checkpoint files found")
                 return False
             
-            # Get latest checkpoint
-            checkpoint_files.sort(
-                key=lambda f: os.path.getmtime(os.path.join(self.checkpoint_dir, f)),
-                reverse=True
-            )
-            
-            latest_file = checkpoint_files[0]
-            filepath = os.path.join(self.checkpoint_dir, latest_file)
+            with trace.phase('read', file=latest_file) as phase:
+                with open(filepath, 'rb') as f:
+                    raw = f.read()
+                phase.bytes = len(raw)
             
-            with open(filepath, 'r') as f:
-                checkpoint_data = json.load(f)
+            with trace.phase('decode') as phase:
+                checkpoint_data = json.loads(raw)
+                data = checkpoint_data.get('data', {})
+                phase.records = len(data)
             
             # Restore data to all replicas
-            data = checkpoint_data.get('data', {})
-            for replica in self._replication._replicas.values():
-                replica.data = data.copy()
-                replica.is_healthy = True
+            with trace.phase('restore', replicas=len(self._replication._replicas)) as phase:
+                for replica in self._replication._replicas.values():
+                    replica.data.load(data)
+                    replica.is_healthy = True
+                phase.records = len(data)
             
             self._checkpoint_count = checkpoint_data.get('checkpoint_id', 0)
             
@@ -318,15 +358,71 @@ class HybridStrategy(BaseFaultToleranceStrategy):
     
     def _start_checkpointing(self) -> None:
         """Start background checkpointing thread."""
+        if self._closed:
+            return
+        
         def checkpoint_loop():
             while not self._stop_checkpointing.is_set():
                 self._stop_checkpointing.wait(timeout=self.checkpoint_interval)
                 if not self._stop_checkpointing.is_set():
                     self.create_checkpoint()
         
-        self._checkpoint_thread = threading.Thread(target=checkpoint_loop, daemon=True)
+        self._checkpoint_thread = threading.Thread(
+            target=checkpoint_loop,
+            name=f"hybrid-checkpointing-{self.instance_id}",
+            daemon=True
+        )
         self._checkpoint_thread.start()
     
+    def export_items(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (key, value) pairs from the replication layer."""
+        return self._replication.export_items()
+    
+    def get_data_count(self) -> int:
+        """Return the number of items held by the replicas."""
+        return self._replication.get_data_count()
+    
+    def _release_resources(self) -> None:
+        """Stop the background checkpointing thread and close the replicas."""
+        self._stop_checkpointing.set()
+        if self._checkpoint_thread:
+            self._checkpoint_thread.join(timeout=2)
+        self._replication.close()
+    
+    def fault_targets(self) -> List[str]:
+        return self._replication.fault_targets()
+    
+    def fail_node(self, node_id: str) -> None:
+        """Fail one replica; losing the last one takes the hybrid system down."""
+        self._replication.fail_node(node_id)
+        if self._replication._is_failed:
+            self._is_failed = True
+        self._record_operation('failures_simulated')
+    
+    def inject_latency(self, delay: float, node_id: Optional[str] = None) -> None:
+        """Node latency is injected into the replication layer."""
+        if node_id is None:
+            super().inject_latency(delay)
+        else:
+            self._replication.inject_latency(delay, node_id)
+    
+    def heal(self) -> float:
+        self._replication._injected_latency.clear()
+        return super().heal()
+    
+    def set_fault_injector(self, faults: FaultInjector) -> None:
+        """Share the injector with the replication layer."""
+        super().set_fault_injector(faults)
+        self._replication.set_fault_injector(faults)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Strategy statistics, with per-replica latency from the replication layer."""
+        stats = super().get_stats()
+        replica_latency = self._replication.latency.replica_summary()
+        if replica_latency:
+            stats['replica_latency'] = replica_latency
+        return stats
+    
     def get_hybrid_status(self) -> Dict[str, Any]:
         """Get comprehensive status of the hybrid system."""
         return {
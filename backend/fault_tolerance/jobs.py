@@ -0,0 +1,260 @@
+"""
+Background Experiment Job Queue
+
+Runs fault tolerance experiments on a worker pool instead of inline in
+the HTTP request:
+
+- submit() returns a job id immediately
+- Each job runs on its own private FaultToleranceManager (never the
+  global singleton), so independent configurations run concurrently
+- Progress (phase + fraction) and results are kept on the job record,
+  which the API exposes via polling and a Server-Sent-Events stream
+- By default (FT_JOB_EXECUTOR=process) runs execute in isolated worker
+  processes (ParallelExperimentExecutor), one per CPU core, and progress
+  is reported per phase of the job only
+- FT_JOB_EXECUTOR=thread runs experiments in this process with
+  fine-grained progress, but concurrent runs would contend for the GIL
+  and inflate store/recovery times and tail latencies, so it defaults to
+  a single worker
+
+Usage:
+    from fault_tolerance import get_job_queue
+
+    queue = get_job_queue()
+    job_id = queue.submit({'strategy': 'checkpointing', 'data_items': 500})
+    queue.wait(job_id)
+    print(queue.get(job_id).result)
+"""
+
+from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import os
+import threading
+import time
+import uuid
+import logging
+
+from .manager import FaultToleranceManager
+from .executor import ParallelExperimentExecutor, execute_experiment, experiment_config
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+@dataclass
+class ExperimentJob:
+    """State of a single queued experiment run."""
+    job_id: str
+    params: Dict[str, Any]
+    status: str = JOB_QUEUED
+    phase: Optional[str] = None
+    progress: float = 0.0
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # Bumped on every change so streams can detect updates cheaply
+    version: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            'job_id': self.job_id,
+            'params': self.params,
+            'status': self.status,
+            'phase': self.phase,
+            'progress': self.progress,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error
+        }
+        if include_result:
+            data['result'] = self.result
+        return data
+
+
+class ExperimentJobQueue:
+    """
+    Thread-pool backed queue of fault tolerance experiments.
+
+    Config:
+        - max_workers: Concurrent experiments (default: FT_JOB_WORKERS env,
+          else CPU count with processes and 1 with threads)
+        - max_finished_jobs: Finished jobs retained for inspection (default: 1000)
+        - use_processes: Run experiments in worker processes
+          (default: FT_JOB_EXECUTOR env != 'thread')
+    """
+
+    DEFAULT_MAX_FINISHED_JOBS = 1000
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS,
+        use_processes: Optional[bool] = None
+    ):
+        if use_processes is None:
+            use_processes = os.getenv('FT_JOB_EXECUTOR', 'process') != 'thread'
+        self.use_processes = use_processes
+        # Threads share the GIL: more than one concurrent run skews the timings
+        default_workers = (os.cpu_count() or 4) if use_processes else 1
+        self.max_workers = max_workers or int(os.getenv('FT_JOB_WORKERS', default_workers))
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ft-job')
+        # Job threads only wait on the process pool in process mode
+        self._process_executor = (
+            ParallelExperimentExecutor(self.max_workers) if use_processes else None
+        )
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ExperimentJob] = {}
+        self._futures: Dict[str, Future] = {}
+
+        logger.info(
+            f"ExperimentJobQueue started with {self.max_workers} "
+            f"{'process' if use_processes else 'thread'} workers"
+        )
+
+    def submit(self, params: Dict[str, Any]) -> str:
+        """
+        Queue an experiment.
+
+        Args:
+            params: strategy, data_items, trigger_checkpoint (or workload
+                and its options) and any strategy config keys
+                (checkpoint_interval, ...)
+
+        Returns:
+            The new job id
+        """
+        if params.get('strategy') not in FaultToleranceManager.STRATEGY_MAP:
+            raise ValueError(
+                f"Unknown strategy: {params.get('strategy')}. "
+                f"Valid options: {list(FaultToleranceManager.STRATEGY_MAP.keys())}"
+            )
+
+        job = ExperimentJob(job_id=uuid.uuid4().hex, params=dict(params))
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._futures[job.job_id] = self._executor.submit(self._run_job, job)
+            self._prune_finished()
+
+        logger.info(f"Queued experiment job {job.job_id} ({params['strategy']})")
+        return job.job_id
+
+    def get(self, job_id: str) -> Optional[ExperimentJob]:
+        """Return a job by id, or None."""
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, status: Optional[str] = None) -> List[ExperimentJob]:
+        """Return jobs in submission order, optionally filtered by status."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job for job in jobs if status is None or job.status == status]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet. Returns True on success."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            future = self._futures.get(job_id)
+            if job is None or future is None or not future.cancel():
+                return False
+            self._update(job, status=JOB_CANCELLED, finished_at=time.time())
+        return True
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[ExperimentJob]:
+        """Block until the job finishes (or timeout) and return it."""
+        future = self._futures.get(job_id)
+        if future is not None:
+            try:
+                future.result(timeout)
+            except Exception:
+                pass
+        return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and cancel those still queued."""
+        with self._lock:
+            cancelled = [job_id for job_id, future in self._futures.items() if future.cancel()]
+            for job_id in cancelled:
+                self._update(self._jobs[job_id], status=JOB_CANCELLED, finished_at=time.time())
+        if cancelled:
+            logger.warning(f"ExperimentJobQueue shutting down: cancelled {len(cancelled)} queued jobs")
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=wait)
+
+    def _run_job(self, job: ExperimentJob) -> None:
+        """Worker: run one experiment on a private manager."""
+        params = job.params
+
+        self._update(job, status=JOB_RUNNING, started_at=time.time())
+
+        def on_progress(phase: str, fraction: float) -> None:
+            self._update(job, phase=phase, progress=fraction)
+
+        try:
+            if self._process_executor is not None:
+                on_progress('running', 0.0)
+                result = self._process_executor.submit(params).result()
+            else:
+                with FaultToleranceManager(params['strategy'], experiment_config(params)) as manager:
+                    result = execute_experiment(manager, params, on_progress)
+            self._update(
+                job,
+                status=JOB_COMPLETED,
+                phase='completed',
+                progress=1.0,
+                result=result,
+                finished_at=time.time()
+            )
+        except Exception as e:
+            logger.error(f"Experiment job {job.job_id} failed: {e}")
+            self._update(job, status=JOB_FAILED, error=str(e), finished_at=time.time())
+
+    def _update(self, job: ExperimentJob, **changes: Any) -> None:
+        for name, value in changes.items():
+            setattr(job, name, value)
+        job.version += 1
+
+    def _prune_finished(self) -> None:
+        """Drop the oldest finished jobs beyond the retention limit."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            self._jobs.pop(job_id, None)
+            self._futures.pop(job_id, None)
+
+
+# Global job queue, created lazily like the manager singleton
+_job_queue: Optional[ExperimentJobQueue] = None
+
+
+def get_job_queue() -> ExperimentJobQueue:
+    """Get or create the global ExperimentJobQueue."""
+    global _job_queue
+
+    if _job_queue is None:
+        _job_queue = ExperimentJobQueue()
+
+    return _job_queue
+
+
+def shutdown_job_queue(wait: bool = False) -> None:
+    """Shut down the global ExperimentJobQueue, if it was ever created."""
+    global _job_queue
+
+    if _job_queue is not None:
+        _job_queue.shutdown(wait=wait)
+        _job_queue = None
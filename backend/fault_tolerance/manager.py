@@ -21,23 +21,51 @@ Usage:
     manager.simulate_failure()
     recovery_time = manager.recover()
     
+    # Run a YCSB-style workload with a failure injected part-way through
+    results = manager.run_workload_experiment('ycsb-b', record_count=10000)
+    
     # Switch strategies
     manager.set_strategy('replication', {'replication_factor': 3})
+    
+    # Switch strategies and stream existing data into the new one
+    manager.set_strategy('hybrid', migrate=True)
+    
+    # Stop background threads and remove private checkpoint dirs
+    manager.close()
 """
 
-from typing import Any, Dict, Optional, Literal
+from typing import Any, Callable, Dict, List, Optional, Literal, Set, Union
+import asyncio
+import random
+import threading
+import time
 import logging
 
+import numpy as np
+
 from .base import BaseFaultToleranceStrategy
 from .baseline import BaselineStrategy
 from .checkpointing import CheckpointingStrategy
+from .faults import FaultEvent, FaultInjector, FaultSchedule, FaultScheduler
 from .replication import ReplicationStrategy
 from .hybrid import HybridStrategy
+from .workload import (
+    OPERATIONS,
+    OperationGenerator,
+    SyntheticWorkload,
+    WorkloadProfile,
+    get_workload_profile,
+    summarize_operations,
+    throughput_timeline
+)
 
 logger = logging.getLogger(__name__)
 
 StrategyType = Literal['baseline', 'checkpointing', 'replication', 'hybrid']
 
+# Experiment progress callback: (phase, fraction of that phase completed)
+ProgressCallback = Callable[[str, float], None]
+
 
 class FaultToleranceManager:
     """
@@ -57,6 +85,9 @@ class FaultToleranceManager:
         'hybrid': HybridStrategy
     }
     
+    DEFAULT_MIGRATION_BATCH_SIZE = 1000
+    WORKLOAD_ERROR_BACKOFF = 0.01  # seconds a workload client waits after a failed operation
+    
     def __init__(
         self,
         strategy: StrategyType = 'baseline',
@@ -74,6 +105,13 @@ class FaultToleranceManager:
             strategy, config
         )
         
+        # Live migration state (see set_strategy(migrate=True))
+        self._migration_lock = threading.Lock()
+        self._migration_source: Optional[BaseFaultToleranceStrategy] = None
+        self._migration_thread: Optional[threading.Thread] = None
+        self._keys_written_during_migration: Set[str] = set()
+        self._migration_progress: Dict[str, Any] = {'in_progress': False}
+        
         logger.info(f"FaultToleranceManager initialized with strategy: {strategy}")
     
     def _create_strategy(
@@ -94,18 +132,149 @@ class FaultToleranceManager:
     def set_strategy(
         self,
         strategy: StrategyType,
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        migrate: bool = False,
+        background: bool = True,
+        batch_size: int = DEFAULT_MIGRATION_BATCH_SIZE
     ) -> None:
         """
         Switch to a different fault tolerance strategy.
         
-        Note: This creates a new strategy instance. Any data in the
-        previous strategy will not be automatically migrated.
+        This creates a new strategy instance and shuts down the previous one.
+        
+        Args:
+            strategy: Name of the strategy to switch to
+            config: Strategy-specific configuration
+            migrate: If True, stream the previous strategy's data into the
+                new one in batches. While the migration runs, writes go to
+                the new strategy and reads fall back to the old one.
+            background: Run the migration on a background thread (online)
+                instead of blocking until it completes
+            batch_size: Number of items copied per migration batch
         """
         logger.info(f"Switching strategy from {self._current_strategy_name} to {strategy}")
         
-        self._current_strategy_name = strategy
-        self._current_strategy = self._create_strategy(strategy, config)
+        # Only one migration at a time - let a running one finish first
+        self.wait_for_migration()
+        
+        old_strategy = self._current_strategy
+        new_strategy = self._create_strategy(strategy, config)
+        
+        if not migrate:
+            self._current_strategy_name = strategy
+            self._current_strategy = new_strategy
+            old_strategy.close()
+            return
+        
+        with self._migration_lock:
+            self._migration_source = old_strategy
+            self._keys_written_during_migration = set()
+            self._migration_progress = {
+                'in_progress': True,
+                'source': self._current_strategy_name,
+                'target': strategy,
+                'migrated': 0,
+                'skipped': 0,
+                'started_at': time.time(),
+                'completed_at': None,
+                'error': None
+            }
+            self._current_strategy_name = strategy
+            self._current_strategy = new_strategy
+        
+        if background:
+            self._migration_thread = threading.Thread(
+                target=self._migrate_data,
+                args=(old_strategy, new_strategy, batch_size),
+                daemon=True
+            )
+            self._migration_thread.start()
+        else:
+            self._migrate_data(old_strategy, new_strategy, batch_size)
+    
+    def close(self) -> None:
+        """Finish any migration and shut down the current strategy."""
+        self.wait_for_migration()
+        self._current_strategy.close()
+        logger.info(f"FaultToleranceManager closed ({self._current_strategy_name})")
+    
+    def __enter__(self) -> 'FaultToleranceManager':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _migrate_data(
+        self,
+        source: BaseFaultToleranceStrategy,
+        target: BaseFaultToleranceStrategy,
+        batch_size: int
+    ) -> None:
+        """Copy data from source to target in batches, then close source."""
+        logger.info(f"Migrating data: {source.strategy_name} -> {target.strategy_name}")
+        progress = self._migration_progress
+        
+        try:
+            batch = []
+            for item in source.export_items():
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    self._migrate_batch(target, batch, progress)
+                    batch = []
+            if batch:
+                self._migrate_batch(target, batch, progress)
+        except Exception as e:
+            logger.error(f"Data migration failed: {e}")
+            progress['error'] = str(e)
+        finally:
+            with self._migration_lock:
+                self._migration_source = None
+                self._keys_written_during_migration = set()
+            source.close()
+            progress['in_progress'] = False
+            progress['completed_at'] = time.time()
+        
+        logger.info(
+            f"Migration complete: {progress['migrated']} items migrated, "
+            f"{progress['skipped']} superseded by newer writes"
+        )
+    
+    def _migrate_batch(
+        self,
+        target: BaseFaultToleranceStrategy,
+        batch: list,
+        progress: Dict[str, Any]
+    ) -> None:
+        """
+        Store one migration batch, skipping keys already rewritten on the target.
+        
+        The lock is taken per item, not per batch: a client write waits for
+        at most one migrated store. Checking and storing under the lock means
+        a client write marked after the check lands after the old value.
+        """
+        for key, value in batch:
+            with self._migration_lock:
+                if key in self._keys_written_during_migration:
+                    progress['skipped'] += 1
+                    continue
+                if target.store(key, value):
+                    progress['migrated'] += 1
+    
+    def wait_for_migration(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until any running migration has finished.
+        
+        Returns:
+            True if no migration is running afterwards
+        """
+        thread = self._migration_thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        return not self._migration_progress.get('in_progress', False)
+    
+    def get_migration_status(self) -> Dict[str, Any]:
+        """Return progress of the current (or last) data migration."""
+        return dict(self._migration_progress)
     
     @property
     def strategy(self) -> BaseFaultToleranceStrategy:
@@ -121,11 +290,40 @@ class FaultToleranceManager:
     
     def store(self, key: str, value: Any) -> bool:
         """Store data using the current strategy."""
-        return self._current_strategy.store(key, value)
+        while True:
+            strategy = self._write_target(key)
+            stored = strategy.store(key, value)
+            # A strategy switch raced this write: repeat it on the new strategy
+            if strategy is self._current_strategy:
+                return stored
+    
+    def _write_target(self, key: str, blocking: bool = True) -> Optional[BaseFaultToleranceStrategy]:
+        """
+        Return the strategy a write of key goes to (None if the lock is busy
+        and not blocking).
+        
+        While a migration runs, the key is marked so that older migrated data
+        can't overwrite it (see _migrate_batch).
+        """
+        if not self._migration_lock.acquire(blocking):
+            return None
+        try:
+            if self._migration_source is not None:
+                self._keys_written_during_migration.add(key)
+            return self._current_strategy
+        finally:
+            self._migration_lock.release()
     
     def retrieve(self, key: str) -> Optional[Any]:
         """Retrieve data using the current strategy."""
-        return self._current_strategy.retrieve(key)
+        value = self._current_strategy.retrieve(key)
+        
+        # Key may not have been migrated yet - serve it from the old strategy
+        source = self._migration_source
+        if value is None and source is not None:
+            value = source.retrieve(key)
+        
+        return value
     
     def simulate_failure(self, **kwargs) -> None:
         """Simulate a failure using the current strategy."""
@@ -143,6 +341,39 @@ class FaultToleranceManager:
         """Get statistics from the current strategy."""
         return self._current_strategy.get_stats()
     
+    def get_recovery_trace(self) -> Optional[Dict[str, Any]]:
+        """Get the phase breakdown of the current strategy's last recovery."""
+        return self._current_strategy.get_recovery_trace()
+    
+    # Async variants for use from the API event loop
+    
+    async def astore(self, key: str, value: Any) -> bool:
+        """Async store using the current strategy."""
+        while True:
+            strategy = self._write_target(key, blocking=False)
+            if strategy is None:
+                # The migration is storing an item under the lock - wait for it off-loop
+                strategy = await asyncio.get_running_loop().run_in_executor(None, self._write_target, key)
+            stored = await strategy.astore(key, value)
+            if strategy is self._current_strategy:
+                return stored
+    
+    async def aretrieve(self, key: str) -> Optional[Any]:
+        """Async retrieve using the current strategy."""
+        value = await self._current_strategy.aretrieve(key)
+        source = self._migration_source
+        if value is None and source is not None:
+            value = await source.aretrieve(key)
+        return value
+    
+    async def asimulate_failure(self, **kwargs) -> None:
+        """Async simulate_failure using the current strategy."""
+        await self._current_strategy.asimulate_failure(**kwargs)
+    
+    async def arecover(self) -> float:
+        """Recover without blocking the event loop and return recovery time."""
+        return await self._current_strategy.arecover()
+    
     # Manager-specific methods
     
     def get_available_strategies(self) -> list:
@@ -153,7 +384,9 @@ class FaultToleranceManager:
         self,
         data_items: int = 100,
         failure_type: str = "default",
-        trigger_checkpoint: bool = False
+        trigger_checkpoint: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        seed: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Run a complete fault tolerance experiment.
@@ -168,98 +401,376 @@ class FaultToleranceManager:
             data_items: Number of test items to store
             failure_type: Type of failure to simulate
             trigger_checkpoint: Whether to force a checkpoint before failure (for testing RPO)
+            progress: Optional callback receiving (phase, fraction) updates
+            seed: Experiment seed for the workload and every fault decision
+                (default: the strategy's fault_seed, else random; recorded
+                in the results)
         
         Returns:
             Dictionary with experiment results
         """
-        import time
-        import random
-        import json
-        
         logger.info(f"Running experiment with {self._current_strategy_name} strategy")
+        progress = progress or _no_progress
+        seed = self._seed_experiment(seed)
+        workload = SyntheticWorkload(data_items, seed=seed)
         
-        # Store test data (Synthetic Issue Tracker Data)
-        logger.info(f"Storing {data_items} synthetic data items...")
-        store_start = time.time()
-        
-        test_keys = []
-        
-        for i in range(data_items):
-            # Generate realistic-looking Issue/Repo data
-            item_type = "issue" if i % 2 == 0 else "repository"
-            
-            if item_type == "issue":
-                key = f"issue_{i}"
-                value = {
-                    "type": "issue",
-                    "id": i,
-                    "title": f"Bug report #{i}: System crash on load",
-                    "status": random.choice(["open", "closed", "in_progress"]),
-                    "priority": random.choice(["high", "medium", "low"]),
-                    "creator": f"user_{random.randint(1, 100)}",
-                    "created_at": time.time()
-                }
-            else:
-                key = f"repo_{i}"
-                value = {
-                    "type": "repository",
-                    "id": i,
-                    "name": f"project-alpha-{i}",
-                    "owner": f"org_{random.randint(1, 10)}",
-                    "stars": random.randint(0, 500),
-                    "language": random.choice(["Python", "Go", "JavaScript", "Rust"]),
-                    "last_updated": time.time()
-                }
-                
-            self.store(key, value)
-            test_keys.append(key)
-        
-        store_time = time.time() - store_start
-        
-        # Force checkpoint if requested (and supported)
-        if trigger_checkpoint and hasattr(self._current_strategy, 'force_checkpoint'):
-            logger.info("Triggering forced checkpoint for experiment data consistency...")
-            self._current_strategy.force_checkpoint()
-            # Brief sleep to ensure disk write completes in simulation
-            time.sleep(0.1)
+        store_time = self._populate_test_data(workload, progress)
+        self._prepare_failure(trigger_checkpoint)
         
         # Simulate failure
         logger.info("Simulating failure...")
+        progress('failing', 0.0)
         self.simulate_failure()
         
         # Measure recovery
         logger.info("Starting recovery...")
+        progress('recovering', 0.0)
         recovery_time = self.recover()
         
-        # Verify data integrity
-        logger.info("Verifying data integrity...")
-        recovered_count = 0
-        for key in test_keys:
-            retrieved = self.retrieve(key)
-            if retrieved is not None:
-                recovered_count += 1
+        progress('verifying', 0.0)
+        recovered_count = self._verify_test_data(workload)
+        return self._experiment_results(workload, store_time, recovery_time, recovered_count)
+    
+    async def arun_experiment(
+        self,
+        data_items: int = 100,
+        failure_type: str = "default",
+        trigger_checkpoint: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Async version of run_experiment.
         
-        data_recovery_rate = (recovered_count / data_items) * 100
+        Data population and verification run in the default executor and
+        recovery uses arecover(), so the event loop keeps serving other
+        requests (health probes included) while the experiment runs.
+        """
+        logger.info(f"Running async experiment with {self._current_strategy_name} strategy")
+        loop = asyncio.get_running_loop()
+        progress = progress or _no_progress
+        seed = self._seed_experiment(seed)
+        workload = SyntheticWorkload(data_items, seed=seed)
         
-        results = {
+        store_time = await loop.run_in_executor(
+            None, self._populate_test_data, workload, progress
+        )
+        await loop.run_in_executor(None, self._prepare_failure, trigger_checkpoint)
+        
+        logger.info("Simulating failure...")
+        progress('failing', 0.0)
+        await self.asimulate_failure()
+        
+        logger.info("Starting recovery...")
+        progress('recovering', 0.0)
+        recovery_time = await self.arecover()
+        
+        progress('verifying', 0.0)
+        recovered_count = await loop.run_in_executor(None, self._verify_test_data, workload)
+        return self._experiment_results(workload, store_time, recovery_time, recovered_count)
+    
+    def run_workload_experiment(
+        self,
+        workload: Union[str, Dict[str, Any], WorkloadProfile] = 'ycsb-a',
+        record_count: int = 1000,
+        clients: int = 4,
+        failure_at: float = 2.0,
+        downtime: float = 0.5,
+        post_recovery: float = 2.0,
+        failure_kwargs: Optional[Dict[str, Any]] = None,
+        target_throughput: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None,
+        seed: Optional[int] = None,
+        fault_schedule: Optional[Union[str, List[Dict[str, Any]], FaultSchedule]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a workload concurrently with failure injection.
+        
+        This method:
+        1. Loads record_count records
+        2. Starts closed-loop client threads issuing the profile's operations
+        3. Simulates a failure after failure_at seconds and calls recover()
+           after a further downtime seconds - or, with fault_schedule,
+           executes every scheduled fault on a scheduler thread
+        4. Keeps the clients running for post_recovery seconds after the
+           last fault event
+        
+        Every operation's latency is recorded and attributed to the phase in
+        which it started: 'before' the first fault, 'during' (first fault
+        until the last event completed) and 'after'. With a schedule,
+        'intervals' additionally splits the run at every event.
+        
+        Args:
+            workload: YCSB preset name ('ycsb-a' ... 'ycsb-f'), profile dict or WorkloadProfile
+            record_count: Records loaded before the run
+            clients: Concurrent client threads
+            failure_at: Seconds of steady-state load before the failure
+            downtime: Seconds between the failure and the start of recovery
+            post_recovery: Seconds of load after recovery completes
+            failure_kwargs: Arguments for the strategy's simulate_failure
+                (e.g. {'node_count': 2} or {'failure_type': 'total'})
+            target_throughput: Total operations per second across all clients
+                (default: unthrottled)
+            progress: Optional callback receiving (phase, fraction) updates
+            seed: Experiment seed for the workload and every fault decision
+                (default: the strategy's fault_seed, else random; recorded
+                in the results)
+            fault_schedule: FaultSchedule, its DSL text (e.g. "at 2s kill
+                node-2; at 3.5s latency node-3 200ms; at 8s heal all") or
+                list of event dicts; replaces failure_at/downtime/failure_kwargs
+        
+        Returns:
+            Dictionary with per-phase throughput/latency, the executed fault
+            events and a throughput timeline
+        """
+        profile = get_workload_profile(workload)
+        if fault_schedule is None:
+            # The classic experiment: one failure, recovery after the downtime
+            schedule = FaultSchedule([
+                FaultEvent(failure_at, 'kill', params=dict(failure_kwargs or {})),
+                FaultEvent(failure_at + downtime, 'recover')
+            ])
+        else:
+            schedule = FaultSchedule.parse(fault_schedule)
+        progress = progress or _no_progress
+        seed = self._seed_experiment(seed)
+        generator = OperationGenerator(profile, record_count, seed=seed)
+        logger.info(
+            f"Running workload '{profile.name}' with {self._current_strategy_name} strategy "
+            f"({clients} clients)"
+        )
+        
+        load_time = self._populate_test_data(generator, progress)
+        
+        stop = threading.Event()
+        logs = [_ClientLog() for _ in range(clients)]
+        interval = clients / target_throughput if target_throughput else 0.0
+        origin_ns = time.perf_counter_ns()
+        threads = [
+            threading.Thread(
+                target=self._workload_client,
+                args=(generator, client_id, origin_ns, interval, stop, logs[client_id]),
+                name=f"workload-client-{client_id}",
+                daemon=True
+            )
+            for client_id in range(clients)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        scheduler = FaultScheduler(self._current_strategy, schedule, origin=origin_ns / 1e9)
+        try:
+            progress('running', 0.0)
+            scheduler.start()
+            scheduler.join()
+            
+            progress('running', 0.0)
+            time.sleep(post_recovery)
+        finally:
+            scheduler.stop()
+            stop.set()
+            for thread in threads:
+                thread.join()
+        end_ns = time.perf_counter_ns() - origin_ns
+        
+        progress('verifying', 0.0)
+        events = scheduler.executed
+        failure_ns = int(events[0]['started_at'] * 1e9)
+        recovered_ns = int(events[-1]['finished_at'] * 1e9)
+        recovery_times = [event['recovery_time'] for event in events if 'recovery_time' in event]
+        recovery_time = recovery_times[-1] if recovery_times else None
+        
+        started_ns, latency_ns, succeeded, operation = _ClientLog.merge(logs)
+        phases = summarize_operations(
+            started_ns, latency_ns, succeeded, operation,
+            {
+                'before': (0, failure_ns),
+                'during': (failure_ns, recovered_ns),
+                'after': (recovered_ns, end_ns)
+            }
+        )
+        boundaries = [int(event['started_at'] * 1e9) for event in events] + [end_ns]
+        interval_stats = summarize_operations(
+            started_ns, latency_ns, succeeded, operation,
+            {
+                FaultEvent(event['at'], event['action'], event['target'], event['params']).describe():
+                    (boundaries[i], boundaries[i + 1])
+                for i, event in enumerate(events)
+            }
+        )
+        intervals = [
+            {'event': name, 'started_at_seconds': boundaries[i] / 1e9, **stats}
+            for i, (name, stats) in enumerate(interval_stats.items())
+        ]
+        baseline_throughput = phases['before']['throughput_ops_per_sec']
+        degradation = (
+            (1 - phases['during']['throughput_ops_per_sec'] / baseline_throughput) * 100
+            if baseline_throughput else None
+        )
+        
+        logger.info(
+            f"Workload experiment complete: recovery_time="
+            f"{'n/a' if recovery_time is None else f'{recovery_time:.4f}s'}, "
+            f"{len(started_ns)} operations, "
+            f"throughput degradation during failure="
+            f"{'n/a' if degradation is None else f'{degradation:.1f}%'}"
+        )
+        
+        return {
             'strategy': self._current_strategy_name,
             'strategy_full_name': self._current_strategy.strategy_name,
-            'data_items': data_items,
-            'store_time_seconds': store_time,
+            'workload': profile.to_dict(),
+            'record_count': generator.record_count,
+            'clients': clients,
+            'target_throughput': target_throughput,
+            'seed': seed,
+            'workload_seed': generator.seed,
+            'load_time_seconds': load_time,
+            'failure_at_seconds': failure_ns / 1e9,
+            'recovered_at_seconds': recovered_ns / 1e9,
             'recovery_time_seconds': recovery_time,
-            'items_recovered': recovered_count,
-            'data_recovery_rate_percent': data_recovery_rate,
+            'duration_seconds': end_ns / 1e9,
+            'throughput_degradation_percent': degradation,
+            'fault_events': events,
+            'phases': phases,
+            'intervals': intervals,
+            'timeline': throughput_timeline(started_ns, succeeded, end_ns),
+            'recovery_trace': self.get_recovery_trace(),
             'stats': self.get_stats()
         }
+    
+    def _workload_client(
+        self,
+        generator: OperationGenerator,
+        client_id: int,
+        origin_ns: int,
+        interval: float,
+        stop: threading.Event,
+        log: '_ClientLog'
+    ) -> None:
+        """Client thread: issue operations until stopped, logging each one."""
+        next_start = time.perf_counter()
+        for op, key_index, size, scan_length in generator.operations(client_id):
+            if stop.is_set():
+                return
+            if interval:
+                next_start += interval
+                delay = next_start - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            
+            started = time.perf_counter_ns()
+            try:
+                ok = self._execute_operation(generator, op, key_index, size, scan_length)
+            except Exception as e:
+                logger.debug(f"Workload client {client_id}: {op} failed: {e}")
+                ok = False
+            log.record(started - origin_ns, time.perf_counter_ns() - started, ok, op)
+            if not ok:
+                # Back off like a real client instead of spinning on a down system
+                stop.wait(self.WORKLOAD_ERROR_BACKOFF)
+    
+    def _execute_operation(
+        self,
+        generator: OperationGenerator,
+        op: str,
+        key_index: int,
+        size: int,
+        scan_length: int
+    ) -> bool:
+        """Execute one workload operation and return whether it succeeded."""
+        if op == 'read':
+            return self.retrieve(generator.key_for(key_index)) is not None
+        if op == 'update':
+            return self.store(generator.key_for(key_index), generator.make_value(key_index, size))
+        if op == 'insert':
+            index = generator.next_insert_index()
+            return self.store(generator.key_for(index), generator.make_value(index, size))
+        if op == 'scan':
+            # No range API: read the consecutive keys one by one
+            last = min(key_index + scan_length, generator.key_count)
+            return all(
+                self.retrieve(generator.key_for(index)) is not None
+                for index in range(key_index, last)
+            )
+        # read_modify_write
+        key = generator.key_for(key_index)
+        if self.retrieve(key) is None:
+            return False
+        return self.store(key, generator.make_value(key_index, size))
+    
+    def _seed_experiment(self, seed: Optional[int]) -> int:
+        """
+        Give the strategy a fresh FaultInjector for one experiment.
         
-        logger.info(
-            f"Experiment complete: recovery_time={recovery_time:.4f}s, "
-            f"data_recovery={data_recovery_rate:.1f}%"
-        )
+        Returns the experiment seed, which also seeds the workload, so a
+        run is reproduced by passing the recorded seed back in.
+        """
+        config = self._current_strategy.config
+        if seed is None:
+            seed = config.get('fault_seed')
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self._current_strategy.set_fault_injector(FaultInjector.from_config(config, seed=seed))
+        logger.info(f"Experiment seed: {seed}")
+        return seed
+    
+    def _populate_test_data(
+        self,
+        workload: Union[SyntheticWorkload, OperationGenerator],
+        progress: ProgressCallback
+    ) -> float:
+        """
+        Store the workload's initial records and return the store time.
         
-        return results
+        Each chunk is generated before the clock starts, so store time
+        measures the strategy rather than the data generator.
+        """
+        # Store test data (Synthetic Issue Tracker Data)
+        logger.info(f"Storing {len(workload)} synthetic data items (seed={workload.seed})...")
+        progress('storing', 0.0)
+        store_time = 0.0
+        stored = 0
         
-        data_recovery_rate = (recovered_count / data_items) * 100
+        for chunk in workload.chunks():
+            chunk_start = time.perf_counter()
+            for key, value in chunk:
+                self.store(key, value)
+            store_time += time.perf_counter() - chunk_start
+            
+            stored += len(chunk)
+            progress('storing', stored / len(workload))
+        
+        return store_time
+    
+    def _prepare_failure(self, trigger_checkpoint: bool) -> None:
+        """Force a checkpoint before the failure if requested (and supported)."""
+        if trigger_checkpoint and hasattr(self._current_strategy, 'force_checkpoint'):
+            logger.info("Triggering forced checkpoint for experiment data consistency...")
+            self._current_strategy.force_checkpoint()
+            # Brief sleep to ensure disk write completes in simulation
+            time.sleep(0.1)
+    
+    def _verify_test_data(self, workload: SyntheticWorkload) -> int:
+        """Count how many of the stored test keys survived recovery."""
+        logger.info("Verifying data integrity...")
+        recovered_count = 0
+        for key in workload.keys():
+            retrieved = self.retrieve(key)
+            if retrieved is not None:
+                recovered_count += 1
+        return recovered_count
+    
+    def _experiment_results(
+        self,
+        workload: SyntheticWorkload,
+        store_time: float,
+        recovery_time: float,
+        recovered_count: int
+    ) -> Dict[str, Any]:
+        """Assemble the experiment result record."""
+        data_items = len(workload)
+        data_recovery_rate = (recovered_count / data_items) * 100 if data_items else 0.0
         
         results = {
             'strategy': self._current_strategy_name,
@@ -269,6 +780,9 @@ class FaultToleranceManager:
             'recovery_time_seconds': recovery_time,
             'items_recovered': recovered_count,
             'data_recovery_rate_percent': data_recovery_rate,
+            'seed': workload.seed,
+            'workload_seed': workload.seed,
+            'recovery_trace': self.get_recovery_trace(),
             'stats': self.get_stats()
         }
         
@@ -280,6 +794,39 @@ class FaultToleranceManager:
         return results
 
 
+def _no_progress(phase: str, fraction: float) -> None:
+    """Default progress callback: ignore updates."""
+    pass
+
+
+class _ClientLog:
+    """Per-client operation log (appended to by a single thread)."""
+    
+    OPERATION_CODES = {op: code for code, op in enumerate(OPERATIONS)}
+    
+    def __init__(self):
+        self.started_ns: List[int] = []
+        self.latency_ns: List[int] = []
+        self.succeeded: List[bool] = []
+        self.operation: List[int] = []
+    
+    def record(self, started_ns: int, latency_ns: int, ok: bool, op: str) -> None:
+        self.started_ns.append(started_ns)
+        self.latency_ns.append(latency_ns)
+        self.succeeded.append(bool(ok))
+        self.operation.append(self.OPERATION_CODES[op])
+    
+    @staticmethod
+    def merge(logs: List['_ClientLog']):
+        """Concatenate client logs into (started, latency, succeeded, operation) arrays."""
+        return (
+            np.array([v for log in logs for v in log.started_ns], dtype=np.int64),
+            np.array([v for log in logs for v in log.latency_ns], dtype=np.int64),
+            np.array([v for log in logs for v in log.succeeded], dtype=bool),
+            np.array([v for log in logs for v in log.operation], dtype=np.int64)
+        )
+
+
 # Global singleton instance for easy access throughout the application
 _manager_instance: Optional[FaultToleranceManager] = None
 
@@ -295,7 +842,8 @@ def get_manager(
     Args:
         strategy: Initial strategy if creating new instance
         config: Configuration for the strategy
-        force_new: If True, always create a new instance
+        force_new: If True, always create a new instance (the previous
+            instance is closed so its threads and directories don't leak)
     
     Returns:
         The global manager instance
@@ -303,6 +851,9 @@ def get_manager(
     global _manager_instance
     
     if _manager_instance is None or force_new:
+        previous = _manager_instance
         _manager_instance = FaultToleranceManager(strategy, config)
+        if previous is not None:
+            previous.close()
     
     return _manager_instance
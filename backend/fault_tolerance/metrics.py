@@ -0,0 +1,199 @@
+"""
+Latency Metrics for Fault Tolerance Strategies
+
+Records the latency of every strategy operation (store, retrieve,
+checkpoint, recover, ...) in HDR-style histograms:
+
+- Values are recorded in nanoseconds (time.perf_counter_ns)
+- Buckets are log-linear: exact below 128ns, then 64 sub-buckets per
+  power of two, so any recorded value is within 1.6% of its bucket
+  regardless of magnitude (1us reads and 10s recoveries alike)
+- Memory is proportional to the number of distinct buckets hit, not to
+  the number of operations
+- Every observation is also exported as a Prometheus histogram
+  (ft_operation_latency_seconds) when prometheus_client is installed
+
+Research Context:
+- Tail percentiles (p99/p999) expose regressions that averages in the
+  experiment CSVs hide entirely
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+
+try:
+    from prometheus_client import Histogram
+    PROMETHEUS_AVAILABLE = True
+except ImportError:  # pragma: no cover - prometheus_client is optional
+    Histogram = None
+    PROMETHEUS_AVAILABLE = False
+
+
+# Prometheus buckets: 1us .. ~33s, doubling (fixed buckets are coarser than
+# the in-process histogram; use get_stats() for exact tail percentiles)
+PROMETHEUS_BUCKETS = tuple(1e-6 * 2 ** i for i in range(26))
+
+OPERATION_LATENCY = (
+    Histogram(
+        'ft_operation_latency_seconds',
+        'Latency of fault tolerance strategy operations',
+        ['strategy', 'operation', 'replica'],
+        buckets=PROMETHEUS_BUCKETS
+    )
+    if PROMETHEUS_AVAILABLE else None
+)
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram (HDR-style) over nanosecond values.
+
+    Thread-safe; record() is O(1).
+    """
+
+    SUB_BUCKET_BITS = 7
+    _HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns: Optional[int] = None
+
+    @classmethod
+    def _bucket_index(cls, value_ns: int) -> int:
+        shift = value_ns.bit_length() - cls.SUB_BUCKET_BITS
+        if shift <= 0:
+            return value_ns
+        return shift * cls._HALF + (value_ns >> shift)
+
+    @classmethod
+    def _bucket_bounds(cls, index: int) -> Tuple[int, int]:
+        """Return the [low, high) range of values in a bucket."""
+        if index < 2 * cls._HALF:
+            return index, index + 1
+        shift = index // cls._HALF - 1
+        mantissa = index - shift * cls._HALF
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def record(self, value_ns: int) -> None:
+        """Record one latency in nanoseconds."""
+        value_ns = max(0, int(value_ns))
+        index = self._bucket_index(value_ns)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.total_ns += value_ns
+            if self.min_ns is None or value_ns < self.min_ns:
+                self.min_ns = value_ns
+            if self.max_ns is None or value_ns > self.max_ns:
+                self.max_ns = value_ns
+
+    def percentile(self, percent: float) -> Optional[int]:
+        """
+        Return the latency (ns) at the given percentile (0-100).
+
+        The result is the midpoint of the bucket holding that rank,
+        clamped to the recorded min/max.
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, int(round(percent / 100 * self.count)))
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= rank:
+                    low, high = self._bucket_bounds(index)
+                    value = (low + high - 1) // 2
+                    return min(max(value, self.min_ns), self.max_ns)
+            return self.max_ns
+
+    def summary(self) -> Dict[str, Any]:
+        """Count plus mean/percentile/max latencies in milliseconds."""
+        if not self.count:
+            return {'count': 0}
+
+        def ms(value_ns: Optional[int]) -> Optional[float]:
+            return value_ns / 1e6 if value_ns is not None else None
+
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ns / self.count / 1e6,
+            'min_ms': ms(self.min_ns),
+            'p50_ms': ms(self.percentile(50)),
+            'p90_ms': ms(self.percentile(90)),
+            'p99_ms': ms(self.percentile(99)),
+            'p999_ms': ms(self.percentile(99.9)),
+            'max_ms': ms(self.max_ns)
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self.count = 0
+            self.total_ns = 0
+            self.min_ns = None
+            self.max_ns = None
+
+
+class LatencyRecorder:
+    """
+    Per-operation (and optionally per-replica) histograms for one strategy.
+
+    Args:
+        strategy_label: Value of the Prometheus 'strategy' label
+    """
+
+    def __init__(self, strategy_label: str):
+        self.strategy_label = strategy_label
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._prometheus: Dict[Tuple[str, str], Any] = {}
+
+    def record(self, operation: str, elapsed_ns: int, replica: str = '') -> None:
+        """Record an operation latency, optionally attributed to a replica."""
+        key = (operation, replica)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+                if OPERATION_LATENCY is not None:
+                    self._prometheus[key] = OPERATION_LATENCY.labels(
+                        strategy=self.strategy_label, operation=operation, replica=replica
+                    )
+        histogram.record(elapsed_ns)
+
+        exporter = self._prometheus.get(key)
+        if exporter is not None:
+            exporter.observe(elapsed_ns / 1e9)
+
+    def histogram(self, operation: str, replica: str = '') -> Optional[LatencyHistogram]:
+        return self._histograms.get((operation, replica))
+
+    def _items(self) -> List[Tuple[Tuple[str, str], LatencyHistogram]]:
+        """Sorted snapshot of the histograms (record() may add keys concurrently)."""
+        with self._lock:
+            return sorted(self._histograms.items())
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Strategy-level latency summaries keyed by operation."""
+        return {
+            operation: histogram.summary()
+            for (operation, replica), histogram in self._items()
+            if not replica
+        }
+
+    def replica_summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Per-replica latency summaries: {replica: {operation: summary}}."""
+        replicas: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (operation, replica), histogram in self._items():
+            if replica:
+                replicas.setdefault(replica, {})[operation] = histogram.summary()
+        return replicas
+
+    def reset(self) -> None:
+        for _, histogram in self._items():
+            histogram.reset()
@@ -0,0 +1,113 @@
+"""
+Recovery Traces
+
+Breaks a strategy's recovery down into timed phases instead of a single
+recovery-time number:
+
+- detect: confirm the failure and find the failed nodes
+- locate_checkpoint / read / decode / restore: find the latest checkpoint,
+  read its bytes, parse it and load the records into storage
+- transfer / wal_replay: simulated checkpoint transfer and WAL replay
+- replica_sync: copy data from a healthy replica to a recovered node
+- first_read: first successful read once the strategy is back online
+
+Each phase records its offset from the start of recovery, its duration,
+how much of that was simulated latency, and byte/record counts.
+
+Research Context:
+- Shows where recovery time actually goes (I/O, parsing, simulated
+  network latency, replica sync), so the right phase gets optimized
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+import time
+
+
+@dataclass
+class RecoveryPhase:
+    """One timed phase of a recovery."""
+    name: str
+    started_at: float  # seconds since recovery started
+    duration_seconds: float = 0.0
+    simulated_seconds: float = 0.0
+    bytes: Optional[int] = None
+    records: Optional[int] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def simulate(self, latency: float) -> float:
+        """Account for a simulated latency and return it (for yielding)."""
+        self.simulated_seconds += latency
+        return latency
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'started_at_seconds': self.started_at,
+            'duration_seconds': self.duration_seconds,
+            'simulated_seconds': self.simulated_seconds,
+            'bytes': self.bytes,
+            'records': self.records,
+            'details': self.details
+        }
+
+
+class RecoveryTrace:
+    """
+    Ordered list of phases for a single recovery.
+
+    Strategies open phases inside their recovery generators:
+
+        with trace.phase('read') as phase:
+            yield phase.simulate(latency)
+            phase.bytes = len(raw)
+
+    A phase's duration includes any simulated latency yielded inside it,
+    because the driver sleeps before resuming the generator.
+    """
+
+    def __init__(self, strategy: str):
+        self.strategy = strategy
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self.phases: List[RecoveryPhase] = []
+        self.outcome = 'recovered'
+        self.recovery_time: Optional[float] = None
+        self.total_seconds: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str, **details: Any) -> Iterator[RecoveryPhase]:
+        """Time a phase; keyword arguments are stored as phase details."""
+        started = time.perf_counter()
+        phase = RecoveryPhase(name=name, started_at=started - self._origin, details=details)
+        self.phases.append(phase)
+        try:
+            yield phase
+        finally:
+            phase.duration_seconds = time.perf_counter() - started
+
+    def finish(self, recovery_time: float) -> None:
+        """Mark the trace complete with the strategy's reported recovery time."""
+        self.recovery_time = recovery_time
+        self.total_seconds = time.perf_counter() - self._origin
+
+    def phase_totals(self) -> Dict[str, float]:
+        """Total duration per phase name (phases such as replica_sync repeat)."""
+        totals: Dict[str, float] = {}
+        for phase in self.phases:
+            totals[phase.name] = totals.get(phase.name, 0.0) + phase.duration_seconds
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'strategy': self.strategy,
+            'started_at': self.started_at,
+            'outcome': self.outcome,
+            'recovery_time_seconds': self.recovery_time,
+            'total_seconds': self.total_seconds,
+            'simulated_seconds': sum(p.simulated_seconds for p in self.phases),
+            'bytes': sum(p.bytes or 0 for p in self.phases),
+            'phase_totals': self.phase_totals(),
+            'phases': [phase.to_dict() for phase in self.phases]
+        }
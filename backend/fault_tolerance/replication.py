@@ -14,14 +14,16 @@ Research Context:
 - Trade-off: Higher factor = more redundancy but higher write latency
 """
 
-from typing import Any, Dict, Optional, List, Set
+from typing import Any, Dict, Generator, Iterator, Optional, List, Set, Tuple
 import time
-import random
 import logging
 from dataclasses import dataclass
 from datetime import datetime
 
 from .base import BaseFaultToleranceStrategy
+from .cost_model import estimate_encoded_size
+from .recovery import RecoveryTrace
+from .storage import StorageBackend, create_storage_backend
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +33,7 @@ class ReplicaNode:
     """Represents a single replica node in the replication cluster."""
     node_id: str
     is_healthy: bool
-    data: Dict[str, Any]
+    data: StorageBackend
     last_heartbeat: float
     write_count: int = 0
     read_count: int = 0
@@ -56,6 +58,7 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
             - replication_factor: Number of replicas to maintain (default: 3)
             - write_quorum: Minimum replicas for successful write (default: majority)
             - read_quorum: Minimum replicas for successful read (default: 1)
+            - storage_backend: 'memory' (default), 'sqlite' or 'mmap' per replica
         """
         super().__init__(config)
         
@@ -94,7 +97,7 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
             self._replicas[node_id] = ReplicaNode(
                 node_id=node_id,
                 is_healthy=True,
-                data={},
+                data=create_storage_backend(self.config, f"replication_{node_id}"),
                 last_heartbeat=time.time()
             )
             logger.debug(f"Initialized replica: {node_id}")
@@ -103,7 +106,7 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
         """Return list of currently healthy replica nodes."""
         return [r for r in self._replicas.values() if r.is_healthy]
     
-    def store(self, key: str, value: Any) -> bool:
+    def _store(self, key: str, value: Any) -> bool:
         """
         Store data with synchronous replication to all healthy nodes.
         
@@ -133,7 +136,10 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
         successful_writes = 0
         for replica in healthy_replicas:
             try:
+                started = time.perf_counter_ns()
+                self._apply_injected_latency(replica.node_id)
                 replica.data[key] = entry.copy()
+                self._record_latency('store', time.perf_counter_ns() - started, replica.node_id)
                 replica.write_count += 1
                 successful_writes += 1
                 logger.debug(f"Replicated key '{key}' to {replica.node_id}")
@@ -152,7 +158,7 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
             )
             return False
     
-    def retrieve(self, key: str) -> Optional[Any]:
+    def _retrieve(self, key: str) -> Optional[Any]:
         """
         Retrieve data from the healthiest available replica.
         
@@ -173,11 +179,14 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
             return None
         
         # Read from a random healthy replica (load balancing)
-        replica = random.choice(healthy_replicas)
+        replica = self.faults.choose_replica(healthy_replicas)
         replica.read_count += 1
         
         self._record_operation('reads')
+        started = time.perf_counter_ns()
+        self._apply_injected_latency(replica.node_id)
         entry = replica.data.get(key)
+        self._record_latency('retrieve', time.perf_counter_ns() - started, replica.node_id)
         
         if entry:
             logger.debug(f"Read key '{key}' from {replica.node_id}")
@@ -206,7 +215,7 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
             self._is_failed = True
         else:
             # Partial failure - system continues with remaining nodes
-            nodes_to_fail = random.sample(healthy_replicas, node_count)
+            nodes_to_fail = self.faults.choose_nodes(healthy_replicas, node_count)
             for replica in nodes_to_fail:
                 replica.is_healthy = False
                 self._failed_nodes.add(replica.node_id)
@@ -220,7 +229,26 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
             f"{remaining} healthy replica(s) remaining"
         )
     
-    def recover(self) -> float:
+    def fault_targets(self) -> List[str]:
+        return list(self._replicas)
+    
+    def fail_node(self, node_id: str) -> None:
+        """Fail one specific replica (used by fault schedules)."""
+        replica = self._replicas.get(node_id)
+        if replica is None:
+            raise ValueError(f"Unknown replica: {node_id}. Valid options: {list(self._replicas)}")
+        
+        if replica.is_healthy:
+            replica.is_healthy = False
+            self._failed_nodes.add(node_id)
+            logger.warning(f"🔥 Replica {node_id} FAILED")
+        if not self._get_healthy_replicas():
+            logger.critical("🔥 REPLICATION FAILURE: All nodes failed!")
+            self._is_failed = True
+        
+        self._record_operation('failures_simulated')
+    
+    def _recovery_steps(self, trace: RecoveryTrace) -> Generator[float, None, float]:
         """
         Recover failed nodes and resync their data.
         
@@ -228,57 +256,82 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
         1. Bringing failed nodes back online
         2. Syncing data from healthy replicas to recovered nodes
         
-        REALISM UPDATE: Includes simulated network latency and
-        potential for cascading failure during high-load recovery.
+        REALISM UPDATE: Includes simulated network latency (from the
+        configured cost model) and potential for cascading failure
+        during high-load recovery.
+        
+        Phases: detect (node discovery), then replica_sync per recovered
+        node, or restart_nodes when every replica was down.
+        
+        Yields:
+            Simulated latencies (seconds) for the caller to sleep through
         
         Returns:
             Time taken to recover (sync data to recovered nodes)
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        # Simulate Network Latency for node discovery (100-400ms)
-        discovery_latency = random.uniform(0.1, 0.4)
-        time.sleep(discovery_latency)
+        # Simulate Network Latency for node discovery
+        with trace.phase('detect') as phase:
+            discovery_latency = self.cost_model.node_discovery()
+            yield phase.simulate(discovery_latency)
+            phase.details['failed_nodes'] = sorted(self._failed_nodes)
         
         if not self._failed_nodes:
             logger.info("ReplicationStrategy: No failed nodes to recover")
+            trace.outcome = 'not_failed'
             return discovery_latency
         
         # Get a healthy replica to sync from
         healthy_replicas = self._get_healthy_replicas()
         
         if not healthy_replicas:
-            # All nodes were down - need to recover from nothing (data loss)
+            # All nodes were down - need to recover from nothing (data loss),
+            # unless the replicas sit on persistent storage
             logger.warning("All replicas were down - recovering with empty state")
-            for node_id in list(self._failed_nodes):
-                replica = self._replicas[node_id]
-                replica.is_healthy = True
-                replica.data = {}
-                self._failed_nodes.discard(node_id)
+            with trace.phase('restart_nodes', nodes=sorted(self._failed_nodes)) as phase:
+                for node_id in list(self._failed_nodes):
+                    replica = self._replicas[node_id]
+                    replica.is_healthy = True
+                    if not replica.data.persistent:
+                        replica.data.clear()
+                    self._failed_nodes.discard(node_id)
+                phase.records = sum(len(replica.data) for replica in self._replicas.values())
+            trace.outcome = 'storage_survived' if phase.records else 'data_lost'
         else:
             # Sync from healthy replica
             source_replica = healthy_replicas[0]
             data_size = len(source_replica.data)
             
             # CASCADING FAILURE SIMULATION
-            # 5% chance that the healthy node fails under load of syncing multiple failed nodes
-            if len(self._failed_nodes) >= 2 and random.random() < 0.05:
+            # cascading_failure_rate (5%) chance that the healthy node fails
+            # under load of syncing multiple failed nodes
+            if len(self._failed_nodes) >= 2 and self.faults.cascade_failure():
                 logger.critical(f"🔥 CASCADING FAILURE: Node {source_replica.node_id} crashed during sync load!")
                 source_replica.is_healthy = False
                 self._failed_nodes.add(source_replica.node_id)
+                trace.outcome = 'cascading_failure'
                 # Abort recovery for now
-                return time.time() - start_time
+                return time.perf_counter() - start_time
             
             for node_id in list(self._failed_nodes):
                 replica = self._replicas[node_id]
                 
-                # Simulate Data Transfer Latency
-                # 2ms per item + 200ms base overhead
-                transfer_latency = 0.2 + (data_size * 0.002)
-                time.sleep(transfer_latency)
-                
-                # Copy data from healthy source (simulating sync)
-                replica.data = source_replica.data.copy()
+                with trace.phase('replica_sync', node=node_id, source=source_replica.node_id) as phase:
+                    started = time.perf_counter_ns()
+                    snapshot = source_replica.data.snapshot()
+                    
+                    # Simulate Data Transfer Latency
+                    data_bytes = (
+                        estimate_encoded_size(snapshot) if self.cost_model.uses_bytes else None
+                    )
+                    yield phase.simulate(self.cost_model.network_transfer(data_bytes or 0, data_size))
+                    
+                    # Copy data from healthy source (simulating sync)
+                    replica.data.load(snapshot)
+                    self._record_latency('sync', time.perf_counter_ns() - started, node_id)
+                    phase.bytes = data_bytes
+                    phase.records = len(snapshot)
                 replica.is_healthy = True
                 replica.last_heartbeat = time.time()
                 
@@ -290,12 +343,17 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
         # Clear global failed state if all nodes are now healthy
         self._is_failed = len(self._get_healthy_replicas()) == 0
         
-        recovery_time = time.time() - start_time
+        recovery_time = time.perf_counter() - start_time
         self._record_operation('recoveries')
         
         logger.info(f"Replication recovery completed in {recovery_time:.4f}s")
         return recovery_time
     
+    def _release_resources(self) -> None:
+        """Close every replica's storage backend."""
+        for replica in self._replicas.values():
+            replica.data.close()
+    
     def get_cluster_status(self) -> Dict[str, Any]:
         """Get detailed status of the replication cluster."""
         healthy_nodes = self._get_healthy_replicas()
@@ -306,6 +364,7 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
             'failed_nodes': list(self._failed_nodes),
             'write_quorum': self.write_quorum,
             'read_quorum': self.read_quorum,
+            'storage_backend': self.config.get('storage_backend', 'memory'),
             'can_accept_writes': len(healthy_nodes) >= self.write_quorum,
             'can_accept_reads': len(healthy_nodes) >= self.read_quorum,
             'nodes': {
@@ -325,3 +384,14 @@ class ReplicationStrategy(BaseFaultToleranceStrategy):
         if not healthy:
             return 0
         return len(healthy[0].data)
+    
+    def export_items(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (key, value) pairs from the first healthy replica."""
+        healthy = self._get_healthy_replicas()
+        if not healthy:
+            return
+        source = healthy[0].data
+        for key in source.keys():
+            entry = source.get(key)
+            if entry is not None:
+                yield key, entry['value']
@@ -0,0 +1,550 @@
+"""
+Pluggable Storage Backends for Fault Tolerance Strategies
+
+Strategies keep their records in a StorageBackend instead of a bare dict,
+so the same strategy can be run over different storage engines:
+
+- memory: Plain in-process dict (volatile, the historical behaviour)
+- sqlite: Embedded SQLite database in WAL mode with batched transactions
+- mmap:   Append-only record log in a memory-mapped file
+
+Research Context:
+- Lets experiments compare "in-memory + checkpoint" against
+  "embedded persistent storage" under identical experiment harnesses
+- Selected per strategy via the 'storage_backend' config key
+- Persistent backends survive simulate_crash(); only volatile state
+  (uncommitted batches, in-memory indexes) is lost
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StorageBackend(ABC):
+    """
+    Abstract key/value store used by fault tolerance strategies.
+
+    Entries are the JSON-serialisable dicts the strategies already build
+    ({'value': ..., 'timestamp': ...}). The mapping-style helpers
+    (get, __setitem__, __len__, ...) keep call sites close to dict usage.
+    """
+
+    #: Whether committed data survives a simulated process crash
+    persistent = False
+
+    @property
+    @abstractmethod
+    def backend_name(self) -> str:
+        """Return the short name of this backend ('memory', 'sqlite', ...)."""
+        pass
+
+    @abstractmethod
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the entry stored under key, or default."""
+        pass
+
+    @abstractmethod
+    def put(self, key: str, entry: Any) -> None:
+        """Store an entry under key, replacing any previous one."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Remove key. Returns True if it existed."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+        pass
+
+    @abstractmethod
+    def keys(self) -> List[str]:
+        """Return all stored keys."""
+        pass
+
+    @abstractmethod
+    def items(self) -> List[Tuple[str, Any]]:
+        """Return all (key, entry) pairs."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def put_many(self, items: Iterable[Tuple[str, Any]]) -> int:
+        """Store many entries. Backends override this to batch the writes."""
+        count = 0
+        for key, entry in items:
+            self.put(key, entry)
+            count += 1
+        return count
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Replace the entire contents with data (e.g. from a checkpoint)."""
+        self.clear()
+        self.put_many(data.items())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a point-in-time dict copy of all entries."""
+        return dict(self.items())
+
+    def flush(self) -> None:
+        """Make pending writes durable. No-op for volatile backends."""
+        pass
+
+    def simulate_crash(self) -> None:
+        """Drop all volatile state, as a process crash would."""
+        self.clear()
+
+    def recover(self) -> None:
+        """Reopen after simulate_crash(). No-op for volatile backends."""
+        pass
+
+    def close(self) -> None:
+        """Release any file handles or connections."""
+        pass
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def __setitem__(self, key: str, entry: Any) -> None:
+        self.put(key, entry)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+
+class InMemoryBackend(StorageBackend):
+    """Volatile dict-backed storage (the default)."""
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+
+    @property
+    def backend_name(self) -> str:
+        return "memory"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def put(self, key: str, entry: Any) -> None:
+        self._data[key] = entry
+
+    def put_many(self, items: Iterable[Tuple[str, Any]]) -> int:
+        items = list(items)
+        self._data.update(items)
+        return len(items)
+
+    def delete(self, key: str) -> bool:
+        return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def keys(self) -> List[str]:
+        return list(self._data.keys())
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return list(self._data.items())
+
+    def load(self, data: Dict[str, Any]) -> None:
+        self._data = dict(data)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self._data.copy()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Embedded SQLite storage in WAL mode.
+
+    Writes are grouped into explicit transactions of `batch_size` rows;
+    a simulated crash rolls back the open (uncommitted) batch while all
+    committed rows survive on disk.
+    """
+
+    persistent = True
+    DEFAULT_BATCH_SIZE = 500
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE, synchronous: str = "NORMAL"):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.synchronous = synchronous
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._open()
+
+    @property
+    def backend_name(self) -> str:
+        return "sqlite"
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: we manage BEGIN/COMMIT ourselves for batching
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, entry TEXT NOT NULL)")
+        self._pending = 0
+        logger.debug(f"SQLiteBackend opened: {self.path}")
+
+    def _check_open(self) -> None:
+        if self._conn is None:
+            raise RuntimeError(f"SQLiteBackend {self.path} has crashed; recover() it before writing")
+
+    def _begin(self) -> None:
+        self._check_open()
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+
+    def _maybe_commit(self) -> None:
+        if self._pending >= self.batch_size:
+            self._conn.execute("COMMIT")
+            self._pending = 0
+
+    # Reads on a crashed backend (no connection until recover()) see an empty store
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if self._conn is None:
+                return default
+            row = self._conn.execute("SELECT entry FROM kv WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def put(self, key: str, entry: Any) -> None:
+        payload = json.dumps(entry, default=str)
+        with self._lock:
+            self._begin()
+            self._conn.execute("INSERT OR REPLACE INTO kv (key, entry) VALUES (?, ?)", (key, payload))
+            self._pending += 1
+            self._maybe_commit()
+
+    def put_many(self, items: Iterable[Tuple[str, Any]]) -> int:
+        rows = [(key, json.dumps(entry, default=str)) for key, entry in items]
+        with self._lock:
+            for start in range(0, len(rows), self.batch_size):
+                chunk = rows[start:start + self.batch_size]
+                self._begin()
+                self._conn.executemany("INSERT OR REPLACE INTO kv (key, entry) VALUES (?, ?)", chunk)
+                self._pending += len(chunk)
+                self._maybe_commit()
+        return len(rows)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            self._begin()
+            cursor = self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+            self._pending += 1
+            self._maybe_commit()
+        return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._begin()
+            self._conn.execute("DELETE FROM kv")
+            self._conn.execute("COMMIT")
+            self._pending = 0
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            if self._conn is None:
+                return []
+            return [row[0] for row in self._conn.execute("SELECT key FROM kv")]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        with self._lock:
+            if self._conn is None:
+                return []
+            rows = self._conn.execute("SELECT key, entry FROM kv").fetchall()
+        return [(key, json.loads(entry)) for key, entry in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return 0
+            return self._conn.execute("SELECT COUNT(*) FROM kv").fetchone()[0]
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.execute("COMMIT")
+            self._pending = 0
+
+    def simulate_crash(self) -> None:
+        """Lose the uncommitted batch; committed rows stay on disk."""
+        with self._lock:
+            if self._conn is None:
+                return
+            lost = self._pending
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            self._conn.close()
+            self._conn = None
+            self._pending = 0
+        logger.info(f"SQLiteBackend crash: {lost} uncommitted writes rolled back")
+
+    def recover(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                self._open()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self.flush()
+                self._conn.close()
+                self._conn = None
+
+
+class MmapBackend(StorageBackend):
+    """
+    Append-only record log in a memory-mapped file.
+
+    Layout: an 8-byte header holding the used length, followed by
+    records of (key_len: u32, value_len: u32, key, value). A value_len of
+    TOMBSTONE marks a deletion. An in-memory index maps each key to the
+    offset of its latest value; it is volatile and rebuilt by scanning
+    the log on recover(), which is the recovery cost this backend models.
+    """
+
+    persistent = True
+    HEADER = struct.Struct('<Q')
+    RECORD = struct.Struct('<II')
+    TOMBSTONE = 0xFFFFFFFF
+    INITIAL_SIZE = 1024 * 1024
+    DEFAULT_FLUSH_EVERY = 500
+
+    def __init__(self, path: str, flush_every: int = DEFAULT_FLUSH_EVERY):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self._lock = threading.RLock()
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._used = self.HEADER.size
+        self._unflushed = 0
+        self._open()
+
+    @property
+    def backend_name(self) -> str:
+        return "mmap"
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        if size < self.HEADER.size:
+            os.ftruncate(self._fd, self.INITIAL_SIZE)
+            size = self.INITIAL_SIZE
+        self._mm = mmap.mmap(self._fd, size)
+        used = self.HEADER.unpack_from(self._mm, 0)[0]
+        self._used = used if self.HEADER.size <= used <= size else self.HEADER.size
+        self._rebuild_index()
+        logger.debug(f"MmapBackend opened: {self.path} ({len(self._index)} keys)")
+
+    def _rebuild_index(self) -> None:
+        """Scan the record log and rebuild the key -> value offset index."""
+        self._index = {}
+        offset = self.HEADER.size
+        while offset + self.RECORD.size <= self._used:
+            key_len, value_len = self.RECORD.unpack_from(self._mm, offset)
+            key_start = offset + self.RECORD.size
+            value_start = key_start + key_len
+            key = self._mm[key_start:value_start].decode('utf-8')
+            if value_len == self.TOMBSTONE:
+                self._index.pop(key, None)
+                offset = value_start
+            else:
+                self._index[key] = (value_start, value_len)
+                offset = value_start + value_len
+
+    def _check_open(self) -> None:
+        if self._mm is None:
+            raise RuntimeError(f"MmapBackend {self.path} has crashed; recover() it before writing")
+
+    def _ensure_capacity(self, needed: int) -> None:
+        size = len(self._mm)
+        if self._used + needed <= size:
+            return
+        new_size = size
+        while self._used + needed > new_size:
+            new_size *= 2
+        self._mm.flush()
+        self._mm.close()
+        os.ftruncate(self._fd, new_size)
+        self._mm = mmap.mmap(self._fd, new_size)
+
+    def _append(self, key: str, value: Optional[bytes]) -> None:
+        self._check_open()
+        key_bytes = key.encode('utf-8')
+        value_len = self.TOMBSTONE if value is None else len(value)
+        record_size = self.RECORD.size + len(key_bytes) + (0 if value is None else len(value))
+        self._ensure_capacity(record_size)
+
+        offset = self._used
+        self.RECORD.pack_into(self._mm, offset, len(key_bytes), value_len)
+        key_start = offset + self.RECORD.size
+        value_start = key_start + len(key_bytes)
+        self._mm[key_start:value_start] = key_bytes
+        if value is None:
+            self._index.pop(key, None)
+        else:
+            self._mm[value_start:value_start + len(value)] = value
+            self._index[key] = (value_start, len(value))
+
+        self._used += record_size
+        self.HEADER.pack_into(self._mm, 0, self._used)
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                return default
+            start, length = location
+            raw = self._mm[start:start + length]
+        return json.loads(raw)
+
+    def put(self, key: str, entry: Any) -> None:
+        payload = json.dumps(entry, default=str).encode('utf-8')
+        with self._lock:
+            self._append(key, payload)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._index:
+                return False
+            self._append(key, None)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._check_open()
+            self._index = {}
+            self._used = self.HEADER.size
+            self.HEADER.pack_into(self._mm, 0, self._used)
+            self.flush()
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._index.keys())
+
+    def items(self) -> List[Tuple[str, Any]]:
+        with self._lock:
+            raw = [(key, self._mm[start:start + length]) for key, (start, length) in self._index.items()]
+        return [(key, json.loads(value)) for key, value in raw]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._mm is not None:
+                self._mm.flush()
+            self._unflushed = 0
+
+    def simulate_crash(self) -> None:
+        """
+        Drop the in-memory index and mapping.
+
+        Writes already copied into the mapping live in the OS page cache,
+        so (as with a real process crash) they survive; only the index
+        has to be rebuilt.
+        """
+        with self._lock:
+            if self._mm is None:
+                return
+            self._mm.close()
+            os.close(self._fd)
+            self._mm = None
+            self._fd = None
+            # Reads go through the index, so until recover() the store looks empty
+            self._index = {}
+        logger.info("MmapBackend crash: in-memory index dropped")
+
+    def recover(self) -> None:
+        with self._lock:
+            if self._mm is None:
+                self._open()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mm is not None:
+                self.flush()
+                self._mm.close()
+                os.close(self._fd)
+                self._mm = None
+                self._fd = None
+
+
+STORAGE_BACKENDS = ('memory', 'sqlite', 'mmap')
+# Root of every default on-disk directory (e.g. a tmpfs for local chaos runs)
+DATA_ROOT = os.getenv('FT_DATA_DIR', '/tmp')
+DEFAULT_STORAGE_DIR = os.path.join(DATA_ROOT, 'gitforge_storage')
+
+
+def create_storage_backend(config: Dict[str, Any], name: str) -> StorageBackend:
+    """
+    Create the storage backend selected by a strategy config.
+
+    Config options:
+        - storage_backend: 'memory' (default), 'sqlite' or 'mmap'
+        - storage_dir: Directory for persistent backend files
+        - storage_batch_size: Writes per transaction / flush (default: 500)
+
+    Args:
+        config: Strategy configuration dict
+        name: File stem for this store (e.g. 'checkpointing', 'node-1')
+    """
+    kind = config.get('storage_backend', 'memory')
+    storage_dir = config.get('storage_dir', DEFAULT_STORAGE_DIR)
+
+    if kind == 'memory':
+        return InMemoryBackend()
+    if kind == 'sqlite':
+        return SQLiteBackend(
+            os.path.join(storage_dir, f"{name}.db"),
+            batch_size=config.get('storage_batch_size', SQLiteBackend.DEFAULT_BATCH_SIZE)
+        )
+    if kind == 'mmap':
+        return MmapBackend(
+            os.path.join(storage_dir, f"{name}.log"),
+            flush_every=config.get('storage_batch_size', MmapBackend.DEFAULT_FLUSH_EVERY)
+        )
+
+    raise ValueError(
+        f"Unknown storage backend: {kind}. "
+        f"Valid options: {list(STORAGE_BACKENDS)}"
+    )
@@ -0,0 +1,455 @@
+"""
+Synthetic Workload Generator for Fault Tolerance Experiments
+
+Generates the synthetic Issue/Repository records used by run_experiment:
+
+- Field values are drawn in bulk per chunk from a seeded NumPy generator
+  (one vectorised draw per column instead of random.choice per field)
+- Records are materialised lazily, one chunk at a time, so very large
+  runs (10M+ items) never hold every payload in memory
+- Keys can be re-enumerated without generating payloads (for verification)
+- The same seed always yields the same records
+
+and the operation workloads used by run_workload_experiment:
+
+- WorkloadProfile: read/update/insert/scan/read-modify-write mix, key
+  popularity (uniform, zipfian, hotspot, latest) and value sizes
+  (constant, uniform, zipfian), with YCSB core workload presets A-F
+- OperationGenerator: seeded per-client operation streams
+- summarize_operations: latency and throughput before, during and after
+  a failure window
+
+Research Context:
+- Keeps generator cost out of store_time_seconds: callers materialise a
+  chunk first and only time the strategy's store calls
+- Recorded seeds make every experiment's data set reproducible
+- Strategies are compared by throughput degradation and tail latency
+  while recovering, not just by a single recovery-time number
+"""
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import itertools
+import random
+import threading
+import time
+
+import numpy as np
+
+ISSUE_STATUSES = np.array(["open", "closed", "in_progress"])
+ISSUE_PRIORITIES = np.array(["high", "medium", "low"])
+REPO_LANGUAGES = np.array(["Python", "Go", "JavaScript", "Rust"])
+
+
+class SyntheticWorkload:
+    """
+    Seeded, chunked generator of synthetic issue tracker records.
+
+    Even indices are issues ("issue_<i>"), odd indices repositories
+    ("repo_<i>"), matching the historical run_experiment data set.
+    """
+
+    DEFAULT_CHUNK_SIZE = 10_000
+
+    def __init__(self, data_items: int, seed: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            data_items: Total number of records
+            seed: RNG seed (a random one is chosen and recorded if omitted)
+            chunk_size: Records generated per vectorised batch
+        """
+        self.data_items = data_items
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.chunk_size = max(1, chunk_size)
+
+    def __len__(self) -> int:
+        return self.data_items
+
+    @staticmethod
+    def key_for(index: int) -> str:
+        """Return the key of the record at index."""
+        return f"issue_{index}" if index % 2 == 0 else f"repo_{index}"
+
+    def keys(self) -> Iterator[str]:
+        """Yield every key in order without generating payloads."""
+        for i in range(self.data_items):
+            yield self.key_for(i)
+
+    def chunks(self) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """Yield materialised (key, value) lists of at most chunk_size records."""
+        rng = np.random.default_rng(self.seed)
+        for start in range(0, self.data_items, self.chunk_size):
+            stop = min(start + self.chunk_size, self.data_items)
+            yield self._generate_chunk(rng, start, stop)
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for chunk in self.chunks():
+            yield from chunk
+
+    def _generate_chunk(
+        self,
+        rng: np.random.Generator,
+        start: int,
+        stop: int
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Draw all columns for [start, stop) at once, then build the records."""
+        count = stop - start
+        # Column draws (one call per field for the whole chunk)
+        statuses = ISSUE_STATUSES[rng.integers(0, len(ISSUE_STATUSES), count)].tolist()
+        priorities = ISSUE_PRIORITIES[rng.integers(0, len(ISSUE_PRIORITIES), count)].tolist()
+        creators = rng.integers(1, 101, count).tolist()
+        owners = rng.integers(1, 11, count).tolist()
+        stars = rng.integers(0, 501, count).tolist()
+        languages = REPO_LANGUAGES[rng.integers(0, len(REPO_LANGUAGES), count)].tolist()
+        generated_at = time.time()
+
+        records = []
+        for offset, i in enumerate(range(start, stop)):
+            if i % 2 == 0:
+                records.append((f"issue_{i}", {
+                    "type": "issue",
+                    "id": i,
+                    "title": f"Bug report #{i}: System crash on load",
+                    "status": statuses[offset],
+                    "priority": priorities[offset],
+                    "creator": f"user_{creators[offset]}",
+                    "created_at": generated_at
+                }))
+            else:
+                records.append((f"repo_{i}", {
+                    "type": "repository",
+                    "id": i,
+                    "name": f"project-alpha-{i}",
+                    "owner": f"org_{owners[offset]}",
+                    "stars": stars[offset],
+                    "language": languages[offset],
+                    "last_updated": generated_at
+                }))
+        return records
+
+
+# Operation types, in the order used for vectorised operation selection
+OPERATIONS = ('read', 'update', 'insert', 'scan', 'read_modify_write')
+
+REQUEST_DISTRIBUTIONS = ('uniform', 'zipfian', 'hotspot', 'latest')
+VALUE_SIZE_DISTRIBUTIONS = ('constant', 'uniform', 'zipfian')
+
+
+@dataclass(frozen=True)
+class WorkloadProfile:
+    """
+    Operation mix, key popularity and value sizes of a workload.
+
+    Proportions are relative weights. value_size is the fixed size for
+    'constant' values and the upper bound for 'uniform' and 'zipfian'.
+    Scans are served as consecutive point reads, since the strategies
+    have no range API.
+    """
+    name: str = 'custom'
+    read_proportion: float = 0.5
+    update_proportion: float = 0.5
+    insert_proportion: float = 0.0
+    scan_proportion: float = 0.0
+    read_modify_write_proportion: float = 0.0
+    request_distribution: str = 'zipfian'
+    zipfian_constant: float = 0.99
+    hotspot_data_fraction: float = 0.2
+    hotspot_operation_fraction: float = 0.8
+    value_size_distribution: str = 'constant'
+    value_size: int = 100
+    min_value_size: int = 1
+    max_scan_length: int = 100
+
+    def __post_init__(self):
+        if self.request_distribution not in REQUEST_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown request distribution: {self.request_distribution}. "
+                f"Valid options: {list(REQUEST_DISTRIBUTIONS)}"
+            )
+        if self.value_size_distribution not in VALUE_SIZE_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown value size distribution: {self.value_size_distribution}. "
+                f"Valid options: {list(VALUE_SIZE_DISTRIBUTIONS)}"
+            )
+        mix = self.operation_mix()
+        if any(weight < 0 for weight in mix.values()) or sum(mix.values()) <= 0:
+            raise ValueError("Operation proportions must be non-negative and not all zero")
+        if not 1 <= self.min_value_size <= self.value_size:
+            raise ValueError("Value sizes must satisfy 1 <= min_value_size <= value_size")
+
+    def operation_mix(self) -> Dict[str, float]:
+        """Return the relative weight of each operation type."""
+        return {op: getattr(self, f'{op}_proportion') for op in OPERATIONS}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# YCSB core workloads (https://github.com/brianfrankcooper/YCSB/wiki/Core-Workloads)
+YCSB_WORKLOADS: Dict[str, WorkloadProfile] = {
+    'ycsb-a': WorkloadProfile(name='ycsb-a', read_proportion=0.5, update_proportion=0.5),
+    'ycsb-b': WorkloadProfile(name='ycsb-b', read_proportion=0.95, update_proportion=0.05),
+    'ycsb-c': WorkloadProfile(name='ycsb-c', read_proportion=1.0, update_proportion=0.0),
+    'ycsb-d': WorkloadProfile(
+        name='ycsb-d', read_proportion=0.95, update_proportion=0.0,
+        insert_proportion=0.05, request_distribution='latest'
+    ),
+    'ycsb-e': WorkloadProfile(
+        name='ycsb-e', read_proportion=0.0, update_proportion=0.0,
+        scan_proportion=0.95, insert_proportion=0.05
+    ),
+    'ycsb-f': WorkloadProfile(
+        name='ycsb-f', read_proportion=0.5, update_proportion=0.0,
+        read_modify_write_proportion=0.5
+    ),
+}
+
+
+def get_workload_profile(spec: Union[str, Dict[str, Any], WorkloadProfile]) -> WorkloadProfile:
+    """
+    Resolve a workload profile.
+
+    Args:
+        spec: A preset name ('ycsb-a' ... 'ycsb-f'), a WorkloadProfile, or a
+            dict of WorkloadProfile fields, optionally with 'preset' naming
+            the profile whose values it overrides
+    """
+    if isinstance(spec, WorkloadProfile):
+        return spec
+    if isinstance(spec, str):
+        profile = YCSB_WORKLOADS.get(spec.lower())
+        if profile is None:
+            raise ValueError(
+                f"Unknown workload: {spec}. Valid options: {list(YCSB_WORKLOADS.keys())}"
+            )
+        return profile
+
+    overrides = dict(spec)
+    preset = overrides.pop('preset', None)
+    unknown = set(overrides) - {f.name for f in fields(WorkloadProfile)}
+    if unknown:
+        raise ValueError(f"Unknown workload options: {sorted(unknown)}")
+    base = get_workload_profile(preset).to_dict() if preset else {}
+    return WorkloadProfile(**{**base, **overrides})
+
+
+def _zipfian_cdf(item_count: int, constant: float) -> np.ndarray:
+    """Cumulative distribution of a bounded Zipf law over item_count ranks."""
+    weights = 1.0 / np.power(np.arange(1, item_count + 1, dtype=np.float64), constant)
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+class OperationGenerator:
+    """
+    Seeded operation streams over a keyspace of record_count loaded keys.
+
+    One generator is shared by all client threads: each client draws from
+    its own stream (operations(client_id)) while inserts extend a single
+    shared keyspace. Like run_experiment's SyntheticWorkload it exposes
+    chunks() for loading the initial records.
+    """
+
+    BATCH_SIZE = 1024
+
+    def __init__(self, profile: WorkloadProfile, record_count: int, seed: Optional[int] = None):
+        """
+        Args:
+            profile: Operation mix and distributions
+            record_count: Records loaded before the run (the initial keyspace)
+            seed: RNG seed (a random one is chosen and recorded if omitted)
+        """
+        self.profile = profile
+        self.record_count = max(1, record_count)
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+
+        mix = profile.operation_mix()
+        weights = np.array([mix[op] for op in OPERATIONS], dtype=np.float64)
+        self._operation_p = weights / weights.sum()
+
+        self._key_cdf = None
+        if profile.request_distribution in ('zipfian', 'latest'):
+            self._key_cdf = _zipfian_cdf(self.record_count, profile.zipfian_constant)
+        # Scatter popular ranks across the keyspace (like YCSB's scrambled zipfian)
+        self._key_order = np.random.default_rng(self.seed).permutation(self.record_count)
+
+        self._size_cdf = None
+        if profile.value_size_distribution == 'zipfian':
+            self._size_cdf = _zipfian_cdf(
+                profile.value_size - profile.min_value_size + 1, profile.zipfian_constant
+            )
+
+        self._insert_lock = threading.Lock()
+        self._insert_counter = itertools.count(self.record_count)
+        self._key_count = self.record_count
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    @property
+    def key_count(self) -> int:
+        """Current keyspace size, including inserted records."""
+        return self._key_count
+
+    @staticmethod
+    def key_for(index: int) -> str:
+        """Return the key of the record at index."""
+        return f"record_{index}"
+
+    @staticmethod
+    def make_value(index: int, size: int) -> Dict[str, Any]:
+        """Build a record whose payload is size characters long."""
+        return {"id": index, "payload": "x" * size}
+
+    def chunks(self, chunk_size: int = SyntheticWorkload.DEFAULT_CHUNK_SIZE) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """Yield the initial records as (key, value) lists."""
+        rng = np.random.default_rng([self.seed, 0])
+        for start in range(0, self.record_count, chunk_size):
+            stop = min(start + chunk_size, self.record_count)
+            sizes = self._sample_sizes(rng, stop - start).tolist()
+            yield [
+                (self.key_for(i), self.make_value(i, size))
+                for i, size in zip(range(start, stop), sizes)
+            ]
+
+    def next_insert_index(self) -> int:
+        """Claim the index of the next inserted record."""
+        with self._insert_lock:
+            index = next(self._insert_counter)
+            self._key_count = index + 1
+        return index
+
+    def operations(self, client_id: int) -> Iterator[Tuple[str, int, int, int]]:
+        """
+        Yield (operation, key_index, value_size, scan_length) tuples forever.
+
+        Draws are made in vectorised batches; key_index is ignored for
+        inserts, which claim a new index when executed.
+        """
+        rng = np.random.default_rng([self.seed, client_id + 1])
+        while True:
+            ops = rng.choice(len(OPERATIONS), size=self.BATCH_SIZE, p=self._operation_p).tolist()
+            keys = self._sample_keys(rng, self.BATCH_SIZE).tolist()
+            sizes = self._sample_sizes(rng, self.BATCH_SIZE).tolist()
+            scans = rng.integers(1, self.profile.max_scan_length + 1, self.BATCH_SIZE).tolist()
+            for op, key, size, scan in zip(ops, keys, sizes, scans):
+                yield OPERATIONS[op], key, size, scan
+
+    def _sample_keys(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        distribution = self.profile.request_distribution
+        key_count = self._key_count
+
+        if distribution == 'uniform':
+            return rng.integers(0, key_count, count)
+        if distribution == 'hotspot':
+            hot_count = max(1, int(self.record_count * self.profile.hotspot_data_fraction))
+            hot = rng.integers(0, hot_count, count)
+            cold = rng.integers(min(hot_count, key_count - 1), key_count, count)
+            return np.where(rng.random(count) < self.profile.hotspot_operation_fraction, hot, cold)
+
+        ranks = np.minimum(
+            np.searchsorted(self._key_cdf, rng.random(count), side='right'),
+            self.record_count - 1
+        )
+        if distribution == 'latest':
+            # Most recently inserted records are the most popular
+            return np.maximum(key_count - 1 - ranks, 0)
+        return self._key_order[ranks]
+
+    def _sample_sizes(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        profile = self.profile
+        if profile.value_size_distribution == 'constant':
+            return np.full(count, profile.value_size)
+        if profile.value_size_distribution == 'uniform':
+            return rng.integers(profile.min_value_size, profile.value_size + 1, count)
+        offsets = np.minimum(
+            np.searchsorted(self._size_cdf, rng.random(count), side='right'),
+            len(self._size_cdf) - 1
+        )
+        return profile.min_value_size + offsets
+
+
+def _latency_summary(latency_ns: np.ndarray) -> Dict[str, Optional[float]]:
+    """Mean and percentile latencies in milliseconds."""
+    if latency_ns.size == 0:
+        return {'mean': None, 'p50': None, 'p95': None, 'p99': None, 'p999': None, 'max': None}
+    latency_ms = latency_ns / 1e6
+    p50, p95, p99, p999 = np.percentile(latency_ms, [50, 95, 99, 99.9]).tolist()
+    return {
+        'mean': float(latency_ms.mean()),
+        'p50': p50,
+        'p95': p95,
+        'p99': p99,
+        'p999': p999,
+        'max': float(latency_ms.max())
+    }
+
+
+def summarize_operations(
+    started_ns: np.ndarray,
+    latency_ns: np.ndarray,
+    succeeded: np.ndarray,
+    operation: np.ndarray,
+    phases: Dict[str, Tuple[int, int]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Summarise per-operation records by phase.
+
+    Args:
+        started_ns: Operation start offsets (ns since the run started)
+        latency_ns: Operation latencies (ns)
+        succeeded: Whether each operation succeeded
+        operation: Index into OPERATIONS for each operation
+        phases: Phase name -> [start, end) window in ns; operations are
+            assigned to the phase in which they started
+
+    Returns:
+        Per phase: operation counts, error rate, successful throughput,
+        latency summary overall and per operation type
+    """
+    summary = {}
+    for name, (window_start, window_end) in phases.items():
+        in_phase = (started_ns >= window_start) & (started_ns < window_end)
+        duration = max(window_end - window_start, 1) / 1e9
+        total = int(in_phase.sum())
+        ok = int((in_phase & succeeded).sum())
+
+        by_operation = {}
+        for code, op in enumerate(OPERATIONS):
+            selected = in_phase & (operation == code)
+            if selected.any():
+                by_operation[op] = {
+                    'operations': int(selected.sum()),
+                    'errors': int((selected & ~succeeded).sum()),
+                    'latency_ms': _latency_summary(latency_ns[selected])
+                }
+
+        summary[name] = {
+            'duration_seconds': duration,
+            'operations': total,
+            'errors': total - ok,
+            'error_rate_percent': (total - ok) / total * 100 if total else 0.0,
+            'throughput_ops_per_sec': ok / duration,
+            'latency_ms': _latency_summary(latency_ns[in_phase]),
+            'by_operation': by_operation
+        }
+    return summary
+
+
+def throughput_timeline(
+    started_ns: np.ndarray,
+    succeeded: np.ndarray,
+    end_ns: int,
+    bucket_seconds: float = 0.1
+) -> Dict[str, Any]:
+    """Successful and failed operations per second in fixed time buckets."""
+    bucket_ns = max(int(bucket_seconds * 1e9), 1)
+    buckets = int(end_ns // bucket_ns) + 1
+    index = np.minimum(started_ns // bucket_ns, buckets - 1).astype(np.int64)
+    ok = np.bincount(index[succeeded], minlength=buckets)
+    errors = np.bincount(index[~succeeded], minlength=buckets)
+    return {
+        'bucket_seconds': bucket_ns / 1e9,
+        'throughput_ops_per_sec': (ok / (bucket_ns / 1e9)).tolist(),
+        'errors_per_sec': (errors / (bucket_ns / 1e9)).tolist()
+    }
@@ -1,22 +1,38 @@
 from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from prometheus_fastapi_instrumentator import Instrumentator
+from contextlib import asynccontextmanager
+import asyncio
 import httpx
 import os
 
-import models
-from database import SessionLocal, engine, get_db
+from database import DB_POOL_LIVENESS_INTERVAL, engine, get_db, pool_liveness_loop
+from fault_tolerance import shutdown_job_queue
+from schema import DB_CREATE_INDEXES_ON_STARTUP, DB_CREATE_SCHEMA_ON_STARTUP, create_schema
 
 # Routers
 from routers import issues, comments, repositories, fault_tolerance, auth
 
-# Create tables (if they don't exist)
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Index backfills belong to `python schema.py`, not to every starting replica
+    if DB_CREATE_SCHEMA_ON_STARTUP:
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema, DB_CREATE_INDEXES_ON_STARTUP)
+    liveness = None
+    if DB_POOL_LIVENESS_INTERVAL > 0:
+        liveness = asyncio.create_task(pool_liveness_loop(engine, DB_POOL_LIVENESS_INTERVAL))
+    yield
+    if liveness:
+        liveness.cancel()
+    # Cancels queued experiment jobs and stops the worker processes
+    shutdown_job_queue()
+    await engine.dispose()
 
-app = FastAPI(title="GitForge Backend Gateway")
+app = FastAPI(title="GitForge Backend Gateway", lifespan=lifespan)
 
 # CORS configuration
 origins = [
@@ -31,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Link", "X-Next-Cursor"],
 )
 
 # --- RESEARCH OBSERVABILITY ---
@@ -78,7 +95,7 @@ def api_root():
 
 # --- CRITICAL ENDPOINT FOR EXPERIMENTS ---
 @app.get("/api/health") # Keeping /api/health to match frontend expectations
-def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_db)):
     """
     Used by the Experiment Controller to measure 'Recovery Time'.
     It attempts a simple DB query. If the node is down (Pod Kill), 
@@ -86,7 +103,7 @@ def health_check(db: Session = Depends(get_db)):
     """
     try:
         # execute a lightweight query to verify DB connectivity
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return {
             "status": "healthy", 
             "components": {"database": "connected"}
@@ -97,8 +114,8 @@ def health_check(db: Session = Depends(get_db)):
 
 # Support both /health (for script) and /api/health (for frontend)
 @app.get("/health")
-def health_check_root(db: Session = Depends(get_db)):
-    return health_check(db)
+async def health_check_root(db: AsyncSession = Depends(get_db)):
+    return await health_check(db)
 
 # --- GITEA PROXY (DISTRIBUTED GIT STORE) ---
 # Note: For internal K8s DNS, access 'gitea-service'. For local docker-compose, 'ds_rm_fp-gitea-1' or 'localhost:3000'
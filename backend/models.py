@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -26,6 +26,36 @@ class Issue(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # Indexes behind GET /api/issues (keyset pagination, filters and sorts).
+    # Each filtered view is one range scan: equality columns first, then the
+    # sort key and issue_id as tie-breaker. The repo views are the hot ones,
+    # so their indexes STORE (postgresql_include renders as INCLUDE, which
+    # CockroachDB reads as STORING) every other column and need no join back
+    # to the primary index.
+    __table_args__ = (
+        Index("ix_issues_v2_created_at_issue_id", created_at.desc(), issue_id.desc()),
+        Index(
+            "ix_issues_v2_repo_status_created", repo_id, status, created_at.desc(), issue_id.desc(),
+            postgresql_include=["title", "description", "priority", "creator_id", "assignee_id", "updated_at"]
+        ),
+        Index(
+            "ix_issues_v2_repo_status_priority_created", repo_id, status, priority, created_at.desc(), issue_id.desc(),
+            postgresql_include=["title", "description", "creator_id", "assignee_id", "updated_at"]
+        ),
+        Index(
+            "ix_issues_v2_repo_status_updated", repo_id, status, updated_at.desc(), issue_id.desc(),
+            postgresql_include=["title", "description", "priority", "creator_id", "assignee_id", "created_at"]
+        ),
+        Index("ix_issues_v2_assignee_status_created", assignee_id, status, created_at.desc(), issue_id.desc()),
+        Index("ix_issues_v2_creator_status_created", creator_id, status, created_at.desc(), issue_id.desc()),
+        # Trigram inverted indexes serve GET /api/issues/search (ILIKE '%q%')
+        Index("ix_issues_v2_title_trgm", title, postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index(
+            "ix_issues_v2_description_trgm", description,
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}
+        ),
+    )
+
 class Comment(Base):
     __tablename__ = "issue_comments"
 
@@ -34,3 +64,7 @@ class Comment(Base):
     author_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_issue_comments_content_trgm", content, postgresql_using="gin", postgresql_ops={"content": "gin_trgm_ops"}),
+    )
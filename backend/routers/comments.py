@@ -1,46 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
 
-from database import get_db
+from cache import cache, cache_readable, comments_generation_key, comments_key
+from database import execute_write, get_db, get_read_db
 from models import Comment
 from schemas import CommentCreate, Comment as CommentSchema
 
 router = APIRouter(prefix="/api/comments", tags=["comments"])
 
 @router.post("/", response_model=CommentSchema, status_code=201)
-def create_comment(comment: CommentCreate, db: Session = Depends(get_db)):
+async def create_comment(comment: CommentCreate, db: AsyncSession = Depends(get_db)):
     """
     Create a new comment on an issue
     """
-    new_comment = Comment(
+    statement = insert(Comment).values(
         issue_id=comment.issue_id,
         content=comment.content, # Schema uses 'content', model uses 'content'
         author_id=comment.author_id
-    )
-    db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
-    return new_comment
+    ).returning(*Comment.__table__.c)
+    created = (await execute_write(db, statement, "create_comment")).one()
+    await cache.comments_written(created.issue_id)
+    return created
 
 @router.get("/issue/{issue_id}", response_model=List[CommentSchema])
-def get_comments_for_issue(issue_id: int, db: Session = Depends(get_db)):
+async def get_comments_for_issue(issue_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
     """
     Get all comments for a specific issue
     """
-    return db.query(Comment).filter(Comment.issue_id == issue_id).order_by(Comment.created_at).all()
+    if cache_readable(request.headers.get("cache-control")):
+        cached = await cache.get(comments_key(issue_id), "get_comments_for_issue")
+        if cached is not None:
+            return cached
+    deps = None
+    if not db.info.get("follower_read"):
+        deps = await cache.tokens([comments_generation_key(issue_id)])
+    statement = select(Comment).where(Comment.issue_id == issue_id).order_by(Comment.created_at)
+    comments = (await db.scalars(statement)).all()
+    if deps is not None:
+        value = [CommentSchema.model_validate(comment).model_dump(mode="json") for comment in comments]
+        await cache.put(comments_key(issue_id), value, deps)
+    return comments
 
 @router.delete("/{comment_id}")
-def delete_comment(comment_id: UUID, db: Session = Depends(get_db)):
+async def delete_comment(comment_id: UUID, db: AsyncSession = Depends(get_db)):
     """
     Delete a comment
     """
-    comment = db.query(Comment).filter(Comment.comment_id == comment_id).first()
-    
-    if not comment:
+    statement = delete(Comment).where(Comment.comment_id == comment_id).returning(Comment.issue_id)
+    deleted = (await execute_write(db, statement, "delete_comment")).first()
+    if not deleted:
         raise HTTPException(status_code=404, detail="Comment not found")
+    await cache.comments_written(deleted.issue_id)
     
-    db.delete(comment)
-    db.commit()
     return {"status": "deleted", "id": str(comment_id)}
@@ -5,14 +5,25 @@ Exposes the fault tolerance strategies via REST API for:
 - The frontend Research Control Panel
 - The automated experiment controller
 - Manual testing and demonstration
+
+All endpoints use the managers' async variants (or the threadpool) so
+that simulated recovery latency never blocks the event loop.
 """
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional, Literal
+from typing import AsyncIterator, Dict, Any, List, Optional, Literal, Tuple, Union
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import logging
 
-from fault_tolerance import FaultToleranceManager, get_manager
+from fault_tolerance import (
+    FaultSchedule, FaultToleranceManager, WorkloadProfile, get_manager, get_job_queue, get_workload_profile
+)
+from fault_tolerance.executor import WORKLOAD_KEYS, experiment_config
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +37,9 @@ class StrategyConfig(BaseModel):
     strategy: Literal['baseline', 'checkpointing', 'replication', 'hybrid']
     checkpoint_interval: Optional[int] = 30
     replication_factor: Optional[int] = 3
+    storage_backend: Optional[Literal['memory', 'sqlite', 'mmap']] = 'memory'
+    cost_model: Optional[Literal['legacy', 'real', 'modeled']] = None
+    migrate_data: Optional[bool] = False
 
 
 class StoreRequest(BaseModel):
@@ -41,10 +55,31 @@ class ExperimentRequest(BaseModel):
     checkpoint_interval: Optional[int] = 30
     replication_factor: Optional[int] = 3
     trigger_checkpoint: Optional[bool] = False
+    seed: Optional[int] = None  # Workload seed for reproducible data sets
+    storage_backend: Optional[Literal['memory', 'sqlite', 'mmap']] = 'memory'
+    cost_model: Optional[Literal['legacy', 'real', 'modeled']] = None  # Simulated recovery latency
 
 
 # ... (existing code) ...
 
+@asynccontextmanager
+async def private_manager(request: ExperimentRequest) -> AsyncIterator[FaultToleranceManager]:
+    """
+    A FaultToleranceManager owned by one experiment request.
+    
+    Never the global get_manager() instance: concurrent experiments would
+    close each other's strategy mid-run. Created and closed in the
+    threadpool, as both may touch the disk or join a checkpoint thread.
+    """
+    manager = await run_in_threadpool(
+        FaultToleranceManager, request.strategy, experiment_config(request.model_dump())
+    )
+    try:
+        yield manager
+    finally:
+        await run_in_threadpool(manager.close)
+
+
 @router.post("/run-experiment")
 async def run_experiment(request: ExperimentRequest) -> Dict[str, Any]:
     """
@@ -60,26 +95,182 @@ async def run_experiment(request: ExperimentRequest) -> Dict[str, Any]:
     Returns:
         Complete experiment results including all metrics
     """
-    # Create a fresh manager with the specified strategy
-    config = {}
-    if request.checkpoint_interval:
-        config['checkpoint_interval'] = request.checkpoint_interval
-    if request.replication_factor:
-        config['replication_factor'] = request.replication_factor
-    
-    manager = get_manager(
-        strategy=request.strategy,
-        config=config,
-        force_new=True  # Always create fresh for experiments
-    )
+    async with private_manager(request) as manager:
+        return await manager.arun_experiment(
+            data_items=request.data_items,
+            trigger_checkpoint=request.trigger_checkpoint,
+            seed=request.seed
+        )
+
+
+class WorkloadExperimentRequest(ExperimentRequest):
+    """Request to run a workload with a failure injected part-way through."""
+    data_items: int = 1000  # Records loaded before the run
+    workload: Union[str, Dict[str, Any]] = 'ycsb-a'  # YCSB preset or profile fields
+    clients: int = 4
+    failure_at: float = 2.0
+    downtime: float = 0.5
+    post_recovery: float = 2.0
+    failure_kwargs: Optional[Dict[str, Any]] = None
+    target_throughput: Optional[float] = None
+    # DSL text or event list; replaces failure_at/downtime/failure_kwargs
+    fault_schedule: Optional[Union[str, List[Dict[str, Any]]]] = None
+
+
+def parse_workload(
+    workload: Union[str, Dict[str, Any]],
+    fault_schedule: Optional[Union[str, List[Dict[str, Any]]]]
+) -> Tuple[WorkloadProfile, Optional[FaultSchedule]]:
+    """Validate a workload and fault schedule from a request (422 if invalid)."""
+    try:
+        profile = get_workload_profile(workload)
+        schedule = FaultSchedule.parse(fault_schedule) if fault_schedule else None
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return profile, schedule
+
+
+@router.post("/run-workload")
+async def run_workload_experiment(request: WorkloadExperimentRequest) -> Dict[str, Any]:
+    """
+    Run a workload experiment with concurrent failure injection.
     
-    # Run the experiment
-    results = manager.run_experiment(
-        data_items=request.data_items,
-        trigger_checkpoint=request.trigger_checkpoint
-    )
+    Client threads issue the workload's reads/updates/inserts/scans while
+    a failure is simulated and recovered (or a fault_schedule such as
+    "at 2s kill node-2; at 3.5s latency node-3 200ms; at 8s heal all"
+    runs), and latency/throughput are reported before, during and after
+    the faults.
+    
+    Returns:
+        Per-phase latency percentiles, throughput, the executed fault
+        events and a throughput timeline
+    """
+    profile, schedule = parse_workload(request.workload, request.fault_schedule)
     
-    return results
+    async with private_manager(request) as manager:
+        return await run_in_threadpool(
+            manager.run_workload_experiment,
+            workload=profile,
+            record_count=request.data_items,
+            clients=request.clients,
+            failure_at=request.failure_at,
+            downtime=request.downtime,
+            post_recovery=request.post_recovery,
+            failure_kwargs=request.failure_kwargs,
+            target_throughput=request.target_throughput,
+            seed=request.seed,
+            fault_schedule=schedule
+        )
+
+
+class ExperimentJobRequest(ExperimentRequest):
+    """
+    Request to queue one or more background experiment runs.
+    
+    Classic experiments by default; set workload to queue workload
+    experiments (unset options take the /run-workload defaults).
+    """
+    runs: int = 1
+    workload: Optional[Union[str, Dict[str, Any]]] = None
+    clients: Optional[int] = None
+    failure_at: Optional[float] = None
+    downtime: Optional[float] = None
+    post_recovery: Optional[float] = None
+    failure_kwargs: Optional[Dict[str, Any]] = None
+    target_throughput: Optional[float] = None
+    fault_schedule: Optional[Union[str, List[Dict[str, Any]]]] = None
+
+
+@router.post("/jobs", status_code=202)
+async def submit_experiment_jobs(request: ExperimentJobRequest) -> Dict[str, Any]:
+    """
+    Queue experiment runs on the background worker pool.
+    
+    Returns immediately with the job ids; poll GET /jobs/{job_id} or
+    stream GET /jobs/{job_id}/events for progress and results.
+    """
+    if request.runs < 1:
+        raise HTTPException(status_code=422, detail="runs must be at least 1")
+    if request.workload is not None:
+        parse_workload(request.workload, request.fault_schedule)
+    else:
+        workload_options = [key for key in WORKLOAD_KEYS if getattr(request, key) is not None]
+        if workload_options:
+            raise HTTPException(status_code=422, detail=f"{', '.join(workload_options)} require a workload")
+    
+    queue = get_job_queue()
+    params = request.model_dump(exclude={'runs'})
+    job_ids = [queue.submit(params) for _ in range(request.runs)]
+    
+    return {
+        "job_ids": job_ids,
+        "queued": len(job_ids),
+        "workers": queue.max_workers
+    }
+
+
+@router.get("/jobs")
+async def list_experiment_jobs(status: Optional[str] = Query(None)) -> Dict[str, Any]:
+    """List queued, running and recently finished experiment jobs."""
+    jobs = get_job_queue().list_jobs(status)
+    return {
+        "jobs": [job.to_dict(include_result=False) for job in jobs],
+        "count": len(jobs)
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_experiment_job(job_id: str) -> Dict[str, Any]:
+    """Get the status, progress and (when finished) result of a job."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_experiment_job(job_id: str) -> Dict[str, Any]:
+    """Cancel a job that has not started running yet."""
+    queue = get_job_queue()
+    if queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job already started")
+    return {"job_id": job_id, "status": "cancelled"}
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_experiment_job(job_id: str, poll_interval: float = Query(0.25, gt=0, le=5)):
+    """
+    Stream job progress as Server-Sent Events.
+    
+    Emits a 'progress' event whenever the job changes and a final
+    'result' event (with the full job record) once it finishes.
+    """
+    queue = get_job_queue()
+    if queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def event_stream():
+        last_version = -1
+        while True:
+            job = queue.get(job_id)
+            if job is None:
+                return
+            if job.version != last_version:
+                last_version = job.version
+                event = "result" if job.finished else "progress"
+                payload = json.dumps(job.to_dict(include_result=job.finished), default=str)
+                yield f"event: {event}\ndata: {payload}\n\n"
+            if job.finished:
+                return
+            await asyncio.sleep(poll_interval)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
 
 
 class FailureRequest(BaseModel):
@@ -104,7 +295,8 @@ async def get_status() -> Dict[str, Any]:
         "strategy": manager.strategy_name,
         "strategy_details": manager.strategy.strategy_name,
         "is_healthy": manager.is_healthy(),
-        "stats": manager.get_stats()
+        "stats": manager.get_stats(),
+        "migration": manager.get_migration_status()
     }
 
 
@@ -144,6 +336,8 @@ async def configure_strategy(config: StrategyConfig) -> Dict[str, Any]:
     Configure and switch to a specific fault tolerance strategy.
     
     This will create a new strategy instance with the specified configuration.
+    With migrate_data, existing data is streamed into the new strategy in the
+    background while reads fall back to the previous one.
     """
     manager = get_manager()
     
@@ -155,14 +349,26 @@ async def configure_strategy(config: StrategyConfig) -> Dict[str, Any]:
     if config.replication_factor:
         strategy_config['replication_factor'] = config.replication_factor
     
-    manager.set_strategy(config.strategy, strategy_config)
+    if config.storage_backend:
+        strategy_config['storage_backend'] = config.storage_backend
+    
+    if config.cost_model:
+        strategy_config['cost_model'] = config.cost_model
+    
+    await run_in_threadpool(
+        manager.set_strategy,
+        config.strategy,
+        strategy_config,
+        migrate=bool(config.migrate_data)
+    )
     
     logger.info(f"Strategy configured: {config.strategy} with config: {strategy_config}")
     
     return {
         "success": True,
         "message": f"Switched to {config.strategy} strategy",
-        "current_strategy": manager.strategy.strategy_name
+        "current_strategy": manager.strategy.strategy_name,
+        "migration": manager.get_migration_status()
     }
 
 
@@ -173,7 +379,7 @@ async def store_data(request: StoreRequest) -> Dict[str, Any]:
     """
     manager = get_manager()
     
-    success = manager.store(request.key, request.value)
+    success = await manager.astore(request.key, request.value)
     
     return {
         "success": success,
@@ -189,7 +395,7 @@ async def retrieve_data(key: str) -> Dict[str, Any]:
     """
     manager = get_manager()
     
-    value = manager.retrieve(key)
+    value = await manager.aretrieve(key)
     
     return {
         "key": key,
@@ -218,11 +424,11 @@ async def simulate_failure(request: FailureRequest = None) -> Dict[str, Any]:
     # Different strategies accept different failure parameters
     try:
         if manager.strategy_name == 'replication':
-            manager.simulate_failure(node_count=request.node_count)
+            await manager.asimulate_failure(node_count=request.node_count)
         elif manager.strategy_name == 'hybrid':
-            manager.simulate_failure(failure_type=request.failure_type)
+            await manager.asimulate_failure(failure_type=request.failure_type)
         else:
-            manager.simulate_failure()
+            await manager.asimulate_failure()
     except Exception as e:
         logger.error(f"Failure simulation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -240,20 +446,36 @@ async def recover_from_failure() -> Dict[str, Any]:
     Recover from a simulated failure.
     
     Returns:
-        Recovery time in seconds and post-recovery status
+        Recovery time in seconds, its phase breakdown and post-recovery status
     """
     manager = get_manager()
     
-    recovery_time = manager.recover()
+    recovery_time = await manager.arecover()
     
     return {
         "success": True,
         "recovery_time_seconds": recovery_time,
+        "recovery_trace": manager.get_recovery_trace(),
         "is_healthy": manager.is_healthy(),
         "strategy": manager.strategy_name
     }
 
 
+@router.get("/recovery-trace")
+async def get_recovery_trace() -> Dict[str, Any]:
+    """
+    Get the phase breakdown of the last recovery.
+    
+    Phases (detect, locate_checkpoint, read, decode, restore, transfer,
+    wal_replay, replica_sync, first_read) carry their start offset,
+    duration, simulated share and byte/record counts.
+    """
+    trace = get_manager().get_recovery_trace()
+    if trace is None:
+        raise HTTPException(status_code=404, detail="No recovery has been run yet")
+    return trace
+
+
 
 
 
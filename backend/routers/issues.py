@@ -1,66 +1,371 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import (
+    Float, Integer, String, cast, column, delete, func, insert, literal, select, tuple_, union_all, update, values
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Tuple
+from datetime import datetime
+import base64
+import json
 
-from database import get_db
-from models import Issue
-from schemas import IssueCreate, Issue as IssueSchema, IssueUpdate
+from cache import (
+    EPOCH_KEY, cache, cache_readable, issue_key, issue_list_key, issue_list_tag, issue_version, issue_version_key
+)
+from database import execute_write, get_db, get_read_db, run_write
+from models import Comment, Issue
+from schemas import (
+    BulkItemResult, BulkResult, IssueBulkDelete, IssueBulkUpdate, IssueCreate, Issue as IssueSchema,
+    IssueSearchResult, IssueUpdate
+)
 
 router = APIRouter(prefix="/api/issues", tags=["issues"])
 
+# Every column, so RETURNING hands back the full row including server defaults
+ISSUE_COLUMNS = Issue.__table__.c
+
 @router.post("/", response_model=IssueSchema)
-def create_issue(issue: IssueCreate, db: Session = Depends(get_db)):
+async def create_issue(issue: IssueCreate, db: AsyncSession = Depends(get_db)):
     # Create issue from pydantic model
-    new_issue = Issue(
+    statement = insert(Issue).values(
         title=issue.title,
         description=issue.description,
         priority=issue.priority,
         repo_id=issue.repo_id,
         creator_id=issue.creator_id,
         assignee_id=issue.assignee_id
-    )
-    db.add(new_issue)
-    db.commit()
-    db.refresh(new_issue)
-    return new_issue
+    ).returning(*ISSUE_COLUMNS)
+    issue = (await execute_write(db, statement, "create_issue")).one()
+    await cache.issues_written([issue])
+    return issue
+
+SORT_COLUMNS = {"created_at": Issue.created_at, "updated_at": Issue.updated_at}
+
+def _encode_token(key: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+def _decode_token(cursor: str) -> list:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(key, list) or len(key) != 3:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+def _set_next_page(request: Request, response: Response, next_cursor: str) -> None:
+    next_url = request.url.remove_query_params("skip").include_query_params(cursor=next_cursor)
+    response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+def encode_cursor(issue: Issue, sort: str) -> str:
+    """Opaque continuation token: the (sort key, issue_id) of the last row served."""
+    return _encode_token([sort, getattr(issue, sort).isoformat(), issue.issue_id])
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[datetime, int]:
+    cursor_sort, value, issue_id = _decode_token(cursor)
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail=f"Cursor was issued for sort={cursor_sort}")
+    try:
+        return datetime.fromisoformat(value), int(issue_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Bulk endpoints: one transaction per request, one multi-row statement
+# (INSERT / UPDATE ... FROM (VALUES ...) / DELETE ... RETURNING) per chunk
+BULK_CHUNK_SIZE = 500
+BULK_MAX_ITEMS = 50_000
+
+def _chunks(items: list, size: int = BULK_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield start, items[start:start + size]
+
+def _check_bulk_size(items: list) -> None:
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ITEMS} items per bulk request")
+
+def _bulk_result(results: List[BulkItemResult]) -> BulkResult:
+    failed = sum(1 for result in results if result.status == "not_found")
+    return BulkResult(succeeded=len(results) - failed, failed=failed, results=results)
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_issues(issues: List[IssueCreate], db: AsyncSession = Depends(get_db)):
+    """
+    Create many issues in one (retried, see database.run_write) transaction.
+
+    Each chunk is a single multi-row INSERT ... RETURNING, so 10,000 issues
+    cost 20 statements instead of 10,000 INSERT + COMMIT + SELECT round trips.
+    """
+    _check_bulk_size(issues)
+    rows = [issue.model_dump() for issue in issues]
+
+    async def create_all(session: AsyncSession) -> List[BulkItemResult]:
+        results = []
+        for start, chunk in _chunks(rows):
+            created = (await session.scalars(
+                insert(Issue).returning(Issue, sort_by_parameter_order=True), chunk
+            )).all()
+            results.extend(
+                BulkItemResult(index=start + offset, status="created", issue_id=row.issue_id, issue=row)
+                for offset, row in enumerate(created)
+            )
+        return results
+
+    results = await run_write(db, create_all, "bulk_create_issues")
+    await cache.issues_written(result.issue for result in results)
+    return _bulk_result(results)
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_issues(updates: List[IssueBulkUpdate], db: AsyncSession = Depends(get_db)):
+    """
+    Update many issues in one transaction; unknown issue_ids come back as not_found.
+
+    Each chunk is one UPDATE ... FROM (VALUES ...) RETURNING. Fields left
+    out (null) keep their current value, as in PUT /{issue_id}.
+    """
+    _check_bulk_size(updates)
+    ids = [update_item.issue_id for update_item in updates]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=422, detail="Each issue_id may appear only once per bulk update")
+
+    fields = list(IssueUpdate.model_fields)
+
+    async def update_all(session: AsyncSession) -> List[BulkItemResult]:
+        updated = {}
+        for _, chunk in _chunks(updates):
+            rows = values(
+                column("issue_id", Integer), *(column(name, String) for name in fields), name="bulk_update"
+            ).data([(item.issue_id, *(getattr(item, name) for name in fields)) for item in chunk])
+            statement = (
+                update(Issue)
+                .where(Issue.issue_id == rows.c.issue_id)
+                .values({
+                    # Cast: CockroachDB can't infer a type for an all-NULL VALUES column
+                    name: func.coalesce(cast(rows.c[name], String), getattr(Issue, name)) for name in fields
+                })
+                .returning(Issue)
+                .execution_options(synchronize_session=False)
+            )
+            updated.update((row.issue_id, IssueSchema.model_validate(row)) for row in await session.scalars(statement))
+        return [
+            BulkItemResult(index=index, status="updated", issue_id=issue_id, issue=updated[issue_id])
+            if issue_id in updated else BulkItemResult(index=index, status="not_found", issue_id=issue_id)
+            for index, issue_id in enumerate(ids)
+        ]
+
+    results = await run_write(db, update_all, "bulk_update_issues")
+    await cache.issues_written(result.issue for result in results if result.issue is not None)
+    return _bulk_result(results)
+
+@router.post("/bulk/delete", response_model=BulkResult)
+async def bulk_delete_issues(request: IssueBulkDelete, db: AsyncSession = Depends(get_db)):
+    """Delete many issues in one transaction (one DELETE ... RETURNING per chunk)."""
+    _check_bulk_size(request.issue_ids)
+
+    async def delete_all(session: AsyncSession) -> set:
+        deleted = set()
+        for _, chunk in _chunks(request.issue_ids):
+            deleted.update(await session.scalars(
+                delete(Issue).where(Issue.issue_id.in_(chunk)).returning(Issue.issue_id)
+            ))
+        return deleted
+
+    deleted = await run_write(db, delete_all, "bulk_delete_issues")
+    await cache.issues_deleted(deleted)
+    return _bulk_result([
+        BulkItemResult(index=index, status="deleted" if issue_id in deleted else "not_found", issue_id=issue_id)
+        for index, issue_id in enumerate(request.issue_ids)
+    ])
 
 @router.get("/", response_model=List[IssueSchema])
-def list_issues(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(Issue).offset(skip).limit(limit).all()
+async def list_issues(
+    request: Request,
+    response: Response,
+    repo_id: Optional[int] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    creator_id: Optional[str] = None,
+    assignee_id: Optional[str] = None,
+    sort: Literal["created_at", "updated_at"] = "created_at",
+    order: Literal["desc", "asc"] = "desc",
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset paging; scans every skipped row, use cursor"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    List issues, filtered and sorted server-side, with keyset pagination.
+
+    Filters are equality matches. The common views are single index scans
+    (see the indexes on models.Issue): repo_id + status [+ priority] sorted
+    by created_at, repo_id + status sorted by updated_at, and assignee_id or
+    creator_id + status sorted by created_at.
+
+    Each page starts after the cursor's key, so page N costs the same as
+    page 1. The next page's cursor comes back in the X-Next-Cursor and Link
+    headers (absent on the last page); the body stays a plain list.
+
+    Send Cache-Control: max-stale to accept a follower read (data a few
+    seconds old, served by the nearest replica). Pages are cached (see
+    cache.py) unless skip is used: an offset page shifts without any of
+    its own rows changing.
+    """
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either cursor or skip, not both")
+
+    query = select(Issue)
+    filters = {
+        "repo_id": repo_id, "status": status, "priority": priority,
+        "creator_id": creator_id, "assignee_id": assignee_id,
+    }
+    for name, value in filters.items():
+        if value is not None:
+            query = query.where(getattr(Issue, name) == value)
+
+    cache_key = issue_list_key({
+        **filters, "sort": sort, "order": order, "cursor": cursor, "limit": limit
+    })
+    if not skip and cache_readable(request.headers.get("cache-control")):
+        cached = await cache.get(cache_key, "list_issues")
+        if cached is not None:
+            if cached["next_cursor"]:
+                _set_next_page(request, response, cached["next_cursor"])
+            return cached["issues"]
+    deps = None
+    if not skip and not db.info.get("follower_read"):
+        deps = await cache.tokens([EPOCH_KEY, issue_list_tag(filters)])
+
+    sort_key = tuple_(SORT_COLUMNS[sort], Issue.issue_id)
+    if order == "desc":
+        query = query.order_by(SORT_COLUMNS[sort].desc(), Issue.issue_id.desc())
+    else:
+        query = query.order_by(SORT_COLUMNS[sort].asc(), Issue.issue_id.asc())
+    if cursor:
+        after = tuple_(*decode_cursor(cursor, sort))
+        query = query.where(sort_key < after if order == "desc" else sort_key > after)
+    elif skip:
+        query = query.offset(skip)
+
+    # One extra row tells us whether there is a next page
+    issues = (await db.scalars(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(issues) > limit:
+        issues = issues[:limit]
+        next_cursor = encode_cursor(issues[-1], sort)
+        _set_next_page(request, response, next_cursor)
+    if deps is not None:
+        page = {
+            "issues": [IssueSchema.model_validate(issue).model_dump(mode="json") for issue in issues],
+            "next_cursor": next_cursor,
+        }
+        versions = {issue_version_key(issue.issue_id): issue_version(issue.updated_at) for issue in issues}
+        await cache.put(cache_key, page, deps, versions)
+    return issues
+
+# Relevance tiers: where the query matched. Within a tier, issues whose
+# title is closer to the query (trigram similarity, 0..1) rank first.
+SEARCH_WEIGHTS = {"title": 2.0, "description": 1.0, "comment": 0.5}
+
+def _contains_pattern(q: str) -> str:
+    """ILIKE pattern matching q literally (backslash is the default LIKE escape)."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _weight(source: str):
+    # Typed explicitly: CockroachDB won't add an untyped (DECIMAL) constant to similarity()'s FLOAT
+    return cast(literal(SEARCH_WEIGHTS[source]), Float)
+
+@router.get("/search", response_model=List[IssueSearchResult])
+async def search_issues(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=3, max_length=200, description="Substring to find in titles, descriptions and comments"),
+    repo_id: Optional[int] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Ranked, case-insensitive substring search over issues and their comments.
+
+    Each source (title, description, comment content) is matched by its own
+    ILIKE branch, which CockroachDB serves from that column's trigram
+    inverted index (hence the 3-character minimum), so only matching rows
+    are ever read. Rank = sum of the matched sources' weights + title
+    similarity; pages continue after the cursor's (rank, issue_id).
+    """
+    pattern = _contains_pattern(q)
+    hits = union_all(
+        select(Issue.issue_id.label("issue_id"), _weight("title").label("weight"))
+        .where(Issue.title.ilike(pattern)),
+        select(Issue.issue_id, _weight("description"))
+        .where(Issue.description.ilike(pattern)),
+        select(Comment.issue_id, _weight("comment"))
+        .where(Comment.content.ilike(pattern)).distinct(),
+    ).subquery()
+    scores = (
+        select(hits.c.issue_id, func.sum(hits.c.weight).label("weight"))
+        .group_by(hits.c.issue_id)
+        .subquery()
+    )
+    rank = scores.c.weight + func.similarity(Issue.title, q)
+
+    query = select(Issue, rank.label("rank")).join(scores, scores.c.issue_id == Issue.issue_id)
+    if repo_id is not None:
+        query = query.where(Issue.repo_id == repo_id)
+    if status is not None:
+        query = query.where(Issue.status == status)
+    if cursor:
+        kind, after_rank, after_id = _decode_token(cursor)
+        if kind != "rank" or not isinstance(after_rank, (int, float)) or not isinstance(after_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(tuple_(rank, Issue.issue_id) < tuple_(cast(literal(after_rank), Float), after_id))
+
+    rows = (await db.execute(query.order_by(rank.desc(), Issue.issue_id.desc()).limit(limit + 1))).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, last_rank = rows[-1]
+        _set_next_page(request, response, _encode_token(["rank", last_rank, last.issue_id]))
+    return [
+        IssueSearchResult.model_validate(issue).model_copy(update={"rank": issue_rank})
+        for issue, issue_rank in rows
+    ]
 
 @router.get("/{issue_id}", response_model=IssueSchema)
-def get_issue(issue_id: int, db: Session = Depends(get_db)):
-    issue = db.query(Issue).filter(Issue.issue_id == issue_id).first()
+async def get_issue(issue_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    if cache_readable(request.headers.get("cache-control")):
+        cached = await cache.get(issue_key(issue_id), "get_issue")
+        if cached is not None:
+            return cached
+    issue = await db.get(Issue, issue_id)
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
+    if not db.info.get("follower_read"):
+        value = IssueSchema.model_validate(issue).model_dump(mode="json")
+        versions = {issue_version_key(issue_id): issue_version(issue.updated_at)}
+        await cache.put(issue_key(issue_id), value, {}, versions)
     return issue
 
 @router.put("/{issue_id}", response_model=IssueSchema)
-def update_issue(issue_id: int, update_data: IssueUpdate, db: Session = Depends(get_db)):
-    issue = db.query(Issue).filter(Issue.issue_id == issue_id).first()
+async def update_issue(issue_id: int, update_data: IssueUpdate, db: AsyncSession = Depends(get_db)):
+    # Update fields if provided
+    changes = update_data.model_dump(exclude_none=True)
+    if changes:
+        statement = update(Issue).where(Issue.issue_id == issue_id).values(**changes).returning(*ISSUE_COLUMNS)
+        issue = (await execute_write(db, statement, "update_issue")).first()
+        if issue:
+            await cache.issues_written([issue])
+    else:
+        issue = (await db.execute(select(*ISSUE_COLUMNS).where(Issue.issue_id == issue_id))).first()
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
-    
-    # Update fields if provided
-    if update_data.title is not None:
-        issue.title = update_data.title
-    if update_data.description is not None:
-        issue.description = update_data.description
-    if update_data.status is not None:
-        issue.status = update_data.status
-    if update_data.priority is not None:
-        issue.priority = update_data.priority
-        
-    db.commit()
-    db.refresh(issue)
     return issue
 
 @router.delete("/{issue_id}")
-def delete_issue(issue_id: int, db: Session = Depends(get_db)):
-    issue = db.query(Issue).filter(Issue.issue_id == issue_id).first()
-    if not issue:
+async def delete_issue(issue_id: int, db: AsyncSession = Depends(get_db)):
+    statement = delete(Issue).where(Issue.issue_id == issue_id).returning(Issue.issue_id)
+    deleted = (await execute_write(db, statement, "delete_issue")).first()
+    if not deleted:
         raise HTTPException(status_code=404, detail="Issue not found")
-    
-    db.delete(issue)
-    db.commit()
+    await cache.issues_deleted([issue_id])
     return {"status": "deleted"}
@@ -0,0 +1,44 @@
+"""
+Schema setup, run once per deployment rather than by every app process.
+
+    cd backend && python schema.py
+
+create_all only creates missing tables, so indexes added to an existing
+table (see models.Issue) are created here. On a large table each CREATE
+INDEX is a backfill that takes minutes, and replicas starting together
+would race to create the same index, so the app lifespan does not do it
+unless DB_CREATE_INDEXES_ON_STARTUP is set.
+"""
+
+import asyncio
+import logging
+
+import models
+from database import engine, env_bool
+
+logger = logging.getLogger(__name__)
+
+# Create missing tables when the app starts (cheap; off when schema.py runs as a release step)
+DB_CREATE_SCHEMA_ON_STARTUP = env_bool("DB_CREATE_SCHEMA_ON_STARTUP", True)
+# Also create missing indexes on existing tables at startup (small/dev databases only)
+DB_CREATE_INDEXES_ON_STARTUP = env_bool("DB_CREATE_INDEXES_ON_STARTUP", False)
+
+def create_schema(conn, indexes: bool = True) -> None:
+    """Create missing tables and, if indexes, missing indexes on existing tables."""
+    models.Base.metadata.create_all(bind=conn)
+    if not indexes:
+        return
+    # create_all skips existing tables, so add indexes introduced since separately
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+async def main() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(create_schema)
+    await engine.dispose()
+    logger.info("✅ Schema and indexes are up to date")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -45,3 +45,23 @@ class Issue(IssueBase):
     
     class Config:
         from_attributes = True
+
+class IssueSearchResult(Issue):
+    rank: float = 0.0
+
+class IssueBulkUpdate(IssueUpdate):
+    issue_id: int
+
+class IssueBulkDelete(BaseModel):
+    issue_ids: List[int]
+
+class BulkItemResult(BaseModel):
+    index: int  # Position in the request array
+    status: str  # created | updated | deleted | not_found
+    issue_id: Optional[int] = None
+    issue: Optional[Issue] = None
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
@@ -0,0 +1,109 @@
+"""
+Tests for the read-through query cache in cache.py.
+
+Uses the in-process backend; entries, tokens and invalidations are
+exercised directly, without a database.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import cache as cache_module
+from cache import (
+    EPOCH_KEY, MemoryBackend, QueryCache, cache_readable, issue_list_tag, issue_tags, issue_version,
+    issue_version_key,
+)
+
+UPDATED_AT = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def make_issue(issue_id=1, updated_at=UPDATED_AT, **values):
+    fields = {"repo_id": 1, "status": "open", "priority": None, "creator_id": None, "assignee_id": None}
+    return SimpleNamespace(issue_id=issue_id, updated_at=updated_at, **{**fields, **values})
+
+
+@pytest.fixture
+def cache():
+    return QueryCache(MemoryBackend(max_entries=100), ttl=60)
+
+
+async def fill_list(cache, key, filters, issues):
+    deps = await cache.tokens([EPOCH_KEY, issue_list_tag(filters)])
+    versions = {issue_version_key(issue.issue_id): issue_version(issue.updated_at) for issue in issues}
+    await cache.put(key, [issue.issue_id for issue in issues], deps, versions)
+
+
+async def test_memory_backend_evicts_least_recently_used_and_expired(monkeypatch):
+    backend = MemoryBackend(max_entries=2)
+    await backend.set_many({"a": 1, "b": 2}, ttl=60)
+    await backend.get_many(["a"])
+    await backend.set_many({"c": 3}, ttl=60)
+    assert await backend.get_many(["a", "b", "c"]) == [1, None, 3]
+
+    now = cache_module.time.monotonic()
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now + 61)
+    assert await backend.get_many(["a", "c"]) == [None, None]
+
+
+async def test_list_entry_invalidated_by_member_update_and_matching_create(cache):
+    await fill_list(cache, "open", {"repo_id": 1, "status": "open"}, [make_issue(1), make_issue(2)])
+    await fill_list(cache, "repo2", {"repo_id": 2}, [make_issue(3, repo_id=2)])
+    assert await cache.get("open", "test") == [1, 2]
+
+    # Closing issue 2 changes its version: the open list that showed it is stale
+    await cache.issues_written([make_issue(2, updated_at=UPDATED_AT + timedelta(seconds=1), status="closed")])
+    assert await cache.get("open", "test") is None
+    assert await cache.get("repo2", "test") == [3]
+
+    # A new issue goes stale only the lists whose filters it matches
+    await fill_list(cache, "open", {"repo_id": 1, "status": "open"}, [make_issue(1)])
+    await cache.issues_written([make_issue(4, repo_id=2)])
+    assert await cache.get("open", "test") == [1]
+    assert await cache.get("repo2", "test") is None
+
+
+async def test_fill_racing_a_write_stores_nothing(cache):
+    deps = await cache.tokens([EPOCH_KEY, issue_list_tag({})])
+    # The write commits and invalidates after the filler read its rows
+    await cache.issues_written([make_issue(1, updated_at=UPDATED_AT + timedelta(seconds=1))])
+    await cache.put("all", [1], deps, {issue_version_key(1): issue_version(UPDATED_AT)})
+    assert await cache.get("all", "test") is None
+
+
+async def test_large_bulk_write_falls_back_to_epoch(cache, monkeypatch):
+    monkeypatch.setattr(cache_module, "MAX_TAG_BUMPS", 4)
+    await fill_list(cache, "repo7", {"repo_id": 7}, [make_issue(1, repo_id=7)])
+    await cache.issues_written([make_issue(100 + n, repo_id=n, creator_id=f"user{n}") for n in range(3)])
+    assert await cache.get("repo7", "test") is None
+
+
+async def test_backend_errors_fall_back_to_the_database():
+    class BrokenBackend:
+        async def get_many(self, keys):
+            raise ConnectionError("cache down")
+
+        add_many = set_many = get_many
+
+    cache = QueryCache(BrokenBackend(), ttl=60)
+    assert await cache.get("key", "test") is None
+    assert await cache.tokens(["tag"]) is None
+    await cache.issues_written([make_issue()])
+
+
+def test_issue_tags_cover_every_filter_subset():
+    tags = issue_tags(make_issue(creator_id="alice"))
+    assert len(tags) == 8
+    assert issue_list_tag({}) in tags
+    assert issue_list_tag({"repo_id": 1, "status": "open", "creator_id": "alice"}) in tags
+
+
+@pytest.mark.parametrize("header, readable", [
+    (None, True),
+    ("max-stale", True),
+    ("no-cache", False),
+    ("max-age=0, no-store", False),
+])
+def test_cache_readable(header, readable):
+    assert cache_readable(header) is readable
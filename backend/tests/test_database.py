@@ -0,0 +1,227 @@
+"""
+Tests for the async engine and session dependency, the CockroachDB
+transaction retry helpers, the instrumented connection pool, node routing
+and follower-read opt-in in database.py, and startup schema setup.
+
+Runs on in-memory SQLite (aiosqlite); serialization failures (SQLSTATE
+40001) are injected by the callback / statement under test.
+"""
+
+from types import SimpleNamespace
+
+import psycopg
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+import database
+import main
+from database import (
+    FOLLOWER_READS, POOL_TIMEOUTS, TRANSACTION_RETRIES, InstrumentedPool, NodeRouter,
+    allows_follower_read, async_database_url, execute_write, get_db, get_read_db, run_write,
+)
+
+
+def serialization_failure():
+    return OperationalError("UPDATE ...", {}, psycopg.errors.SerializationFailure("restart transaction"))
+
+
+@pytest.fixture
+async def session(monkeypatch):
+    monkeypatch.setattr(database, "DB_MAX_BACKOFF", 0.0)
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE counters (id INTEGER PRIMARY KEY, value INTEGER)"))
+        await conn.execute(text("INSERT INTO counters VALUES (1, 0)"))
+    async with async_sessionmaker(engine)() as db:
+        yield db
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("url, driver", [
+    ("cockroachdb://root@localhost:26257/defaultdb", "cockroachdb+psycopg"),
+    ("cockroachdb+psycopg2://root@localhost:26257/defaultdb", "cockroachdb+psycopg"),
+    ("postgresql://user@localhost/db", "postgresql+psycopg"),
+    ("sqlite:///gitforge.db", "sqlite+aiosqlite"),
+    ("cockroachdb+asyncpg://root@localhost:26257/defaultdb", "cockroachdb+asyncpg"),
+])
+def test_async_database_url_picks_an_async_driver(url, driver):
+    async_url = async_database_url(url)
+    assert async_url.drivername == driver
+    assert async_url.database == url.rsplit("/", 1)[1]
+
+
+def test_engine_and_sessions_are_async():
+    assert isinstance(database.engine, AsyncEngine)
+    assert database.engine.dialect.is_async
+    session = database.SessionLocal()
+    assert isinstance(session, AsyncSession)
+    # Rows returned by a route stay readable after its commit
+    assert session.sync_session.expire_on_commit is False
+
+
+async def test_get_db_yields_one_session_and_closes_it(monkeypatch, tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'sessions.db'}")
+    monkeypatch.setattr(database, "SessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+
+    dependency = get_db()
+    db = await anext(dependency)
+    assert (await db.execute(text("SELECT 1"))).scalar() == 1
+    assert db.in_transaction()
+    with pytest.raises(StopAsyncIteration):
+        await anext(dependency)
+    # Closing the session rolled back and returned its connection
+    assert not db.in_transaction()
+    assert engine.sync_engine.pool.checkedout() == 0
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("schema_on_startup, indexes_on_startup, calls", [
+    (True, False, [False]),
+    (True, True, [True]),
+    (False, True, []),
+])
+async def test_lifespan_only_creates_indexes_when_enabled(monkeypatch, schema_on_startup, indexes_on_startup, calls):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    created = []
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(main, "DB_POOL_LIVENESS_INTERVAL", 0)
+    monkeypatch.setattr(main, "DB_CREATE_SCHEMA_ON_STARTUP", schema_on_startup)
+    monkeypatch.setattr(main, "DB_CREATE_INDEXES_ON_STARTUP", indexes_on_startup)
+    monkeypatch.setattr(main, "create_schema", lambda conn, indexes: created.append(indexes))
+
+    async with main.lifespan(main.app):
+        pass
+    assert created == calls
+
+
+def retry_count(operation):
+    return TRANSACTION_RETRIES.labels(operation)._value.get()
+
+
+async def test_run_write_retries_serialization_failures(session):
+    attempts = []
+
+    async def increment(db):
+        await db.execute(text("UPDATE counters SET value = value + 1 WHERE id = 1"))
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise serialization_failure()
+        return (await db.execute(text("SELECT value FROM counters"))).scalar()
+
+    before = retry_count("test_increment")
+    # Failed attempts roll back to the savepoint, so only the last increment sticks
+    assert await run_write(session, increment, "test_increment") == 1
+    assert len(attempts) == 3
+    assert retry_count("test_increment") - before == 2
+
+
+async def test_run_write_gives_up_after_max_retries(session, monkeypatch):
+    monkeypatch.setattr(database, "DB_MAX_RETRIES", 2)
+    attempts = []
+
+    async def always_conflicts(db):
+        attempts.append(1)
+        raise serialization_failure()
+
+    with pytest.raises(OperationalError):
+        await run_write(session, always_conflicts, "test_conflict")
+    assert len(attempts) == 3
+
+
+async def test_execute_write_retries_implicit_transactions(session):
+    failures = [serialization_failure()]
+
+    @event.listens_for(session.get_bind(), "before_cursor_execute")
+    def conflict_once(*args):
+        if failures:
+            raise failures.pop()
+
+    before = retry_count("test_update")
+    statement = text("UPDATE counters SET value = 5 WHERE id = 1 RETURNING value")
+    result = await execute_write(session, statement, "test_update")
+    assert result.scalar() == 5
+    assert retry_count("test_update") - before == 1
+
+
+async def test_pool_counts_checkout_timeouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedPool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    before = POOL_TIMEOUTS._value.get()
+    async with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            async with engine.connect():
+                pass
+    assert POOL_TIMEOUTS._value.get() - before == 1
+    await engine.dispose()
+
+
+def test_node_router_rotates_and_skips_down_nodes():
+    router = NodeRouter(["a:26257", "b:26257", "c:26257"], cooldown=60)
+    assert router.candidates() == ["a:26257", "b:26257", "c:26257"]
+    assert router.candidates() == ["b:26257", "c:26257", "a:26257"]
+
+    router.mark_down("c:26257")
+    # Down nodes are still tried, but only after every healthy one
+    assert router.candidates() == ["a:26257", "b:26257", "c:26257"]
+    assert router.candidates() == ["a:26257", "b:26257", "c:26257"]
+
+    router.mark_up("c:26257")
+    assert router.candidates() == ["b:26257", "c:26257", "a:26257"]
+
+
+@pytest.mark.parametrize("header, allowed", [
+    (None, False),
+    ("no-cache", False),
+    ("max-stale", True),
+    ("no-transform, max-stale=10", True),
+    ('max-stale="30"', True),
+    ("max-stale=1", False),
+    ("max-stale=soon", False),
+])
+def test_allows_follower_read(header, allowed):
+    assert allows_follower_read(header) is allowed
+
+
+async def test_follower_read_is_set_when_the_session_first_begins(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    monkeypatch.setattr(database, "SessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+    monkeypatch.setattr(database, "engine", SimpleNamespace(dialect=SimpleNamespace(name="cockroachdb")))
+    # SQLite has no AS OF SYSTEM TIME: stand in a statement it can run
+    monkeypatch.setattr(database, "FOLLOWER_READ_STATEMENT", "SELECT 'follower read'")
+    before = FOLLOWER_READS._value.get()
+
+    dependency = get_read_db(SimpleNamespace(headers={"cache-control": "max-stale"}))
+    db = await anext(dependency)
+    # Nothing is sent until the route actually queries (e.g. on a cache miss)
+    assert db.info["follower_read"] is True
+    assert statements == []
+    assert FOLLOWER_READS._value.get() == before
+
+    await db.execute(text("SELECT 1"))
+    await db.execute(text("SELECT 2"))
+    assert statements == ["SELECT 'follower read'", "SELECT 1", "SELECT 2"]
+    assert FOLLOWER_READS._value.get() - before == 1
+    await dependency.aclose()
+    await engine.dispose()
+
+
+async def test_read_db_without_max_stale_is_a_normal_session(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda conn, cursor, sql, *args: statements.append(sql))
+    monkeypatch.setattr(database, "SessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+    monkeypatch.setattr(database, "engine", SimpleNamespace(dialect=SimpleNamespace(name="cockroachdb")))
+
+    dependency = get_read_db(SimpleNamespace(headers={}))
+    db = await anext(dependency)
+    await db.execute(text("SELECT 1"))
+    assert "follower_read" not in db.info
+    assert statements == ["SELECT 1"]
+    await dependency.aclose()
+    await engine.dispose()
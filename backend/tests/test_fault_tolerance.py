@@ -0,0 +1,680 @@
+import asyncio
+import os
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from fault_tolerance import (
+    BaselineStrategy,
+    CheckpointingStrategy,
+    ReplicationStrategy,
+    HybridStrategy,
+    FaultSchedule,
+    FaultScheduler,
+    FaultToleranceManager,
+    OperationGenerator,
+    ExperimentJobQueue,
+    ParallelExperimentExecutor,
+    SyntheticWorkload,
+    create_storage_backend,
+    get_job_queue,
+    get_manager,
+    get_workload_profile,
+    shutdown_job_queue
+)
+from fault_tolerance.metrics import LatencyHistogram, LatencyRecorder
+from fault_tolerance.cost_model import calibrate_device
+from routers import fault_tolerance as fault_tolerance_router
+
+
+@pytest.fixture(params=["memory", "sqlite", "mmap"])
+def storage_config(request, tmp_path):
+    """Strategy config selecting each storage backend in an isolated dir."""
+    return {
+        "storage_backend": request.param,
+        "storage_dir": str(tmp_path / "storage"),
+        "storage_batch_size": 10
+    }
+
+
+def test_storage_backend_roundtrip(storage_config):
+    """Every backend supports the basic key/value operations."""
+    store = create_storage_backend(storage_config, "roundtrip")
+    store.put_many((f"key_{i}", {"value": i}) for i in range(25))
+    store["extra"] = {"value": "x"}
+
+    assert len(store) == 26
+    assert store.get("key_7") == {"value": 7}
+    assert "extra" in store
+    assert store.delete("extra")
+    assert store.get("extra") is None
+    assert store.snapshot()["key_24"] == {"value": 24}
+
+    store.load({"only": {"value": 1}})
+    assert store.keys() == ["only"]
+    store.close()
+
+
+def test_storage_backend_crash_semantics(storage_config):
+    """Volatile backends lose everything; persistent ones keep committed data."""
+    store = create_storage_backend(storage_config, "crash")
+    store.put_many((f"key_{i}", {"value": i}) for i in range(20))
+    store.flush()
+
+    store.simulate_crash()
+    store.recover()
+
+    expected = 20 if store.persistent else 0
+    assert len(store) == expected
+    store.close()
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "mmap"])
+def test_crashed_persistent_backend_reads_as_empty(backend, tmp_path):
+    store = create_storage_backend({"storage_backend": backend, "storage_dir": str(tmp_path)}, "down")
+    store.put_many((f"key_{i}", {"value": i}) for i in range(5))
+    store.flush()
+    store.simulate_crash()
+
+    assert len(store) == 0
+    assert store.keys() == []
+    assert store.items() == []
+    assert store.get("key_1", "missing") == "missing"
+    assert "key_1" not in store
+    with pytest.raises(RuntimeError):
+        store.put("key_9", {"value": 9})
+
+    store.recover()
+    assert store.get("key_1") == {"value": 1}
+    store.close()
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "mmap"])
+def test_failed_strategy_with_persistent_backend_reports_no_data(backend, tmp_path):
+    config = {"storage_backend": backend, "storage_dir": str(tmp_path), "checkpoint_interval": 3600}
+    with CheckpointingStrategy(config) as strategy:
+        strategy.store("repo_1", {"id": 1})
+        strategy.simulate_failure()
+
+        assert strategy.get_data_count() == 0
+        assert list(strategy.export_items()) == []
+
+
+def test_unknown_storage_backend():
+    with pytest.raises(ValueError):
+        create_storage_backend({"storage_backend": "tape"}, "bad")
+
+
+def test_baseline_with_persistent_storage_survives_failure(tmp_path):
+    """Baseline over SQLite keeps committed writes across a simulated crash."""
+    strategy = BaselineStrategy({
+        "storage_backend": "sqlite",
+        "storage_dir": str(tmp_path),
+        "storage_batch_size": 1
+    })
+    strategy.store("issue_1", {"title": "crash"})
+    strategy.simulate_failure()
+    strategy.recover()
+
+    assert strategy.retrieve("issue_1") == {"title": "crash"}
+
+
+def test_checkpointing_recovers_from_checkpoint(tmp_path):
+    strategy = CheckpointingStrategy({
+        "checkpoint_dir": str(tmp_path / "checkpoints"),
+        "checkpoint_interval": 3600
+    })
+    for i in range(10):
+        strategy.store(f"issue_{i}", {"id": i})
+    assert strategy.force_checkpoint()
+
+    strategy.simulate_failure()
+    strategy.recover()
+
+    assert strategy.get_checkpoint_info()["data_count"] in (0, 10)  # 2% simulated corruption
+
+
+def test_replication_survives_single_node_failure(storage_config):
+    strategy = ReplicationStrategy({**storage_config, "replication_factor": 3})
+    strategy.store("repo_1", {"name": "alpha"})
+    strategy.simulate_failure(node_count=1)
+
+    assert strategy.retrieve("repo_1") == {"name": "alpha"}
+    strategy.recover()
+    assert strategy.get_cluster_status()["healthy_nodes"] == 3
+
+
+def test_set_strategy_migrates_live_data():
+    manager = FaultToleranceManager('baseline')
+    for i in range(50):
+        manager.store(f"issue_{i}", {"id": i})
+
+    manager.set_strategy('replication', {'replication_factor': 3}, migrate=True, batch_size=7)
+    manager.store("issue_0", {"id": "rewritten"})
+    assert manager.retrieve("issue_49") == {"id": 49}  # served from either strategy
+
+    assert manager.wait_for_migration(timeout=5)
+    status = manager.get_migration_status()
+    assert status['migrated'] + status['skipped'] == 50
+    assert manager.strategy.get_data_count() == 50
+    assert manager.retrieve("issue_0") == {"id": "rewritten"}
+    manager.close()
+
+
+
+def test_client_writes_wait_for_one_migrated_item_not_a_batch(monkeypatch):
+    manager = FaultToleranceManager('baseline')
+    for i in range(50):
+        manager.store(f"issue_{i}", {"id": i})
+
+    create_strategy = manager._create_strategy
+
+    def slow_strategy(name, config):
+        strategy = create_strategy(name, config)
+        strategy.inject_latency(0.02)
+        return strategy
+
+    monkeypatch.setattr(manager, "_create_strategy", slow_strategy)
+    # One batch of 50 stores takes ~1s on the slow target
+    manager.set_strategy('baseline', migrate=True, batch_size=1000)
+    time.sleep(0.1)
+    started = time.perf_counter()
+    manager.store("issue_49", {"id": "rewritten"})
+    assert time.perf_counter() - started < 0.5
+
+    assert manager.wait_for_migration(timeout=5)
+    assert manager.get_migration_status()['skipped'] == 1
+    assert manager.retrieve("issue_49") == {"id": "rewritten"}
+    manager.close()
+
+def test_strategy_close_stops_thread_and_removes_private_dir():
+    with CheckpointingStrategy({"checkpoint_interval": 3600}) as strategy:
+        checkpoint_dir = strategy.checkpoint_dir
+        thread = strategy._checkpoint_thread
+        assert os.path.isdir(checkpoint_dir)
+        assert thread.is_alive()
+
+    assert strategy.closed
+    assert not thread.is_alive()
+    assert not os.path.exists(checkpoint_dir)
+
+
+def test_strategy_instances_get_isolated_checkpoint_dirs():
+    first = HybridStrategy({"checkpoint_interval": 3600})
+    second = HybridStrategy({"checkpoint_interval": 3600})
+    try:
+        assert first.checkpoint_dir != second.checkpoint_dir
+    finally:
+        first.close()
+        second.close()
+
+
+def test_get_manager_force_new_closes_previous_instance():
+    previous = get_manager('checkpointing', {"checkpoint_interval": 3600}, force_new=True)
+    current = get_manager('baseline', force_new=True)
+
+    assert current is not previous
+    assert previous.strategy.closed
+    current.close()
+
+
+@pytest.mark.asyncio
+async def test_arecover_does_not_block_event_loop():
+    """Other coroutines keep running while a recovery awaits simulated latency."""
+    strategy = ReplicationStrategy({"replication_factor": 3})
+    for i in range(20):
+        await strategy.astore(f"repo_{i}", {"id": i})
+    strategy.simulate_failure(node_count=1)
+
+    ticks = 0
+
+    async def probe():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    prober = asyncio.create_task(probe())
+    recovery_time = await strategy.arecover()
+    prober.cancel()
+
+    assert recovery_time > 0.1  # discovery + transfer latency
+    assert ticks >= 10
+    assert await strategy.aretrieve("repo_3") == {"id": 3}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_experiment_requests_use_private_managers():
+    """Overlapping /run-experiment calls neither close each other nor the global manager."""
+    app = FastAPI()
+    app.include_router(fault_tolerance_router.router)
+    global_manager = get_manager('baseline', force_new=True)
+    experiments = [
+        {"strategy": "checkpointing", "data_items": 300, "checkpoint_interval": 3600,
+         "trigger_checkpoint": True, "storage_backend": "sqlite"},
+        {"strategy": "replication", "data_items": 300, "replication_factor": 3, "storage_backend": "sqlite"},
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*(
+            client.post("/api/fault-tolerance/run-experiment", json=experiment) for experiment in experiments
+        ))
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert [response.json()["data_recovery_rate_percent"] for response in responses] == [100.0, 100.0]
+    assert get_manager() is global_manager
+    assert not global_manager.strategy.closed
+    global_manager.close()
+
+
+
+async def test_job_request_queues_workload_experiments(monkeypatch):
+    monkeypatch.setenv("FT_JOB_EXECUTOR", "thread")
+    shutdown_job_queue()
+    app = FastAPI()
+    app.include_router(fault_tolerance_router.router)
+    job = {
+        "strategy": "replication", "data_items": 50, "workload": "ycsb-b", "clients": 2,
+        "fault_schedule": "at 0.2s kill node-2; at 0.4s heal all", "post_recovery": 0.2, "seed": 1
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/fault-tolerance/jobs", json=job)
+        invalid = [
+            await client.post("/api/fault-tolerance/jobs", json={**job, "workload": "ycsb-z"}),
+            await client.post("/api/fault-tolerance/jobs", json={**job, "fault_schedule": "at soon explode"}),
+            await client.post("/api/fault-tolerance/jobs", json={"strategy": "baseline", "clients": 2}),
+        ]
+
+    assert response.status_code == 202
+    assert [reply.status_code for reply in invalid] == [422, 422, 422]
+    queue = get_job_queue()
+    result = (await asyncio.to_thread(queue.wait, response.json()["job_ids"][0], 30)).result
+    shutdown_job_queue()
+    # A workload run, not the classic store/fail/recover experiment
+    assert [event["action"] for event in result["fault_events"]] == ["kill", "heal"]
+    assert "data_recovery_rate_percent" not in result
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("node_id", [None, "node-2"])
+async def test_injected_latency_does_not_block_event_loop(node_id):
+    strategy = ReplicationStrategy({"replication_factor": 3})
+    await strategy.astore("repo_1", {"id": 1})
+    strategy.inject_latency(0.2, node_id)
+
+    ticks = 0
+
+    async def probe():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    prober = asyncio.create_task(probe())
+    await strategy.astore("repo_2", {"id": 2})
+    assert await strategy.aretrieve("repo_1") == {"id": 1}
+    prober.cancel()
+    strategy.close()
+
+    assert ticks >= 10
+
+
+def test_job_queue_runs_experiments_on_private_managers():
+    queue = ExperimentJobQueue(max_workers=2, use_processes=False)
+    job_ids = [
+        queue.submit({"strategy": "baseline", "data_items": 20}),
+        queue.submit({"strategy": "replication", "data_items": 20, "replication_factor": 3})
+    ]
+
+    jobs = [queue.wait(job_id, timeout=10) for job_id in job_ids]
+    queue.shutdown()
+
+    assert [job.status for job in jobs] == ["completed", "completed"]
+    assert jobs[1].result["data_recovery_rate_percent"] == 100.0
+    assert jobs[0].progress == 1.0
+
+    with pytest.raises(ValueError):
+        queue.submit({"strategy": "unknown"})
+
+
+def test_job_queue_defaults_to_worker_processes(monkeypatch):
+    monkeypatch.delenv("FT_JOB_EXECUTOR", raising=False)
+    monkeypatch.delenv("FT_JOB_WORKERS", raising=False)
+    queue = ExperimentJobQueue()
+    assert queue.use_processes
+    queue.shutdown()
+
+    # In-process runs share the GIL, so they run one at a time by default
+    monkeypatch.setenv("FT_JOB_EXECUTOR", "thread")
+    queue = ExperimentJobQueue()
+    assert not queue.use_processes
+    assert queue.max_workers == 1
+    queue.shutdown()
+
+
+
+def test_shutdown_job_queue_cancels_queued_jobs(monkeypatch):
+    shutdown_job_queue()  # no queue yet: nothing to do
+    monkeypatch.setenv("FT_JOB_EXECUTOR", "thread")
+    queue = get_job_queue()
+    job_ids = [queue.submit({"strategy": "baseline", "data_items": 200}) for _ in range(3)]
+
+    shutdown_job_queue(wait=True)
+
+    statuses = [queue.get(job_id).status for job_id in job_ids]
+    assert statuses[0] == "completed"
+    assert statuses[1:] == ["cancelled", "cancelled"]
+    assert get_job_queue() is not queue
+    shutdown_job_queue()
+
+def test_parallel_executor_isolates_runs_in_worker_processes():
+    configs = [
+        {"strategy": "checkpointing", "checkpoint_interval": 3600, "trigger_checkpoint": True},
+        {"strategy": "replication", "replication_factor": 3}
+    ]
+    with ParallelExperimentExecutor(max_workers=2) as executor:
+        records = executor.run_matrix(configs, runs_per_config=2, data_items=20)
+
+    assert len(records) == 4
+    assert all("error" not in record for record in records)
+    assert all(record["result"]["worker_pid"] != os.getpid() for record in records)
+
+
+def test_synthetic_workload_is_seeded_and_chunked():
+    workload = SyntheticWorkload(25, seed=7, chunk_size=10)
+    records = list(workload)
+
+    assert [len(chunk) for chunk in workload.chunks()] == [10, 10, 5]
+    assert [key for key, _ in records] == list(workload.keys())
+    assert [value["status" if value["type"] == "issue" else "language"] for _, value in records] == [
+        value["status" if value["type"] == "issue" else "language"]
+        for _, value in SyntheticWorkload(25, seed=7, chunk_size=10)
+    ]
+
+    with FaultToleranceManager("replication", {"replication_factor": 3}) as manager:
+        results = manager.run_experiment(data_items=25, seed=7)
+    assert results["workload_seed"] == 7
+    assert results["data_recovery_rate_percent"] == 100.0
+
+
+def test_workload_profiles_and_key_distributions():
+    assert get_workload_profile("ycsb-f").read_modify_write_proportion == 0.5
+    hot = get_workload_profile({"preset": "ycsb-c", "request_distribution": "hotspot"})
+    assert hot.read_proportion == 1.0
+    with pytest.raises(ValueError):
+        get_workload_profile("ycsb-z")
+    with pytest.raises(ValueError):
+        get_workload_profile({"request_distribution": "gaussian"})
+
+    stream = OperationGenerator(hot, record_count=1000, seed=1).operations(client_id=0)
+    keys = [next(stream)[1] for _ in range(5000)]
+    hot_share = sum(key < 200 for key in keys) / len(keys)
+    assert 0.75 < hot_share < 0.9  # 80% of operations on the hottest 20% of keys
+
+
+def test_workload_experiment_measures_each_failure_phase():
+    with FaultToleranceManager("replication", {"replication_factor": 3}) as manager:
+        results = manager.run_workload_experiment(
+            "ycsb-b",
+            record_count=50,
+            clients=2,
+            failure_at=0.2,
+            downtime=0.1,
+            post_recovery=0.2,
+            failure_kwargs={"node_count": 1},
+            target_throughput=1000,
+            seed=11
+        )
+
+    assert results["workload_seed"] == 11
+    assert set(results["phases"]) == {"before", "during", "after"}
+    for phase in results["phases"].values():
+        assert phase["operations"] > 0
+        assert phase["errors"] == 0  # a single replica failure is survivable
+        assert phase["latency_ms"]["p99"] >= phase["latency_ms"]["p50"]
+    assert results["recovered_at_seconds"] > results["failure_at_seconds"]
+
+
+def test_latency_histogram_percentiles_within_bucket_precision():
+    histogram = LatencyHistogram()
+    for value_ns in range(1, 100_001):
+        histogram.record(value_ns * 1000)  # 1us .. 100ms, uniform
+
+    for percent in (50, 99, 99.9):
+        expected = percent / 100 * 100_000 * 1000
+        assert abs(histogram.percentile(percent) - expected) / expected < 0.02
+    assert histogram.summary()["max_ms"] == 100.0
+
+
+
+def test_latency_summaries_tolerate_new_keys_from_other_threads():
+    recorder = LatencyRecorder("test")
+    for i in range(200):
+        recorder.record("store", 1000, f"node-{i}")
+
+    def add_keys():
+        for i in range(2000):
+            recorder.record(f"op-{i}", 1000, f"node-{i % 7}")
+
+    writer = threading.Thread(target=add_keys)
+    writer.start()
+    while writer.is_alive():
+        recorder.summary()
+        recorder.replica_summary()
+        recorder.reset()
+    writer.join()
+
+def test_strategy_stats_expose_operation_and_replica_latency():
+    with ReplicationStrategy({"replication_factor": 3}) as strategy:
+        for i in range(20):
+            strategy.store(f"issue_{i}", {"id": i})
+            strategy.retrieve(f"issue_{i}")
+        strategy.simulate_failure(node_count=1)
+        recovery_time = strategy.recover()
+        stats = strategy.get_stats()
+
+    assert stats["latency"]["store"]["count"] == 20
+    assert stats["latency"]["retrieve"]["p99_ms"] >= stats["latency"]["retrieve"]["p50_ms"]
+    assert stats["latency"]["recover"]["count"] == 1
+    assert stats["last_recovery_time"] == recovery_time
+    assert set(stats["replica_latency"]) == {"node-1", "node-2", "node-3"}
+    assert sum(node["store"]["count"] for node in stats["replica_latency"].values()) == 60
+
+
+def test_checkpoint_recovery_trace_breaks_down_phases(tmp_path):
+    config = {"checkpoint_interval": 3600, "checkpoint_dir": str(tmp_path), "checkpoint_corruption_rate": 0}
+    with CheckpointingStrategy(config) as strategy:
+        for i in range(10):
+            strategy.store(f"issue_{i}", {"id": i})
+        strategy.force_checkpoint()
+        strategy.simulate_failure()
+        recovery_time = strategy.recover()
+        trace = strategy.get_recovery_trace()
+
+    phases = {phase["name"]: phase for phase in trace["phases"]}
+    assert [phase["name"] for phase in trace["phases"]] == [
+        "detect", "reopen_storage", "locate_checkpoint", "read", "decode",
+        "restore", "transfer", "wal_replay", "first_read"
+    ]
+    assert trace["outcome"] == "checkpoint_restored"
+    assert trace["recovery_time_seconds"] == recovery_time
+    assert phases["read"]["bytes"] > 0
+    assert phases["decode"]["records"] == 10
+    assert phases["first_read"]["records"] == 1
+    assert phases["transfer"]["simulated_seconds"] > 0
+    assert trace["total_seconds"] >= sum(phase["duration_seconds"] for phase in trace["phases"])
+
+
+
+def test_first_read_retrieves_last_stored_key_without_scanning(tmp_path, monkeypatch):
+    config = {"checkpoint_interval": 3600, "checkpoint_dir": str(tmp_path), "checkpoint_corruption_rate": 0}
+    with CheckpointingStrategy(config) as strategy:
+        for i in range(10):
+            strategy.store(f"issue_{i}", {"id": i})
+        strategy.force_checkpoint()
+        strategy.simulate_failure()
+
+        def scan():
+            raise AssertionError("first_read must not export the keyspace")
+
+        monkeypatch.setattr(strategy, "export_items", scan)
+        strategy.recover()
+        phases = {phase["name"]: phase for phase in strategy.get_recovery_trace()["phases"]}
+
+    assert phases["first_read"]["details"]["key"] == "issue_9"
+    assert phases["first_read"]["records"] == 1
+
+DISK_PROFILE = {
+    "disk_read_bandwidth": 100e6, "disk_write_bandwidth": 50e6, "disk_latency_p50": 0.001,
+    "disk_latency_p99": 0.004, "disk_iops": 1000.0, "fsync_latency": 0.002,
+    "record_apply_seconds": 1e-5,
+}
+
+
+@pytest.mark.parametrize("cost_model", ["real", "modeled"])
+def test_recovery_latency_comes_from_cost_model(tmp_path, cost_model):
+    config = {
+        "checkpoint_interval": 3600, "checkpoint_dir": str(tmp_path), "checkpoint_corruption_rate": 0,
+        "cost_model": cost_model, "cost_model_profile": DISK_PROFILE
+    }
+    with CheckpointingStrategy(config) as strategy:
+        for i in range(100):
+            strategy.store(f"issue_{i}", {"id": i})
+        strategy.force_checkpoint()
+        strategy.simulate_failure()
+        recovery_time = strategy.recover()
+        trace = strategy.get_recovery_trace()
+        stats = strategy.get_stats()
+
+    phases = {phase["name"]: phase for phase in trace["phases"]}
+    assert stats["cost_model"]["name"] == cost_model
+    assert trace["outcome"] == "checkpoint_restored"
+    assert phases["wal_replay"]["details"]["modeled_seconds"] == pytest.approx(
+        0.0 if cost_model == "real" else 100 * DISK_PROFILE["record_apply_seconds"]
+    )
+    # Legacy constants alone would add at least 0.9s (lookup + transfer + replay)
+    assert recovery_time < 0.5
+
+
+
+@pytest.mark.parametrize("cost_model, minimum, maximum", [("legacy", 0.1, 0.35), ("real", 0.0, 0.05)])
+def test_recover_when_healthy_charges_the_checkpoint_lookup(tmp_path, cost_model, minimum, maximum):
+    config = {"checkpoint_interval": 3600, "checkpoint_dir": str(tmp_path), "cost_model": cost_model}
+    with CheckpointingStrategy(config) as strategy:
+        recovery_time = strategy.recover()
+        trace = strategy.get_recovery_trace()
+
+    assert trace["outcome"] == "not_failed"
+    assert minimum <= recovery_time < maximum
+    assert [phase["name"] for phase in trace["phases"]] == ["detect", "locate_checkpoint", "first_read"]
+
+def test_modeled_recovery_replaces_measured_checkpoint_io(tmp_path):
+    # Zero lookup latency: the read costs exactly bytes / bandwidth
+    profile = {**DISK_PROFILE, "disk_read_bandwidth": 50e3, "disk_latency_p50": 0.0, "record_apply_seconds": 1e-3}
+    config = {
+        "checkpoint_interval": 3600, "checkpoint_dir": str(tmp_path), "checkpoint_corruption_rate": 0,
+        "cost_model": "modeled", "cost_model_profile": profile
+    }
+    with CheckpointingStrategy(config) as strategy:
+        for i in range(100):
+            strategy.store(f"issue_{i}", {"id": i})
+        strategy.force_checkpoint()
+        strategy.simulate_failure()
+        recovery_time = strategy.recover()
+        phases = {phase["name"]: phase for phase in strategy.get_recovery_trace()["phases"]}
+
+    modeled_read = phases["transfer"]["details"]["modeled_seconds"]
+    modeled_replay = phases["wal_replay"]["details"]["modeled_seconds"]
+    measured_read = phases["read"]["duration_seconds"]
+    measured_restore = phases["decode"]["duration_seconds"] + phases["restore"]["duration_seconds"]
+    assert modeled_read == pytest.approx(phases["read"]["bytes"] / profile["disk_read_bandwidth"])
+    assert modeled_replay == pytest.approx(0.1)
+    # Only the modeled time not already spent on the real I/O is simulated
+    assert measured_read + phases["transfer"]["simulated_seconds"] == pytest.approx(modeled_read)
+    assert measured_restore + phases["wal_replay"]["simulated_seconds"] == pytest.approx(modeled_replay)
+    assert recovery_time >= modeled_read + modeled_replay
+
+
+def test_calibrate_device_measures_local_disk(tmp_path):
+    profile = calibrate_device(str(tmp_path), file_size=1024 * 1024, random_reads=16, fsyncs=2)
+
+    assert profile.disk_read_bandwidth > 0 and profile.disk_write_bandwidth > 0
+    assert 0 < profile.disk_latency_p50 <= profile.disk_latency_p99
+    assert profile.fsync_latency > 0 and profile.record_apply_seconds > 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_same_seed_reproduces_fault_outcomes():
+    def run(seed):
+        config = {"replication_factor": 5, "cascading_failure_rate": 0.5}
+        with FaultToleranceManager("replication", config) as manager:
+            result = manager.run_experiment(data_items=20, seed=seed)
+            trace = result["recovery_trace"]
+        detect = trace["phases"][0]
+        return (
+            result["seed"], trace["outcome"], detect["details"]["failed_nodes"],
+            detect["simulated_seconds"], result["stats"]["faults"]["injected"]
+        )
+
+    assert run(1234) == run(1234)
+    assert len({run(seed)[2][0] for seed in range(10)}) > 1  # node choice follows the seed
+    assert run(None)[0] is not None  # generated seeds are recorded
+
+
+def test_fault_schedule_dsl_parses_events():
+    schedule = FaultSchedule.parse(
+        "at 3.5s latency node-3 200ms; at 2s kill node-2\n"
+        "at 5000ms corrupt_checkpoint; t=6s kill failure_type=total; at 8s heal all"
+    )
+
+    assert [(e.at, e.action, e.target) for e in schedule.events] == [
+        (2.0, "kill", "node-2"), (3.5, "latency", "node-3"), (5.0, "corrupt_checkpoint", None),
+        (6.0, "kill", None), (8.0, "heal", None)
+    ]
+    assert schedule.events[1].params == {"delay": 0.2}
+    assert schedule.events[3].params == {"failure_type": "total"}
+    assert FaultSchedule.parse([{"at": 1, "action": "latency", "delay": "50ms"}]).events[0].params == {"delay": 0.05}
+    with pytest.raises(ValueError):
+        FaultSchedule.parse("at 1s explode node-1")
+    with pytest.raises(ValueError):
+        FaultSchedule.parse("at 1s latency node-1")
+
+
+def test_workload_runs_fault_schedule_against_replicas():
+    schedule = (
+        "at 0.3s kill node-1; at 0.5s latency node-2 20ms; at 0.7s kill node-3; "
+        "at 0.9s kill node-2; at 1.1s heal all"
+    )
+    config = {"replication_factor": 3, "cost_model": "real"}
+    with FaultToleranceManager("replication", config) as manager:
+        result = manager.run_workload_experiment(
+            "ycsb-b", record_count=200, clients=2, post_recovery=0.3, fault_schedule=schedule, seed=3
+        )
+        status = manager.strategy.get_cluster_status()
+
+    assert [event["action"] for event in result["fault_events"]] == ["kill", "latency", "kill", "kill", "heal"]
+    assert all(event["ok"] for event in result["fault_events"])
+    assert result["recovery_time_seconds"] == result["fault_events"][-1]["recovery_time"]
+    assert status["healthy_nodes"] == 3
+    intervals = {interval["event"]: interval for interval in result["intervals"]}
+    assert intervals["0.9s kill node-2"]["errors"] == intervals["0.9s kill node-2"]["operations"] > 0
+    assert intervals["1.1s heal"]["throughput_ops_per_sec"] > intervals["0.9s kill node-2"]["throughput_ops_per_sec"]
+
+
+def test_corrupt_checkpoint_event_breaks_restore(tmp_path):
+    config = {"checkpoint_interval": 3600, "checkpoint_dir": str(tmp_path), "checkpoint_corruption_rate": 0}
+    with CheckpointingStrategy(config) as strategy:
+        strategy.store("issue_1", {"id": 1})
+        strategy.force_checkpoint()
+        scheduler = FaultScheduler(strategy, FaultSchedule.parse("at 0s corrupt_checkpoint; at 0s kill; at 0s recover"))
+        scheduler.start()
+        scheduler.join()
+        trace = strategy.get_recovery_trace()
+
+    assert [event["ok"] for event in scheduler.executed] == [True, True, True]
+    assert trace["outcome"] == "checkpoint_unreadable"
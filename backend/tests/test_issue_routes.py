@@ -0,0 +1,495 @@
+"""
+Tests for the issue routes (list paging and filters, search, single and bulk writes).
+
+Each test gets a fresh in-memory SQLite database behind get_db and
+get_read_db, with a Python similarity() standing in for pg_trgm. The
+query cache is switched off so every request reaches the database, except
+for the cache invalidation tests (cached_client), which give it a fresh
+in-process backend.
+"""
+
+from datetime import datetime, timedelta
+import difflib
+import uuid
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from cache import MemoryBackend, cache
+from database import get_db, get_read_db
+from models import Issue
+from schemas import Issue as IssueSchema
+from routers import comments, issues
+
+CREATED_AT = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def similarity(a, b):
+    return difflib.SequenceMatcher(None, (a or "").lower(), b.lower()).ratio()
+
+
+@pytest.fixture
+async def sessions(monkeypatch):
+    monkeypatch.setattr(cache, "enabled", False)
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def register_similarity(dbapi_connection, _):
+        dbapi_connection.create_function("similarity", 2, similarity)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Issue.__table__.create)
+        await conn.execute(text(
+            "CREATE TABLE issue_comments (comment_id CHAR(32) PRIMARY KEY, issue_id INTEGER, "
+            "author_id CHAR(32), content TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        ))
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(sessions):
+    app = FastAPI()
+    app.include_router(issues.router)
+    app.include_router(comments.router)
+
+    async def override_get_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def cached_client(client, monkeypatch):
+    monkeypatch.setattr(cache, "backend", MemoryBackend(max_entries=1000))
+    monkeypatch.setattr(cache, "enabled", True)
+    return client
+
+
+async def seed(sessions, *rows):
+    """Insert issues with explicit timestamps (SQLite's now() only has 1s resolution)."""
+    async with sessions() as db:
+        for row in rows:
+            row.setdefault("created_at", CREATED_AT)
+            row.setdefault("updated_at", row["created_at"])
+            db.add(Issue(**{"title": f"Issue {row['issue_id']}", "status": "open", **row}))
+        await db.commit()
+
+
+async def walk_pages(client, **params):
+    """Follow X-Next-Cursor to the last page; returns issue ids in served order."""
+    issue_ids, cursor = [], None
+    while True:
+        response = await client.get("/api/issues/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        issue_ids += [issue["issue_id"] for issue in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            assert "link" not in response.headers
+            return issue_ids
+        assert f"cursor={cursor}" in response.headers["link"]
+
+
+async def test_cursor_pages_round_trip_every_issue_once(client, sessions):
+    await seed(sessions, *({"issue_id": i, "created_at": CREATED_AT + timedelta(minutes=i)} for i in range(1, 8)))
+
+    assert await walk_pages(client, limit=3) == [7, 6, 5, 4, 3, 2, 1]
+    assert await walk_pages(client, limit=7) == [7, 6, 5, 4, 3, 2, 1]
+
+
+@pytest.mark.parametrize("order, expected", [("desc", [5, 4, 3, 2, 1]), ("asc", [1, 2, 3, 4, 5])])
+async def test_cursor_breaks_sort_ties_on_issue_id(client, sessions, order, expected):
+    await seed(sessions, *({"issue_id": i} for i in range(1, 6)))
+
+    assert await walk_pages(client, order=order, limit=2) == expected
+
+
+@pytest.mark.parametrize("sort", ["created_at", "updated_at"])
+@pytest.mark.parametrize("order", ["desc", "asc"])
+async def test_cursor_follows_sort_and_order(client, sessions, sort, order):
+    # created_at rises with issue_id while updated_at falls
+    await seed(sessions, *(
+        {"issue_id": i, "created_at": CREATED_AT + timedelta(minutes=i), "updated_at": CREATED_AT - timedelta(minutes=i)}
+        for i in range(1, 6)
+    ))
+
+    ascending = [1, 2, 3, 4, 5] if sort == "created_at" else [5, 4, 3, 2, 1]
+    expected = ascending if order == "asc" else ascending[::-1]
+    assert await walk_pages(client, sort=sort, order=order, limit=2) == expected
+
+
+async def test_tampered_or_mismatched_cursor_is_rejected(client, sessions):
+    await seed(sessions, *({"issue_id": i, "created_at": CREATED_AT + timedelta(minutes=i)} for i in range(1, 4)))
+    cursor = (await client.get("/api/issues/", params={"limit": 1})).headers["x-next-cursor"]
+
+    for params in (
+        {"cursor": "not a cursor!"},
+        {"cursor": issues._encode_token({"sort": "created_at"})},
+        {"cursor": issues._encode_token(["created_at", "yesterday", 1])},
+        {"cursor": issues._encode_token(["created_at", CREATED_AT.isoformat(), "one"])},
+        {"cursor": cursor[:-2]},
+        {"cursor": cursor, "sort": "updated_at"},
+        {"cursor": cursor, "skip": 1},
+    ):
+        response = await client.get("/api/issues/", params=params)
+        assert response.status_code == 400, params
+
+
+FILTER_ROWS = [
+    {"issue_id": 1, "repo_id": 1, "status": "open", "priority": "high", "creator_id": "alice", "assignee_id": "bob"},
+    {"issue_id": 2, "repo_id": 1, "status": "closed", "priority": "high", "creator_id": "bob", "assignee_id": "bob"},
+    {"issue_id": 3, "repo_id": 1, "status": "open", "priority": "low", "creator_id": "alice", "assignee_id": None},
+    {"issue_id": 4, "repo_id": 2, "status": "open", "priority": "high", "creator_id": "carol", "assignee_id": "bob"},
+    {"issue_id": 5, "repo_id": 2, "status": "closed", "priority": "low", "creator_id": "alice", "assignee_id": "alice"},
+]
+
+
+@pytest.mark.parametrize("params, expected", [
+    ({}, [5, 4, 3, 2, 1]),
+    ({"repo_id": 1}, [3, 2, 1]),
+    ({"status": "closed"}, [5, 2]),
+    ({"priority": "low"}, [5, 3]),
+    ({"creator_id": "alice"}, [5, 3, 1]),
+    ({"assignee_id": "bob"}, [4, 2, 1]),
+    ({"repo_id": 1, "status": "open"}, [3, 1]),
+    ({"repo_id": 1, "status": "open", "priority": "high"}, [1]),
+    ({"assignee_id": "bob", "status": "open"}, [4, 1]),
+    ({"creator_id": "alice", "status": "closed", "repo_id": 2}, [5]),
+    ({"repo_id": 2, "creator_id": "bob"}, []),
+    ({"repo_id": 3}, []),
+])
+async def test_list_filters_combine_as_equality_matches(client, sessions, params, expected):
+    await seed(sessions, *({**row, "created_at": CREATED_AT + timedelta(minutes=row["issue_id"])} for row in FILTER_ROWS))
+
+    response = await client.get("/api/issues/", params=params)
+    assert response.status_code == 200
+    assert [issue["issue_id"] for issue in response.json()] == expected
+
+
+async def test_filters_apply_across_cursor_pages(client, sessions):
+    await seed(sessions, *({**row, "created_at": CREATED_AT + timedelta(minutes=row["issue_id"])} for row in FILTER_ROWS))
+
+    assert await walk_pages(client, assignee_id="bob", order="asc", limit=1) == [1, 2, 4]
+    assert await walk_pages(client, repo_id=2, sort="updated_at", limit=1) == [5, 4]
+
+
+@pytest.mark.parametrize("params", [{"repo_id": "one"}, {"sort": "title"}, {"order": "up"}, {"limit": 0}])
+async def test_invalid_filter_values_are_rejected(client, params):
+    response = await client.get("/api/issues/", params=params)
+    assert response.status_code == 422
+
+
+async def seed_comments(sessions, *comments):
+    async with sessions() as db:
+        for issue_id, content in comments:
+            await db.execute(
+                text("INSERT INTO issue_comments (comment_id, issue_id, content) VALUES (:comment_id, :issue_id, :content)"),
+                {"comment_id": uuid.uuid4().hex, "issue_id": issue_id, "content": content}
+            )
+        await db.commit()
+
+
+async def seed_search(sessions):
+    await seed(
+        sessions,
+        {"issue_id": 1, "title": "Crash on login", "description": "App crashes after login"},
+        {"issue_id": 2, "title": "Slow dashboard", "description": "Dashboard crashes sometimes"},
+        {"issue_id": 3, "title": "Broken avatars", "description": "Images do not load"},
+        {"issue_id": 4, "title": "Crash in settings", "description": "Nothing else to add"},
+        {"issue_id": 5, "title": "Dark mode", "description": "Please add a dark theme"},
+    )
+    await seed_comments(
+        sessions,
+        (1, "Same crash here"), (1, "Another crash report"),
+        (3, "Caused a crash for me"), (3, "crash again"), (3, "CRASH on reload"),
+        (5, "Unrelated comment"),
+    )
+
+
+async def test_search_ranks_by_where_the_query_matched(client, sessions):
+    await seed_search(sessions)
+
+    response = await client.get("/api/issues/search", params={"q": "CRASH"})
+    assert response.status_code == 200
+    results = response.json()
+    # title + description + comment, title, description, comment
+    assert [issue["issue_id"] for issue in results] == [1, 4, 2, 3]
+    ranks = {issue["issue_id"]: issue["rank"] for issue in results}
+    titles = {1: "Crash on login", 2: "Slow dashboard", 3: "Broken avatars", 4: "Crash in settings"}
+    weights = {1: 3.5, 2: 1.0, 3: 0.5, 4: 2.0}
+    for issue_id, weight in weights.items():
+        assert ranks[issue_id] == pytest.approx(weight + similarity(titles[issue_id], "CRASH"))
+
+
+async def test_search_returns_each_issue_once_across_sources(client, sessions):
+    await seed_search(sessions)
+
+    # Issue 1 matches in three sources and two comments; issue 3 in three comments
+    response = await client.get("/api/issues/search", params={"q": "crash"})
+    issue_ids = [issue["issue_id"] for issue in response.json()]
+    assert sorted(issue_ids) == [1, 2, 3, 4]
+
+    paged, cursor = [], None
+    while True:
+        params = {"q": "crash", "limit": 1, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/issues/search", params=params)
+        paged += [issue["issue_id"] for issue in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert paged == issue_ids
+
+
+async def test_search_applies_repo_and_status_filters(client, sessions):
+    await seed_search(sessions)
+    await seed(sessions, {"issue_id": 6, "title": "Crash report upload", "status": "closed", "repo_id": 2})
+
+    async def search(**params):
+        response = await client.get("/api/issues/search", params=params)
+        assert response.status_code == 200
+        return [issue["issue_id"] for issue in response.json()]
+
+    assert await search(q="crash", repo_id=2) == [6]
+    assert await search(q="crash", status="closed") == [6]
+    assert await search(q="crash", repo_id=2, status="open") == []
+
+
+@pytest.mark.parametrize("params, status_code", [
+    ({"q": "ab"}, 422),
+    ({"q": "crash", "limit": 0}, 422),
+    ({"q": "crash", "cursor": "not a cursor!"}, 400),
+    ({"q": "crash", "cursor": issues._encode_token(["created_at", "x", 1])}, 400),
+])
+async def test_invalid_search_requests_are_rejected(client, params, status_code):
+    response = await client.get("/api/issues/search", params=params)
+    assert response.status_code == status_code
+
+
+async def issue_ids_in(sessions):
+    async with sessions() as db:
+        return list(await db.scalars(select(Issue.issue_id).order_by(Issue.issue_id)))
+
+
+async def add_trigger(sessions, sql):
+    async with sessions() as db:
+        await db.execute(text(sql))
+        await db.commit()
+
+
+async def test_bulk_create_returns_each_row_in_request_order(client, sessions):
+    payload = [{"title": f"Bulk {i}", "repo_id": 1, "priority": "low"} for i in range(5)]
+
+    response = await client.post("/api/issues/bulk", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (5, 0)
+    assert [result["index"] for result in body["results"]] == [0, 1, 2, 3, 4]
+    assert [result["issue"]["title"] for result in body["results"]] == [item["title"] for item in payload]
+    assert all(result["status"] == "created" for result in body["results"])
+    assert [result["issue_id"] for result in body["results"]] == await issue_ids_in(sessions)
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/api/issues/bulk", [{"title": "ok"}, {"description": "no title"}]),
+    ("/api/issues/bulk", {"title": "not a list"}),
+    ("/api/issues/bulk", [{"title": "ok"}, "not an object"]),
+    ("/api/issues/bulk/delete", {"issue_ids": [1, "two"]}),
+    ("/api/issues/bulk/delete", [1, 2]),
+])
+async def test_bulk_rejects_invalid_items_without_writing(client, sessions, path, payload):
+    await seed(sessions, {"issue_id": 1}, {"issue_id": 2})
+
+    response = await client.post(path, json=payload)
+    assert response.status_code == 422
+    assert await issue_ids_in(sessions) == [1, 2]
+
+
+@pytest.mark.parametrize("payload", [
+    [{"title": "no issue_id"}],
+    [{"issue_id": 1, "title": "ok"}, {"issue_id": "two"}],
+])
+async def test_bulk_update_rejects_invalid_items(client, payload):
+    response = await client.patch("/api/issues/bulk", json=payload)
+    assert response.status_code == 422
+
+
+async def test_bulk_update_rejects_duplicate_issue_ids(client):
+    response = await client.patch("/api/issues/bulk", json=[{"issue_id": 1, "title": "a"}, {"issue_id": 1, "title": "b"}])
+    assert response.status_code == 422
+    assert "only once" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("method, path, payload", [
+    ("POST", "/api/issues/bulk", [{"title": f"Bulk {i}"} for i in range(4)]),
+    ("PATCH", "/api/issues/bulk", [{"issue_id": i, "status": "closed"} for i in range(4)]),
+    ("POST", "/api/issues/bulk/delete", {"issue_ids": [1, 2, 3, 4]}),
+])
+async def test_bulk_requests_over_the_size_limit_are_rejected(client, sessions, monkeypatch, method, path, payload):
+    monkeypatch.setattr(issues, "BULK_MAX_ITEMS", 3)
+    await seed(sessions, *({"issue_id": i} for i in range(1, 5)))
+
+    response = await client.request(method, path, json=payload)
+    assert response.status_code == 413
+    assert await issue_ids_in(sessions) == [1, 2, 3, 4]
+
+
+async def test_bulk_delete_reports_missing_ids(client, sessions):
+    await seed(sessions, {"issue_id": 1}, {"issue_id": 2})
+
+    response = await client.post("/api/issues/bulk/delete", json={"issue_ids": [2, 7, 1]})
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert [result["status"] for result in body["results"]] == ["deleted", "not_found", "deleted"]
+    assert await issue_ids_in(sessions) == []
+
+
+async def test_bulk_create_is_atomic_when_a_row_fails(client, sessions, monkeypatch):
+    # One row per chunk: the failing row's chunk runs after earlier chunks were inserted
+    monkeypatch.setattr(issues, "BULK_CHUNK_SIZE", 1)
+    await add_trigger(sessions, (
+        "CREATE TRIGGER reject_boom BEFORE INSERT ON issues_v2 WHEN NEW.title = 'boom' "
+        "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+    ))
+
+    with pytest.raises(IntegrityError):
+        await client.post("/api/issues/bulk", json=[{"title": "one"}, {"title": "two"}, {"title": "boom"}])
+    assert await issue_ids_in(sessions) == []
+
+
+async def test_bulk_delete_is_atomic_when_a_row_fails(client, sessions, monkeypatch):
+    monkeypatch.setattr(issues, "BULK_CHUNK_SIZE", 1)
+    await seed(sessions, *({"issue_id": i} for i in range(1, 4)))
+    await add_trigger(sessions, (
+        "CREATE TRIGGER keep_three BEFORE DELETE ON issues_v2 WHEN OLD.issue_id = 3 "
+        "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+    ))
+
+    with pytest.raises(IntegrityError):
+        await client.post("/api/issues/bulk/delete", json={"issue_ids": [1, 2, 3]})
+    assert await issue_ids_in(sessions) == [1, 2, 3]
+
+
+async def stored_issue(sessions, issue_id):
+    async with sessions() as db:
+        issue = await db.get(Issue, issue_id)
+        return None if issue is None else IssueSchema.model_validate(issue).model_dump(mode="json")
+
+
+async def test_create_returns_the_inserted_row(client, sessions):
+    response = await client.post("/api/issues/", json={"title": "New", "repo_id": 3, "assignee_id": "bob"})
+    assert response.status_code == 200
+    body = response.json()
+    # Server defaults (status, timestamps) come back from RETURNING
+    assert body["status"] == "open" and body["priority"] == "medium"
+    assert body == await stored_issue(sessions, body["issue_id"])
+
+
+async def test_update_returns_the_updated_row(client, sessions):
+    await seed(sessions, {"issue_id": 1, "description": "keep me"})
+
+    response = await client.put("/api/issues/1", json={"title": "Renamed", "status": "closed"})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["title"], body["status"], body["description"]) == ("Renamed", "closed", "keep me")
+    assert body == await stored_issue(sessions, 1)
+
+    # An empty update changes nothing and returns the current row
+    response = await client.put("/api/issues/1", json={})
+    assert response.json() == body
+
+
+async def test_delete_removes_the_row(client, sessions):
+    await seed(sessions, {"issue_id": 1}, {"issue_id": 2})
+
+    response = await client.delete("/api/issues/1")
+    assert response.status_code == 200
+    assert response.json() == {"status": "deleted"}
+    assert await issue_ids_in(sessions) == [2]
+
+
+@pytest.mark.parametrize("method, json", [("GET", None), ("PUT", {"title": "x"}), ("PUT", {}), ("DELETE", None)])
+async def test_missing_issue_is_404(client, sessions, method, json):
+    await seed(sessions, {"issue_id": 1})
+
+    response = await client.request(method, "/api/issues/99", json=json)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Issue not found"
+    assert await issue_ids_in(sessions) == [1]
+
+
+
+async def write_behind_the_cache(sessions, sql, **params):
+    """Change rows without going through a route: cached responses don't see it."""
+    async with sessions() as db:
+        await db.execute(text(sql), params)
+        await db.commit()
+
+
+async def test_update_invalidates_cached_issue(cached_client, sessions):
+    await seed(sessions, {"issue_id": 1, "title": "Original"})
+    assert (await cached_client.get("/api/issues/1")).json()["title"] == "Original"
+
+    await write_behind_the_cache(sessions, "UPDATE issues_v2 SET title = 'Unseen' WHERE issue_id = 1")
+    assert (await cached_client.get("/api/issues/1")).json()["title"] == "Original"
+
+    updated = (await cached_client.put("/api/issues/1", json={"title": "Renamed", "status": "closed"})).json()
+    response = await cached_client.get("/api/issues/1")
+    assert response.json() == updated
+    assert (response.json()["title"], response.json()["status"]) == ("Renamed", "closed")
+
+
+async def test_create_invalidates_cached_lists_it_matches(cached_client, sessions):
+    await seed(sessions, {"issue_id": 1, "repo_id": 1}, {"issue_id": 2, "repo_id": 2})
+    params = {"repo_id": 1, "status": "open"}
+    assert [issue["issue_id"] for issue in (await cached_client.get("/api/issues/", params=params)).json()] == [1]
+
+    await write_behind_the_cache(sessions, "UPDATE issues_v2 SET repo_id = 1 WHERE issue_id = 2")
+    assert [issue["issue_id"] for issue in (await cached_client.get("/api/issues/", params=params)).json()] == [1]
+
+    created = (await cached_client.post("/api/issues/", json={"title": "New", "repo_id": 1})).json()
+    issue_ids = [issue["issue_id"] for issue in (await cached_client.get("/api/issues/", params=params)).json()]
+    assert created["issue_id"] in issue_ids
+    assert sorted(issue_ids) == sorted([1, 2, created["issue_id"]])
+
+
+async def test_delete_invalidates_cached_issue(cached_client, sessions):
+    await seed(sessions, {"issue_id": 1})
+    assert (await cached_client.get("/api/issues/1")).status_code == 200
+    assert (await cached_client.get("/api/issues/1")).status_code == 200
+
+    assert (await cached_client.delete("/api/issues/1")).status_code == 200
+    assert (await cached_client.get("/api/issues/1")).status_code == 404
+
+
+async def test_comment_writes_invalidate_cached_comments(cached_client, sessions):
+    await seed(sessions, {"issue_id": 1}, {"issue_id": 2})
+    await seed_comments(sessions, (1, "First"))
+
+    async def comment_contents(issue_id):
+        response = await cached_client.get(f"/api/comments/issue/{issue_id}")
+        assert response.status_code == 200
+        return [comment["content"] for comment in response.json()]
+
+    assert await comment_contents(1) == ["First"]
+    assert await comment_contents(2) == []
+    await write_behind_the_cache(sessions, "UPDATE issue_comments SET content = 'Unseen'")
+    assert await comment_contents(1) == ["First"]
+
+    created = await cached_client.post("/api/comments/", json={"issue_id": 1, "content": "Second"})
+    assert created.status_code == 201
+    assert sorted(await comment_contents(1)) == ["Second", "Unseen"]
+    # Other issues' cached comments stay valid
+    await seed_comments(sessions, (2, "Behind the cache"))
+    assert await comment_contents(2) == []
+
+    assert (await cached_client.delete(f"/api/comments/{created.json()['comment_id']}")).status_code == 200
+    assert await comment_contents(1) == ["Unseen"]
@@ -38,7 +38,8 @@ export const authApi = {
 
 // Issues API
 export const issuesApi = {
-    getAll: () => api.get('/api/issues/'),
+    getAll: (params, config) => api.get('/api/issues/', { params, ...config }),
+    search: (q, params, config) => api.get('/api/issues/search', { params: { q, ...params }, ...config }),
     getById: (id) => api.get(`/api/issues/${id}`),
     create: (data) => api.post('/api/issues/', data),
     delete: (id) => api.delete(`/api/issues/${id}`),
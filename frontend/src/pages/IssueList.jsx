@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useCallback } from "react";
 import { Link } from "react-router-dom";
 import { Input } from "../components/ui/input";
 import { Button } from "../components/ui/button";
@@ -12,31 +12,41 @@ export function IssueList() {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
 
-    useEffect(() => {
-        fetchIssues();
-    }, []);
+    // Searches of 3+ characters run server-side (trigram index); debounce typing
+    const query = searchTerm.trim().length >= 3 ? searchTerm.trim() : "";
 
-    const fetchIssues = async () => {
+    // signal aborts a request superseded by newer input, so a slow stale
+    // response can never overwrite the results of a later one
+    const fetchIssues = useCallback(async (signal) => {
         try {
             setLoading(true);
-            const response = await issuesApi.getAll();
+            const params = filter === "all" ? {} : { status: filter };
+            const response = query
+                ? await issuesApi.search(query, params, { signal })
+                : await issuesApi.getAll(params, { signal });
             setIssues(response.data);
             setError(null);
         } catch (err) {
+            if (signal.aborted) return;
             setError("Failed to load issues. Please ensure the backend is running.");
             console.error("Error fetching issues:", err);
         } finally {
-            setLoading(false);
+            if (!signal.aborted) setLoading(false);
         }
-    };
+    }, [filter, query]);
+
+    useEffect(() => {
+        const controller = new AbortController();
+        const timer = setTimeout(() => fetchIssues(controller.signal), query ? 250 : 0);
+        return () => {
+            clearTimeout(timer);
+            controller.abort();
+        };
+    }, [fetchIssues, query]);
 
-    const filteredIssues = issues.filter(issue => {
-        const matchesFilter = filter === "all" || issue.status === filter;
-        const matchesSearch =
-            issue.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-            (issue.repository ? issue.repository.toLowerCase().includes(searchTerm.toLowerCase()) : false);
-        return matchesFilter && matchesSearch;
-    });
+    const filteredIssues = query ? issues : issues.filter(issue =>
+        issue.title.toLowerCase().includes(searchTerm.toLowerCase())
+    );
 
     return (
         <div className="container py-10 max-w-screen-xl">
@@ -1,3 +1,4 @@
+import argparse
 import subprocess
 import time
 import random
@@ -16,6 +17,20 @@ TOTAL_RUNS = 20
 CHAOS_MANIFEST = "infra/chaos-mesh/pod-kill-experiment.yaml"
 # Output file for analysis
 DATA_FILE = "experiment_results_checkpointing_30s.csv"
+FIELDNAMES = ["run_id", "timestamp", "chaos", "fault", "injection_delay", "recovery_time_seconds", "status"]
+# Per-endpoint columns filled in from the recovery prober (see recovery_probe.py)
+PROBE_FIELDS = ["rto_ms", "resolution_ms", "failures"]
+
+# Phase timings (warm-up, injection delay range, cooldown) per chaos backend.
+# Local runs need no pod rescheduling, so they iterate much faster.
+TIMINGS = {
+    "kubernetes": {"warmup": 5, "min_delay": 5, "max_delay": 15, "cooldown": 10},
+    "local": {"warmup": 1, "min_delay": 1, "max_delay": 3, "cooldown": 1},
+}
+
+def base_url():
+    """The system under test's base URL (SYSTEM_URL without the health path)."""
+    return SYSTEM_URL.rsplit("/api/health", 1)[0]
 
 def check_system_health():
     """Pings the system to check if it is available."""
@@ -25,21 +40,61 @@ def check_system_health():
     except requests.RequestException:
         return False
 
-def inject_fault():
-    """Applies the Chaos Mesh manifest using kubectl."""
-    print(f"[{datetime.datetime.now()}] 💥 Injecting Fault: {CHAOS_MANIFEST}...")
-    if not os.path.exists(CHAOS_MANIFEST):
-        print(f"Error: Manifest file not found at {CHAOS_MANIFEST}")
-        raise FileNotFoundError(f"{CHAOS_MANIFEST} not found")
-        
-    subprocess.run(["kubectl", "apply", "-f", CHAOS_MANIFEST], check=True)
-
-def recover_fault():
-    """Removes the Chaos Mesh manifest to allow auto-recovery."""
+class KubernetesChaos:
+    """Chaos Mesh on the cluster: kubectl apply/delete of the manifest."""
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self.fault_name = os.path.basename(manifest)
+
+    def inject(self):
+        if not os.path.exists(self.manifest):
+            print(f"Error: Manifest file not found at {self.manifest}")
+            raise FileNotFoundError(f"{self.manifest} not found")
+        subprocess.run(["kubectl", "apply", "-f", self.manifest], check=True)
+
+    def recover(self):
+        subprocess.run(["kubectl", "delete", "-f", self.manifest], check=True)
+
+    def close(self):
+        pass
+
+class LocalChaos:
+    """The same experiments on this machine (see local_chaos.py)."""
+
+    def __init__(self, fault, backend):
+        self.fault = fault
+        self.fault_name = fault.name
+        self.backend = backend
+
+    def inject(self):
+        self.backend.apply(self.fault)
+
+    def recover(self):
+        self.backend.delete(self.fault)
+
+    def close(self):
+        self.backend.stop()
+
+def inject_fault(chaos):
+    """Injects the fault (applies the Chaos Mesh manifest or its local equivalent)."""
+    print(f"[{datetime.datetime.now()}] 💥 Injecting Fault: {chaos.fault_name}...")
+    chaos.inject()
+
+def recover_fault(chaos):
+    """Removes the fault to allow auto-recovery."""
     print(f"[{datetime.datetime.now()}] 🧹 Cleaning up Fault...")
-    subprocess.run(["kubectl", "delete", "-f", CHAOS_MANIFEST], check=True)
+    chaos.recover()
+
+def wait_until_healthy(timeout=120):
+    """Blocks until the health endpoint answers 200 (e.g. after starting the local backend)."""
+    deadline = time.time() + timeout
+    while not check_system_health():
+        if time.time() > deadline:
+            raise TimeoutError(f"{SYSTEM_URL} not healthy after {timeout}s")
+        time.sleep(0.5)
 
-def run_experiment(run_id):
+def run_experiment(run_id, chaos, timings, rng, prober):
     """
     Executes a single experimental run.
     Logic follows the 'Recovery Time' variable definition.
@@ -48,67 +103,173 @@ def run_experiment(run_id):
     
     # 1. Warm-up / Stabilization Phase 
     print("System stabilizing...")
-    time.sleep(5) 
+    time.sleep(timings["warmup"]) 
 
     # 2. Determine Failure Timing (Stratified Sampling) 
     # Simulates Early (0-25%), Mid (25-75%), or Late (75-100%) execution
-    delay = random.randint(5, 15) 
+    delay = rng.randint(timings["min_delay"], timings["max_delay"]) 
     print(f"Waiting {delay}s before failure injection (simulating workload execution)...")
     time.sleep(delay)
 
-    # 3. Inject Fault
-    inject_fault()
-    start_time = time.time()
-    
-    # 4. Measure Recovery Time
-    # Poll system until it returns 200 OK
-    while True:
-        if check_system_health():
-            end_time = time.time()
-            break
-        time.sleep(0.5) # Polling interval
-    
-    recovery_time = end_time - start_time
-    print(f"✅ System Recovered! Time: {recovery_time:.2f} seconds")
+    # 3. Inject Fault and 4. Measure Recovery Time
+    # Health, read and write endpoints are probed concurrently every few ms
+    # (monotonic clock, keep-alive connections); the system has recovered
+    # once every probed endpoint answers 2xx again.
+    probe = prober.measure(lambda: inject_fault(chaos))
+    recovery_time = probe["recovery_time_seconds"]
+    if recovery_time is None:
+        recover_fault(chaos)
+        raise TimeoutError(f"system did not recover within {prober.recovery_timeout}s")
+    print(f"✅ System Recovered! Time: {recovery_time * 1000:.1f} ms")
+    for name, result in probe["probes"].items():
+        print(f"   {name}: rto={result['rto_ms']:.1f} ms, failures={result['failures']}, "
+              f"resolution={result['resolution_ms'] or 0:.1f} ms")
 
     # 5. Cleanup
-    recover_fault()
+    recover_fault(chaos)
     
     # 6. Cooldown to prevent 'History Effect' bias 
-    print("Cooling down for 10s...")
-    time.sleep(10)
+    print(f"Cooling down for {timings['cooldown']}s...")
+    time.sleep(timings["cooldown"])
 
-    return {
+    row = {
         "run_id": run_id,
         "timestamp": datetime.datetime.now().isoformat(),
+        "chaos": type(chaos).__name__,
+        "fault": chaos.fault_name,
         "injection_delay": delay,
         "recovery_time_seconds": recovery_time,
         "status": "SUCCESS"
     }
+    for name, result in probe["probes"].items():
+        for column in PROBE_FIELDS:
+            row[f"{name}_{column}"] = result[column]
+    return row
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure recovery time under injected faults")
+    parser.add_argument("--chaos", choices=["kubernetes", "local"], default="kubernetes",
+                        help="Chaos Mesh on the cluster, or the single-machine local backend")
+    parser.add_argument("--manifest", default=CHAOS_MANIFEST, help="Chaos Mesh manifest to inject")
+    parser.add_argument("--local-fault", choices=["pause", "disk-fill"], default=None,
+                        help="Local-only fault instead of --manifest (SIGSTOP the backend, fill its tmpfs)")
+    parser.add_argument("--fault-duration", type=float, default=5.0,
+                        help="Seconds until a --local-fault heals itself (default: 5)")
+    parser.add_argument("-n", "--runs", type=int, default=TOTAL_RUNS, help="Number of runs")
+    parser.add_argument("-o", "--output", default=DATA_FILE, help="Output CSV")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for injection delays")
+    parser.add_argument("--warmup", type=float, default=None, help="Seconds to stabilize before each run")
+    parser.add_argument("--min-delay", type=int, default=None, help="Minimum seconds before injection")
+    parser.add_argument("--max-delay", type=int, default=None, help="Maximum seconds before injection")
+    parser.add_argument("--cooldown", type=float, default=None, help="Seconds to cool down after each run")
+    probe = parser.add_argument_group("recovery probe")
+    probe.add_argument("--probe-interval", type=float, default=5.0,
+                       help="Milliseconds between probes of each endpoint (default: 5)")
+    probe.add_argument("--probe-timeout", type=float, default=1.0,
+                       help="Seconds before a probe counts as failed (default: 1)")
+    probe.add_argument("--probe-targets", default="health,read,write",
+                       help="Comma-separated endpoints to probe: health, read, write")
+    probe.add_argument("--recovery-timeout", type=float, default=300.0,
+                       help="Seconds to wait for recovery before failing the run")
+    local = parser.add_argument_group("local chaos")
+    local.add_argument("--port", type=int, default=8100, help="Port for the local backend")
+    local.add_argument("--db-upstream", default="127.0.0.1:26257", help="CockroachDB (stand-in) address")
+    local.add_argument("--gitea-upstream", default="127.0.0.1:3000", help="Gitea (stand-in) address")
+    local.add_argument("--data-dir", default="/dev/shm/gitforge-chaos",
+                       help="tmpfs directory for the backend's fault tolerance data")
+    local.add_argument("--restart-delay", type=float, default=1.0,
+                       help="Seconds before a killed process comes back (pod restart)")
+    return parser.parse_args()
+
+def create_chaos(args):
+    """Builds the chaos backend (and, for local chaos, starts the system under test)."""
+    global SYSTEM_URL
+
+    if args.chaos == "kubernetes":
+        if args.local_fault:
+            raise SystemExit("--local-fault requires --chaos local")
+        return KubernetesChaos(args.manifest)
+
+    from local_chaos import ChaosFault, LocalChaosBackend
+
+    if args.local_fault:
+        fault = ChaosFault.local(args.local_fault, args.fault_duration)
+    else:
+        fault = ChaosFault.from_manifest(args.manifest)
+    backend = LocalChaosBackend(
+        backend_dir=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"),
+        port=args.port,
+        db_upstream=args.db_upstream,
+        gitea_upstream=args.gitea_upstream,
+        data_dir=args.data_dir,
+        restart_delay=args.restart_delay
+    )
+    if fault.action == "disk-fill":
+        backend.disk.check()
+    SYSTEM_URL = backend.health_url
+    print(f"Starting local backend on port {args.port} (logs: {backend.backend.log_path})...")
+    backend.start()
+    chaos = LocalChaos(fault, backend)
+    try:
+        wait_until_healthy()
+    except Exception:
+        chaos.close()
+        raise
+    return chaos
+
+def create_prober(args):
+    """Builds the recovery prober for the system under test."""
+    from recovery_probe import DEFAULT_TARGETS, RecoveryProber
+
+    targets = {target.name: target for target in DEFAULT_TARGETS}
+    names = [name.strip() for name in args.probe_targets.split(",") if name.strip()]
+    unknown = [name for name in names if name not in targets]
+    if unknown or not names:
+        raise SystemExit(f"--probe-targets must be a subset of {', '.join(targets)}")
+    return RecoveryProber(
+        base_url(),
+        targets=[targets[name] for name in names],
+        interval=args.probe_interval / 1000,
+        timeout=args.probe_timeout,
+        recovery_timeout=args.recovery_timeout
+    )
 
 # --- MAIN EXECUTION LOOP ---
 if __name__ == "__main__":
-    print(f"Starting Experiment Suite: N={TOTAL_RUNS} runs ")
+    args = parse_args()
+    timings = {
+        name: getattr(args, name) if getattr(args, name) is not None else default
+        for name, default in TIMINGS[args.chaos].items()
+    }
+    rng = random.Random(args.seed)
+    chaos = create_chaos(args)
+    prober = create_prober(args)
+    fieldnames = FIELDNAMES + [f"{target.name}_{column}" for target in prober.targets for column in PROBE_FIELDS]
+
+    print(f"Starting Experiment Suite: N={args.runs} runs ({args.chaos} chaos: {chaos.fault_name})")
     
     results = []
     
     # Initialize CSV with headers
-    with open(DATA_FILE, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=["run_id", "timestamp", "injection_delay", "recovery_time_seconds", "status"])
+    with open(args.output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
 
-    for i in range(1, TOTAL_RUNS + 1):
-        try:
-            data = run_experiment(i)
-            results.append(data)
-            
-            # Append result to CSV immediately (to save data on crash)
-            with open(DATA_FILE, 'a', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=["run_id", "timestamp", "injection_delay", "recovery_time_seconds", "status"])
-                writer.writerow(data)
+    try:
+        for i in range(1, args.runs + 1):
+            try:
+                data = run_experiment(i, chaos, timings, rng, prober)
+                results.append(data)
                 
-        except Exception as e:
-            print(f"❌ Run #{i} Failed: {e}")
+                # Append result to CSV immediately (to save data on crash)
+                with open(args.output, 'a', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writerow(data)
+                    
+            except Exception as e:
+                print(f"❌ Run #{i} Failed: {e}")
+    finally:
+        chaos.close()
 
     print("\n\nExperiment Suite Completed.")
-    print(f"Data saved to {DATA_FILE} for ANOVA analysis.")
+    print(f"Data saved to {args.output} for ANOVA analysis.")
@@ -46,9 +46,50 @@ async def create_issue(client, issue_num, repository="load-test-repo"):
             "duration": 0
         }
 
-async def run_load_test(num_issues=100, concurrent=10):
-    """Run load test with specified parameters"""
-    print(f"Starting load test: {num_issues} issues, {concurrent} concurrent requests")
+async def create_issue_batch(client, first_num, count, repository="load-test-repo"):
+    """Create `count` issues with one POST /api/issues/bulk request"""
+    issues = [
+        {
+            "title": f"Load Test Issue #{issue_num}",
+            "description": f"This is a load test issue created at {datetime.now().isoformat()}",
+            "repository": repository,
+            "created_by": f"load-tester-{issue_num % 10}"
+        }
+        for issue_num in range(first_num, first_num + count)
+    ]
+
+    try:
+        start_time = time.time()
+        response = await client.post(f"{API_BASE_URL}/api/issues/bulk", json=issues)
+        end_time = time.time()
+
+        if response.status_code == 200:
+            return {
+                "success": True,
+                "issues": response.json()["succeeded"],
+                "duration": end_time - start_time
+            }
+        else:
+            return {
+                "success": False,
+                "status_code": response.status_code,
+                "issues": count,
+                "duration": end_time - start_time
+            }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "issues": count,
+            "duration": 0
+        }
+
+async def run_load_test(num_issues=100, concurrent=10, bulk=0):
+    """Run load test with specified parameters (bulk > 0: that many issues per request)"""
+    per_request = bulk or 1
+    num_requests = -(-num_issues // per_request)
+    print(f"Starting load test: {num_issues} issues, {concurrent} concurrent requests"
+          + (f", {bulk} issues per bulk request" if bulk else ""))
     print(f"Target API: {API_BASE_URL}")
     print("-" * 60)
     
@@ -57,22 +98,28 @@ async def run_load_test(num_issues=100, concurrent=10):
     
     async with httpx.AsyncClient(timeout=30.0) as client:
         # Create issues in batches
-        for batch_start in range(0, num_issues, concurrent):
-            batch_end = min(batch_start + concurrent, num_issues)
+        for batch_start in range(0, num_requests, concurrent):
+            batch_end = min(batch_start + concurrent, num_requests)
             batch_size = batch_end - batch_start
             
-            print(f"Creating issues {batch_start + 1} to {batch_end}...")
+            print(f"Creating issues {batch_start * per_request + 1} to {min(batch_end * per_request, num_issues)}...")
             
-            tasks = [
-                create_issue(client, i)
-                for i in range(batch_start, batch_end)
-            ]
+            if bulk:
+                tasks = [
+                    create_issue_batch(client, i * bulk, min(bulk, num_issues - i * bulk))
+                    for i in range(batch_start, batch_end)
+                ]
+            else:
+                tasks = [
+                    create_issue(client, i)
+                    for i in range(batch_start, batch_end)
+                ]
             
             batch_results = await asyncio.gather(*tasks)
             results.extend(batch_results)
             
             # Brief pause between batches
-            if batch_end < num_issues:
+            if batch_end < num_requests:
                 await asyncio.sleep(0.1)
     
     end_time = time.time()
@@ -81,6 +128,7 @@ async def run_load_test(num_issues=100, concurrent=10):
     # Calculate statistics
     successful = [r for r in results if r.get("success")]
     failed = [r for r in results if not r.get("success")]
+    created = sum(r.get("issues", 1) for r in successful)
     
     durations = [r["duration"] for r in successful]
     avg_duration = sum(durations) / len(durations) if durations else 0
@@ -92,11 +140,11 @@ async def run_load_test(num_issues=100, concurrent=10):
     print("LOAD TEST RESULTS")
     print("=" * 60)
     print(f"Total Issues:        {num_issues}")
-    print(f"Successful:          {len(successful)} ({len(successful)/num_issues*100:.1f}%)")
-    print(f"Failed:              {len(failed)} ({len(failed)/num_issues*100:.1f}%)")
+    print(f"Successful:          {created} ({created/num_issues*100:.1f}%)")
+    print(f"Failed:              {num_issues - created} ({(num_issues - created)/num_issues*100:.1f}%)")
     print(f"Total Duration:      {total_duration:.2f}s")
-    print(f"Throughput:          {num_issues/total_duration:.2f} issues/sec")
-    print(f"\nResponse Times:")
+    print(f"Throughput:          {created/total_duration:.2f} issues/sec")
+    print(f"\nResponse Times ({len(results)} requests):")
     print(f"  Average:           {avg_duration*1000:.2f}ms")
     print(f"  Min:               {min_duration*1000:.2f}ms")
     print(f"  Max:               {max_duration*1000:.2f}ms")
@@ -115,14 +163,15 @@ async def run_load_test(num_issues=100, concurrent=10):
             "test_config": {
                 "num_issues": num_issues,
                 "concurrent": concurrent,
+                "bulk": bulk,
                 "api_url": API_BASE_URL
             },
             "summary": {
                 "total": num_issues,
-                "successful": len(successful),
-                "failed": len(failed),
+                "successful": created,
+                "failed": num_issues - created,
                 "total_duration": total_duration,
-                "throughput": num_issues/total_duration,
+                "throughput": created/total_duration,
                 "avg_response_time": avg_duration,
                 "min_response_time": min_duration,
                 "max_response_time": max_duration
@@ -139,6 +188,8 @@ def main():
                         help="Number of issues to create (default: 100)")
     parser.add_argument("-c", "--concurrent", type=int, default=10,
                         help="Number of concurrent requests (default: 10)")
+    parser.add_argument("-b", "--bulk", type=int, default=0,
+                        help="Issues per POST /api/issues/bulk request (default: 0, one request per issue)")
     parser.add_argument("--api-url", type=str, default="http://localhost:8000",
                         help="API base URL (default: http://localhost:8000)")
     
@@ -147,7 +198,7 @@ def main():
     global API_BASE_URL
     API_BASE_URL = args.api_url
     
-    asyncio.run(run_load_test(args.num_issues, args.concurrent))
+    asyncio.run(run_load_test(args.num_issues, args.concurrent, args.bulk))
 
 if __name__ == "__main__":
     main()
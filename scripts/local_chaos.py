@@ -0,0 +1,476 @@
+"""
+Local Chaos Backend
+
+Runs the Chaos Mesh experiments from infra/chaos-mesh/ on a single Linux
+machine, without Kubernetes, so RTO experiments run on a dev box or CI
+runner at high iteration rates:
+
+- PodChaos pod-kill on the backend: SIGKILL the uvicorn process, which is
+  restarted after a restart delay (as the kubelet would)
+- PodChaos pod-kill on gitea / cockroachdb: the stand-in's proxy refuses
+  connections for the restart delay
+- NetworkChaos delay / loss / partition: latency, loss or a blackhole in
+  the in-process TCP proxies in front of CockroachDB and Gitea
+- Local-only faults: 'pause' (SIGSTOP the backend, SIGCONT on recovery)
+  and 'disk-fill' (fill the tmpfs holding the backend's data directory)
+
+The backend is started with DATABASE_URL and GITEA_URL pointing at the
+proxies and FT_DATA_DIR on the tmpfs, so every fault hits the real code
+paths. Only Linux is supported (process groups, /proc/mounts).
+
+Usage:
+    python scripts/experiment_controller.py --chaos local \
+        --manifest infra/chaos-mesh/network-delay.yaml --runs 50
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import errno
+import os
+import random
+import re
+import select
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import yaml
+
+# Apps the Chaos Mesh manifests select (labelSelectors.app)
+BACKEND_APP = "backend"
+PROXIED_APPS = ("cockroachdb", "gitea")
+
+# Linux minimum TCP retransmission timeout: a lost segment stalls a stream this long
+RETRANSMIT_TIMEOUT = 0.2
+
+BALLAST_CHUNK = 1024 * 1024
+
+LOCAL_FAULTS = ("pause", "disk-fill")
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse a Chaos Mesh duration ('500ms', '30s', '1m', '1h') into seconds."""
+    if value is None:
+        return None
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)(ms|s|m|h)", str(value).strip())
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+    return float(match.group(1)) * scale
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    """Parse 'host:port'."""
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+@dataclass
+class ChaosFault:
+    """A fault to inject, from a Chaos Mesh manifest or a local fault name."""
+    name: str
+    kind: str  # PodChaos, NetworkChaos or Local
+    action: str  # pod-kill, delay, loss, partition, pause, disk-fill
+    apps: List[str]  # target apps (labelSelectors.app)
+    duration: Optional[float] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_manifest(cls, path: str) -> "ChaosFault":
+        """Translate a Chaos Mesh PodChaos/NetworkChaos manifest."""
+        with open(path) as f:
+            manifest = yaml.safe_load(f)
+        kind = manifest.get("kind")
+        spec = manifest.get("spec", {})
+        if kind not in ("PodChaos", "NetworkChaos"):
+            raise ValueError(f"{path}: unsupported chaos kind {kind} (PodChaos and NetworkChaos only)")
+
+        apps = [_selected_app(spec)]
+        params: Dict[str, Any] = {}
+        action = spec.get("action")
+        if action == "delay":
+            delay = spec.get("delay", {})
+            params["latency"] = parse_duration(delay.get("latency", "0ms"))
+            params["jitter"] = parse_duration(delay.get("jitter", "0ms"))
+        elif action == "loss":
+            params["loss"] = float(spec.get("loss", {}).get("loss", 0)) / 100
+        elif action == "partition":
+            # Backend-to-X partition: fault the proxy in front of X
+            apps = [_selected_app(spec.get("target", {}))]
+        elif action != "pod-kill":
+            raise ValueError(f"{path}: unsupported {kind} action '{action}'")
+
+        return cls(
+            name=manifest.get("metadata", {}).get("name", os.path.basename(path)),
+            kind=kind,
+            action=action,
+            apps=apps,
+            duration=parse_duration(spec.get("duration")),
+            params=params
+        )
+
+    @classmethod
+    def local(cls, action: str, duration: Optional[float] = None) -> "ChaosFault":
+        """A fault with no Chaos Mesh equivalent (pause, disk-fill)."""
+        if action not in LOCAL_FAULTS:
+            raise ValueError(f"Unknown local fault: {action}. Valid options: {list(LOCAL_FAULTS)}")
+        return cls(name=action, kind="Local", action=action, apps=[BACKEND_APP], duration=duration)
+
+
+def _selected_app(spec: Dict[str, Any]) -> str:
+    labels = spec.get("selector", {}).get("labelSelectors", {})
+    if "app" not in labels:
+        raise ValueError("Chaos manifest selects no app (labelSelectors.app)")
+    return labels["app"]
+
+
+class FaultProxy:
+    """
+    Threaded TCP proxy whose link can be degraded at runtime.
+
+    - latency/jitter: every chunk sent upstream is delayed
+    - loss: each chunk is lost with this probability; since TCP retransmits,
+      a loss shows up as a RETRANSMIT_TIMEOUT stall, as it would on a wire
+    - partitioned: connections are accepted but nothing is forwarded
+    - down: new and existing connections are reset (a killed server)
+    """
+
+    def __init__(self, name: str, listen: Tuple[str, int], upstream: Tuple[str, int]):
+        self.name = name
+        self.listen = listen
+        self.upstream = upstream
+        self.latency = 0.0
+        self.jitter = 0.0
+        self.loss = 0.0
+        self.partitioned = False
+        self.down = False
+        self._rng = random.Random()
+        self._server: Optional[socket.socket] = None
+        self._connections: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        self._server = socket.create_server(self.listen)
+        self._server.settimeout(0.2)
+        threading.Thread(target=self._accept_loop, name=f"proxy-{self.name}", daemon=True).start()
+
+    @property
+    def port(self) -> int:
+        """Port the proxy listens on (useful when started on port 0)."""
+        return self._server.getsockname()[1]
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._server is not None:
+            self._server.close()
+        self._reset_connections()
+
+    def reset(self) -> None:
+        """Remove every injected fault."""
+        self.latency = self.jitter = self.loss = 0.0
+        self.partitioned = self.down = False
+
+    def set_down(self, down: bool) -> None:
+        self.down = down
+        if down:
+            self._reset_connections()
+
+    def _reset_connections(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            _abort(conn)
+
+    def _accept_loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                client, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            if self.down:
+                _abort(client)
+                continue
+            threading.Thread(target=self._connect, args=(client,), daemon=True).start()
+
+    def _connect(self, client: socket.socket) -> None:
+        try:
+            upstream = socket.create_connection(self.upstream, timeout=5)
+        except OSError:
+            _abort(client)
+            return
+        upstream.settimeout(None)
+        with self._lock:
+            self._connections.extend((client, upstream))
+        # Like netem on the backend pod, latency and loss apply to its egress only
+        for source, target, egress in ((client, upstream, True), (upstream, client, False)):
+            threading.Thread(target=self._pipe, args=(source, target, egress), daemon=True).start()
+
+    def _pipe(self, source: socket.socket, target: socket.socket, egress: bool) -> None:
+        try:
+            while not self._stopped.is_set():
+                readable, _, _ = select.select([source], [], [], 0.2)
+                if not readable:
+                    continue
+                chunk = source.recv(65536)
+                if not chunk:
+                    break
+                # A partition holds traffic until it heals (or the connection dies)
+                while self.partitioned and not self._stopped.is_set():
+                    time.sleep(0.05)
+                if egress:
+                    delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+                    if self.loss and self._rng.random() < self.loss:
+                        delay += RETRANSMIT_TIMEOUT
+                    if delay > 0:
+                        time.sleep(delay)
+                target.sendall(chunk)
+        except (OSError, ValueError):
+            # ValueError: the socket was closed by a reset while we waited
+            pass
+        finally:
+            with self._lock:
+                self._connections = [conn for conn in self._connections if conn not in (source, target)]
+            _abort(source)
+            _abort(target)
+
+
+def _abort(sock: socket.socket) -> None:
+    """Close a socket with a RST, like a crashed peer."""
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, b"\x01\x00\x00\x00\x00\x00\x00\x00")
+    except OSError:
+        pass
+    try:
+        sock.close()
+    except OSError:
+        pass
+
+
+class BackendProcess:
+    """The uvicorn backend, run in its own process group so it can be killed or paused."""
+
+    def __init__(self, backend_dir: str, port: int, env: Dict[str, str], log_path: str):
+        self.backend_dir = backend_dir
+        self.port = port
+        self.env = env
+        self.log_path = log_path
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        log = open(self.log_path, "ab")
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(self.port)],
+            cwd=self.backend_dir,
+            env={**os.environ, **self.env},
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+        log.close()
+
+    def _signal(self, signum: int) -> None:
+        if self._process is not None and self._process.poll() is None:
+            os.killpg(self._process.pid, signum)
+
+    def kill(self) -> None:
+        self._signal(signal.SIGKILL)
+        if self._process is not None:
+            self._process.wait()
+
+    def pause(self) -> None:
+        self._signal(signal.SIGSTOP)
+
+    def resume(self) -> None:
+        self._signal(signal.SIGCONT)
+
+    def stop(self) -> None:
+        self.resume()
+        self._signal(signal.SIGTERM)
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.kill()
+
+
+def filesystem_type(path: str) -> Optional[str]:
+    """Type of the filesystem holding path, from /proc/mounts."""
+    path = os.path.realpath(path)
+    best, fstype = "", None
+    with open("/proc/mounts") as f:
+        for line in f:
+            _, mount_point, kind = line.split()[:3]
+            if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+                best, fstype = mount_point, kind
+    return fstype
+
+
+class DiskFiller:
+    """
+    Fills the filesystem under directory with a ballast file.
+
+    Only tmpfs is accepted, so a mistyped path can never fill a real disk.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.ballast = os.path.join(directory, ".chaos_ballast")
+
+    def check(self) -> None:
+        fstype = filesystem_type(self.directory)
+        if fstype != "tmpfs":
+            raise ValueError(
+                f"{self.directory} is on {fstype}, not tmpfs - refusing to fill it "
+                f"(mount one with: sudo mount -t tmpfs -o size=256m tmpfs {self.directory})"
+            )
+
+    def fill(self, leave_bytes: int = 0) -> int:
+        """Write ballast until at most leave_bytes are free; return bytes written."""
+        self.check()
+        written = 0
+        chunk = b"\0" * BALLAST_CHUNK
+        with open(self.ballast, "ab") as f:
+            while True:
+                stat = os.statvfs(self.directory)
+                free = stat.f_bavail * stat.f_frsize
+                if free <= leave_bytes:
+                    break
+                size = min(BALLAST_CHUNK, free - leave_bytes)
+                try:
+                    f.write(chunk[:size])
+                    f.flush()
+                except OSError as e:
+                    if e.errno != errno.ENOSPC:
+                        raise
+                    break
+                written += size
+        return written
+
+    def release(self) -> None:
+        try:
+            os.unlink(self.ballast)
+        except FileNotFoundError:
+            pass
+
+
+class LocalChaosBackend:
+    """
+    A single-machine stand-in for the Kubernetes deployment plus Chaos Mesh.
+
+    start() launches the proxies and the backend; apply()/delete() mirror
+    'kubectl apply/delete -f manifest'. Faults with a duration heal
+    themselves after it, as Chaos Mesh does.
+    """
+
+    def __init__(
+        self,
+        backend_dir: str,
+        port: int = 8100,
+        db_upstream: str = "127.0.0.1:26257",
+        gitea_upstream: str = "127.0.0.1:3000",
+        data_dir: str = "/dev/shm/gitforge-chaos",
+        restart_delay: float = 1.0,
+        database_name: str = "defaultdb"
+    ):
+        os.makedirs(data_dir, exist_ok=True)
+        self.data_dir = data_dir
+        self.restart_delay = restart_delay
+        self.proxies = {
+            "cockroachdb": FaultProxy("cockroachdb", ("127.0.0.1", 0), parse_address(db_upstream)),
+            "gitea": FaultProxy("gitea", ("127.0.0.1", 0), parse_address(gitea_upstream))
+        }
+        self._database_name = database_name
+        self.backend = BackendProcess(backend_dir, port, {}, os.path.join(data_dir, "backend.log"))
+        self.disk = DiskFiller(data_dir)
+        self.health_url = f"http://127.0.0.1:{port}/api/health"
+        self._timers: List[threading.Timer] = []
+
+    def start(self) -> None:
+        for proxy in self.proxies.values():
+            proxy.start()
+        self.backend.env = {
+            "DATABASE_URL": (
+                f"cockroachdb://root@127.0.0.1:{self.proxies['cockroachdb'].port}/"
+                f"{self._database_name}?sslmode=disable"
+            ),
+            "GITEA_URL": f"http://127.0.0.1:{self.proxies['gitea'].port}",
+            "FT_DATA_DIR": self.data_dir
+        }
+        self.backend.start()
+
+    def stop(self) -> None:
+        self._cancel_timers()
+        self.backend.stop()
+        for proxy in self.proxies.values():
+            proxy.stop()
+        self.disk.release()
+
+    def apply(self, fault: ChaosFault) -> None:
+        """Inject a fault."""
+        if fault.action == "pod-kill":
+            for app in fault.apps:
+                self._kill(app)
+            return
+
+        if fault.action == "pause":
+            self.backend.pause()
+        elif fault.action == "disk-fill":
+            self.disk.fill()
+        else:
+            for proxy in self._proxies_for(fault.apps):
+                if fault.action == "delay":
+                    proxy.latency = fault.params["latency"]
+                    proxy.jitter = fault.params.get("jitter") or 0.0
+                elif fault.action == "loss":
+                    proxy.loss = fault.params["loss"]
+                elif fault.action == "partition":
+                    proxy.partitioned = True
+
+        if fault.duration:
+            self._schedule(fault.duration, self.delete, fault)
+
+    def delete(self, fault: ChaosFault) -> None:
+        """Remove a fault (idempotent)."""
+        if fault.action == "pause":
+            self.backend.resume()
+        elif fault.action == "disk-fill":
+            self.disk.release()
+        elif fault.action != "pod-kill":
+            for proxy in self._proxies_for(fault.apps):
+                proxy.reset()
+
+    def _kill(self, app: str) -> None:
+        """Kill an app; it comes back after the restart delay."""
+        if app == BACKEND_APP:
+            self.backend.kill()
+            self._schedule(self.restart_delay, self.backend.start)
+        else:
+            proxy = self.proxies[app]
+            proxy.set_down(True)
+            self._schedule(self.restart_delay, proxy.set_down, False)
+
+    def _proxies_for(self, apps: List[str]) -> List[FaultProxy]:
+        # Network faults on the backend pod degrade all of its outbound links
+        if BACKEND_APP in apps:
+            return list(self.proxies.values())
+        unknown = [app for app in apps if app not in self.proxies]
+        if unknown:
+            raise ValueError(f"No local stand-in for {unknown}. Valid options: {[BACKEND_APP, *PROXIED_APPS]}")
+        return [self.proxies[app] for app in apps]
+
+    def _schedule(self, delay: float, function, *args) -> None:
+        timer = threading.Timer(delay, function, args)
+        timer.daemon = True
+        timer.start()
+        self._timers.append(timer)
+
+    def _cancel_timers(self) -> None:
+        for timer in self._timers:
+            timer.cancel()
+        self._timers = []
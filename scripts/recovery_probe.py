@@ -0,0 +1,186 @@
+"""
+Millisecond-Precision Recovery Prober
+
+Measures recovery time (RTO) by probing several endpoints concurrently
+from one asyncio event loop:
+
+- Every endpoint is probed back-to-back every --probe-interval (default
+  5ms) over a persistent keep-alive connection pool, so a probe costs one
+  request, not a TCP handshake
+- All timestamps come from the monotonic clock (time.perf_counter_ns),
+  so wall-clock adjustments cannot distort a measurement
+- An endpoint has recovered at the start of its first successful probe
+  after it was seen failing; the gap to the preceding failed probe is
+  reported as the measurement's resolution
+
+Default probes: health (GET /api/health), a read (GET /api/issues/?limit=1)
+and a write (POST /api/fault-tolerance/store).
+
+Usage:
+    prober = RecoveryProber("http://localhost:8000", interval=0.005)
+    result = prober.measure(inject_fault)
+    print(result["recovery_time_seconds"], result["probes"]["write"])
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import time
+
+import httpx
+
+
+@dataclass
+class ProbeTarget:
+    """One endpoint to probe; any 2xx response counts as success."""
+    name: str
+    method: str
+    path: str
+    json: Optional[Dict[str, Any]] = None
+
+
+DEFAULT_TARGETS = [
+    ProbeTarget("health", "GET", "/api/health"),
+    ProbeTarget("read", "GET", "/api/issues/?limit=1"),
+    ProbeTarget("write", "POST", "/api/fault-tolerance/store", {"key": "recovery_probe", "value": 0}),
+]
+
+
+@dataclass
+class _ProbeState:
+    """Probe history of one target relative to the fault (all times in ns)."""
+    target: ProbeTarget
+    probes: int = 0
+    failures: int = 0
+    last_failure_ns: Optional[int] = None
+    first_failure_ns: Optional[int] = None
+    recovered_ns: Optional[int] = None
+    resolution_ns: Optional[int] = None
+    latencies_ns: List[int] = field(default_factory=list)
+
+    @property
+    def done(self) -> bool:
+        return self.recovered_ns is not None
+
+
+class RecoveryProber:
+    """
+    Concurrent, keep-alive recovery prober.
+
+    Args:
+        base_url: Base URL of the system under test
+        targets: Endpoints to probe (default: health, read, write)
+        interval: Seconds between the starts of consecutive probes per target
+        timeout: Seconds before a probe counts as failed
+        detect_timeout: Seconds to wait for the fault to become visible;
+            if no probe fails by then, the outage is reported as undetected
+            and the RTO as 0
+        recovery_timeout: Seconds to wait for recovery before giving up
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        targets: Optional[List[ProbeTarget]] = None,
+        interval: float = 0.005,
+        timeout: float = 1.0,
+        detect_timeout: float = 5.0,
+        recovery_timeout: float = 300.0
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.targets = targets or DEFAULT_TARGETS
+        self.interval = interval
+        self.timeout = timeout
+        self.detect_timeout = detect_timeout
+        self.recovery_timeout = recovery_timeout
+
+    def measure(self, inject: Callable[[], None]) -> Dict[str, Any]:
+        """Inject a fault (blocking callable) while probing; return the measurement."""
+        return asyncio.run(self.ameasure(inject))
+
+    async def ameasure(self, inject: Callable[[], None]) -> Dict[str, Any]:
+        limits = httpx.Limits(max_connections=len(self.targets) * 2, max_keepalive_connections=len(self.targets) * 2)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits) as client:
+            states = [_ProbeState(target) for target in self.targets]
+            fault = {"ns": None}
+            tasks = [asyncio.create_task(self._probe_loop(client, state, fault)) for state in states]
+
+            # Warm the connection pool so the first probe after injection is not a handshake
+            await asyncio.sleep(max(self.interval * 2, 0.05))
+
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, inject)
+            fault["ns"] = time.perf_counter_ns()
+
+            try:
+                await asyncio.wait_for(asyncio.gather(*tasks), self.recovery_timeout)
+            except asyncio.TimeoutError:
+                for task in tasks:
+                    task.cancel()
+            return self._result(states, fault["ns"])
+
+    async def _probe_loop(self, client: httpx.AsyncClient, state: _ProbeState, fault: Dict[str, Optional[int]]) -> None:
+        target = state.target
+        interval_ns = int(self.interval * 1e9)
+        next_ns = time.perf_counter_ns()
+        while True:
+            started = time.perf_counter_ns()
+            try:
+                response = await client.request(target.method, target.path, json=target.json)
+                ok = response.is_success
+            except httpx.HTTPError:
+                ok = False
+            finished = time.perf_counter_ns()
+
+            fault_ns = fault["ns"]
+            if fault_ns is not None and started >= fault_ns:
+                state.probes += 1
+                state.latencies_ns.append(finished - started)
+                if not ok:
+                    state.failures += 1
+                    state.last_failure_ns = started
+                    if state.first_failure_ns is None:
+                        state.first_failure_ns = started
+                elif state.first_failure_ns is not None:
+                    state.recovered_ns = started
+                    state.resolution_ns = started - state.last_failure_ns
+                    return
+                elif finished - fault_ns > self.detect_timeout * 1e9:
+                    # The fault never became visible on this endpoint
+                    return
+
+            next_ns += interval_ns
+            delay = next_ns - time.perf_counter_ns()
+            if delay > 0:
+                await asyncio.sleep(delay / 1e9)
+            else:
+                next_ns = time.perf_counter_ns()
+
+    def _result(self, states: List[_ProbeState], fault_ns: int) -> Dict[str, Any]:
+        def ms(value_ns: Optional[int]) -> Optional[float]:
+            return None if value_ns is None else value_ns / 1e6
+
+        probes = {}
+        for state in states:
+            outage = state.first_failure_ns is not None
+            latencies = sorted(state.latencies_ns)
+            probes[state.target.name] = {
+                "outage_detected": outage,
+                "recovered": state.done or not outage,
+                "first_failure_ms": ms(state.first_failure_ns - fault_ns) if outage else None,
+                "rto_ms": ms(state.recovered_ns - fault_ns) if state.done else (0.0 if not outage else None),
+                "resolution_ms": ms(state.resolution_ns),
+                "probes": state.probes,
+                "failures": state.failures,
+                "probe_p50_ms": ms(latencies[len(latencies) // 2]) if latencies else None,
+            }
+
+        rtos = [probe["rto_ms"] for probe in probes.values()]
+        recovered = all(rto is not None for rto in rtos)
+        return {
+            # The system has recovered once every probed endpoint has
+            "recovery_time_seconds": max(rtos) / 1000 if recovered else None,
+            "recovered": recovered,
+            "probe_interval_ms": self.interval * 1000,
+            "probes": probes,
+        }
@@ -7,6 +7,14 @@ data for statistical analysis (ANOVA, T-tests, etc.)
 
 Usage:
     python3 scripts/run_ft_experiments.py
+    
+    # Queue every run on the backend's job worker pool instead of
+    # holding one HTTP request open per experiment
+    python3 scripts/run_ft_experiments.py --jobs
+    
+    # Run the suite locally in isolated worker processes (one per core),
+    # without a running backend
+    python3 scripts/run_ft_experiments.py --local
 
 Output:
     CSV file with all experiment results
@@ -14,6 +22,8 @@ Output:
 
 import requests
 import csv
+import os
+import sys
 import time
 import argparse
 from datetime import datetime
@@ -24,6 +34,14 @@ API_BASE = "http://localhost:8000/api/fault-tolerance"
 DEFAULT_RUNS = 20
 DEFAULT_DATA_ITEMS = 100
 COOLDOWN_SECONDS = 2
+JOB_POLL_INTERVAL = 0.5
+
+# Strategy operation latency percentiles written to the CSV
+LATENCY_COLUMNS_OPERATIONS = ("store", "retrieve")
+LATENCY_COLUMNS_PERCENTILES = ("p50", "p99", "p999")
+
+# Injected fault counts written to the CSV
+FAULT_COLUMNS = ("checkpoint_corruption", "cascading_failure")
 
 # Research configurations based on the design document
 CONFIGURATIONS = [
@@ -107,6 +125,73 @@ def check_api_health() -> bool:
         return False
 
 
+def build_payload(config: Dict[str, Any], data_items: int) -> Dict[str, Any]:
+    """Build the experiment request body for a configuration."""
+    # Decide if we should trigger a forced checkpoint to test persistence efficacy
+    # We trigger it for 'checkpointing' and 'hybrid' strategies to demonstrate they CAN save data
+    should_trigger = config["strategy"] in ["checkpointing", "hybrid"]
+    
+    return {
+        "strategy": config["strategy"],
+        "data_items": data_items,
+        "checkpoint_interval": config.get("checkpoint_interval", 30),
+        "replication_factor": config.get("replication_factor", 3),
+        "trigger_checkpoint": should_trigger
+    }
+
+
+def build_record(
+    config: Dict[str, Any],
+    run: int,
+    data_items: int,
+    result: Dict[str, Any],
+    elapsed: float
+) -> Dict[str, Any]:
+    """Build the CSV record for a successful run."""
+    record = {
+        "config_name": config["name"],
+        "strategy": config["strategy"],
+        "checkpoint_interval": config.get("checkpoint_interval", None),
+        "replication_factor": config.get("replication_factor", None),
+        "run_id": run,
+        "seed": result.get("seed"),
+        "timestamp": datetime.now().isoformat(),
+        "recovery_time_seconds": result["recovery_time_seconds"],
+        "data_recovery_rate_percent": result["data_recovery_rate_percent"],
+        "items_stored": data_items,
+        "items_recovered": result["items_recovered"],
+        "store_time_seconds": result["store_time_seconds"],
+        "experiment_duration_seconds": elapsed,
+        "status": "SUCCESS"
+    }
+    
+    # Faults that fired in this run (reproducible by re-running with its seed)
+    injected = result.get("stats", {}).get("faults", {}).get("injected", {})
+    for fault in FAULT_COLUMNS:
+        record[f"{fault}_injected"] = injected.get(fault, 0)
+    
+    # Tail latencies of the run's strategy operations (from the strategy histograms)
+    latency = result.get("stats", {}).get("latency", {})
+    for operation in LATENCY_COLUMNS_OPERATIONS:
+        summary = latency.get(operation, {})
+        for percentile in LATENCY_COLUMNS_PERCENTILES:
+            record[f"{operation}_{percentile}_ms"] = summary.get(f"{percentile}_ms")
+    
+    return record
+
+
+def build_failure_record(config: Dict[str, Any], run: int, error: str) -> Dict[str, Any]:
+    """Build the CSV record for a failed run."""
+    return {
+        "config_name": config["name"],
+        "strategy": config["strategy"],
+        "run_id": run,
+        "timestamp": datetime.now().isoformat(),
+        "status": "FAILED",
+        "error": error
+    }
+
+
 def run_single_experiment(config: Dict[str, Any], data_items: int) -> Dict[str, Any]:
     """
     Run a single experiment with the given configuration.
@@ -118,17 +203,7 @@ def run_single_experiment(config: Dict[str, Any], data_items: int) -> Dict[str,
     Returns:
         Experiment results dictionary
     """
-    # Decide if we should trigger a forced checkpoint to test persistence efficacy
-    # We trigger it for 'checkpointing' and 'hybrid' strategies to demonstrate they CAN save data
-    should_trigger = config["strategy"] in ["checkpointing", "hybrid"]
-    
-    payload = {
-        "strategy": config["strategy"],
-        "data_items": data_items,
-        "checkpoint_interval": config.get("checkpoint_interval", 30),
-        "replication_factor": config.get("replication_factor", 3),
-        "trigger_checkpoint": should_trigger
-    }
+    payload = build_payload(config, data_items)
     
     max_retries = 3
     retry_delay = 1
@@ -208,21 +283,7 @@ def run_experiment_suite(
                 elapsed = time.time() - start_time
                 
                 # Build result record
-                record = {
-                    "config_name": config["name"],
-                    "strategy": config["strategy"],
-                    "checkpoint_interval": config.get("checkpoint_interval", None),
-                    "replication_factor": config.get("replication_factor", None),
-                    "run_id": run,
-                    "timestamp": datetime.now().isoformat(),
-                    "recovery_time_seconds": result["recovery_time_seconds"],
-                    "data_recovery_rate_percent": result["data_recovery_rate_percent"],
-                    "items_stored": data_items,
-                    "items_recovered": result["items_recovered"],
-                    "store_time_seconds": result["store_time_seconds"],
-                    "experiment_duration_seconds": elapsed,
-                    "status": "SUCCESS"
-                }
+                record = build_record(config, run, data_items, result, elapsed)
                 
                 config_results.append(record)
                 results.append(record)
@@ -232,14 +293,7 @@ def run_experiment_suite(
                 
             except Exception as e:
                 print(f"❌ FAILED: {e}")
-                results.append({
-                    "config_name": config["name"],
-                    "strategy": config["strategy"],
-                    "run_id": run,
-                    "timestamp": datetime.now().isoformat(),
-                    "status": "FAILED",
-                    "error": str(e)
-                })
+                results.append(build_failure_record(config, run, str(e)))
             
             # Cooldown between runs
             if run < runs_per_config:
@@ -254,6 +308,108 @@ def run_experiment_suite(
     return results
 
 
+def run_experiment_suite_jobs(
+    runs_per_config: int = DEFAULT_RUNS,
+    data_items: int = DEFAULT_DATA_ITEMS,
+    configs: List[Dict] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run the suite through the backend job queue.
+    
+    All runs are submitted up front (POST /jobs) and executed by the
+    backend's worker pool; this client only polls for completion, so no
+    request is held open for the length of an experiment.
+    """
+    if configs is None:
+        configs = CONFIGURATIONS
+    
+    print(f"\n{'='*60}")
+    print(f"🧪 FAULT TOLERANCE EXPERIMENT SUITE (job queue)")
+    print(f"{'='*60}")
+    
+    # Submit everything: job_id -> (config, run number)
+    pending = {}
+    for config in configs:
+        payload = build_payload(config, data_items)
+        payload["runs"] = runs_per_config
+        response = requests.post(f"{API_BASE}/jobs", json=payload, timeout=10)
+        response.raise_for_status()
+        for run, job_id in enumerate(response.json()["job_ids"], start=1):
+            pending[job_id] = (config, run)
+    
+    total = len(pending)
+    print(f"Queued {total} experiments across {len(configs)} configurations\n")
+    
+    results = []
+    while pending:
+        for job_id in list(pending):
+            response = requests.get(f"{API_BASE}/jobs/{job_id}", timeout=10)
+            response.raise_for_status()
+            job = response.json()
+            if job["status"] not in ("completed", "failed", "cancelled"):
+                continue
+            
+            config, run = pending.pop(job_id)
+            if job["status"] == "completed":
+                elapsed = job["finished_at"] - job["started_at"]
+                results.append(build_record(config, run, data_items, job["result"], elapsed))
+            else:
+                results.append(build_failure_record(config, run, job.get("error") or job["status"]))
+            
+            done = total - len(pending)
+            print(f"   [{done / total * 100:5.1f}%] {config['name']} run {run:02d}: {job['status']}")
+        
+        if pending:
+            time.sleep(JOB_POLL_INTERVAL)
+    
+    return results
+
+
+def run_experiment_suite_local(
+    runs_per_config: int = DEFAULT_RUNS,
+    data_items: int = DEFAULT_DATA_ITEMS,
+    configs: List[Dict] = None,
+    workers: int = None
+) -> List[Dict[str, Any]]:
+    """
+    Run the suite in local worker processes.
+    
+    Each run gets its own process, strategy instance and checkpoint dir,
+    so the configuration matrix is spread across all cores with no
+    cooldown between runs.
+    """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+    from fault_tolerance.executor import ParallelExperimentExecutor
+    
+    if configs is None:
+        configs = CONFIGURATIONS
+    
+    # Executor params are the API payload plus the config name for bookkeeping
+    by_name = {config["name"]: config for config in configs}
+    matrix = [{**build_payload(config, data_items), "name": config["name"]} for config in configs]
+    total = len(matrix) * runs_per_config
+    results = []
+    
+    def on_result(record: Dict[str, Any]) -> None:
+        config = by_name[record["config"]["name"]]
+        if "error" in record:
+            results.append(build_failure_record(config, record["run_id"], record["error"]))
+            status = "FAILED"
+        else:
+            result = record["result"]
+            results.append(build_record(
+                config, record["run_id"], data_items, result, result["experiment_duration_seconds"]
+            ))
+            status = f"Recovery: {result['recovery_time_seconds']:.4f}s"
+        print(f"   [{len(results) / total * 100:5.1f}%] {config['name']} run {record['run_id']:02d}: {status}")
+    
+    with ParallelExperimentExecutor(max_workers=workers) as executor:
+        print(f"\n🧪 Running {total} experiments on {executor.max_workers} worker processes\n")
+        executor.run_matrix(matrix, runs_per_config=runs_per_config, data_items=data_items, on_result=on_result)
+    
+    return results
+
+
 def save_results(results: List[Dict], filename: str = None) -> str:
     """Save experiment results to CSV."""
     if filename is None:
@@ -330,18 +486,35 @@ def main():
         default="all",
         help="Run only specific strategy type"
     )
+    parser.add_argument(
+        "--jobs",
+        action="store_true",
+        help="Queue runs on the backend job worker pool (concurrent, no cooldown)"
+    )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Run experiments in local worker processes instead of through the API"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --local (default: CPU count)"
+    )
     
     args = parser.parse_args()
     
-    # Check API health
-    print("🔍 Checking API health...")
-    if not check_api_health():
-        print("❌ ERROR: Backend API not accessible at", API_BASE)
-        print("   Make sure the backend is running:")
-        print("   - Local: cd backend && uvicorn main:app --port 8000")
-        print("   - K8s: kubectl port-forward svc/backend 8000:8000 -n gitforge")
-        return 1
-    print("✅ API is healthy\n")
+    # Check API health (not needed when running locally)
+    if not args.local:
+        print("🔍 Checking API health...")
+        if not check_api_health():
+            print("❌ ERROR: Backend API not accessible at", API_BASE)
+            print("   Make sure the backend is running:")
+            print("   - Local: cd backend && uvicorn main:app --port 8000")
+            print("   - K8s: kubectl port-forward svc/backend 8000:8000 -n gitforge")
+            return 1
+        print("✅ API is healthy\n")
     
     # Filter configurations if needed
     configs = CONFIGURATIONS
@@ -350,11 +523,20 @@ def main():
         print(f"📌 Filtering to {args.strategy} configurations only ({len(configs)} configs)")
     
     # Run experiments
-    results = run_experiment_suite(
-        runs_per_config=args.runs,
-        data_items=args.data_items,
-        configs=configs
-    )
+    if args.local:
+        results = run_experiment_suite_local(
+            runs_per_config=args.runs,
+            data_items=args.data_items,
+            configs=configs,
+            workers=args.workers
+        )
+    else:
+        run_suite = run_experiment_suite_jobs if args.jobs else run_experiment_suite
+        results = run_suite(
+            runs_per_config=args.runs,
+            data_items=args.data_items,
+            configs=configs
+        )
     
     # Save results
     filename = save_results(results, args.output)